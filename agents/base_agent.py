@@ -3,13 +3,18 @@ Classe abstraite de base pour tous les agents du système.
 """
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
 import json
 import logging
 import asyncio
 
 from database.models import AuditLog, TypeEvenement
 from database.repository import Repository
+from config import get_config
+
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class BaseAgent(ABC):
@@ -133,6 +138,33 @@ class BaseAgent(ABC):
         finally:
             self._running = False
 
+    async def traiter_en_parallele(
+        self,
+        elements: Iterable[T],
+        traiter: Callable[[T], Awaitable[R]],
+        concurrency: Optional[int] = None
+    ) -> List[R]:
+        """
+        Applique traiter à chaque élément, au plus concurrency à la fois.
+
+        Args:
+            elements: Éléments à traiter
+            traiter: Coroutine appliquée à chaque élément
+            concurrency: Traitements simultanés (défaut: config.veille.concurrency)
+
+        Returns:
+            Résultats dans l'ordre des éléments
+        """
+        if concurrency is None:
+            concurrency = get_config().veille.concurrency
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def borne(element: T) -> R:
+            async with semaphore:
+                return await traiter(element)
+
+        return await asyncio.gather(*(borne(element) for element in elements))
+
     def log_audit(
         self,
         type_evenement: TypeEvenement,
@@ -93,12 +93,14 @@ class AgentCorrecteurLangue(BaseAgent):
         Args:
             codes_rome: Liste de codes ROME à traiter (optionnel)
             force: Forcer la correction même si déjà corrigée
+            concurrency: Fiches corrigées simultanément (défaut: config.veille.concurrency)
 
         Returns:
             Résultats de la correction
         """
         codes_rome = kwargs.get("codes_rome", [])
         force = kwargs.get("force", False)
+        concurrency = kwargs.get("concurrency")
 
         if codes_rome:
             fiches = self.repository.get_fiches_by_codes(codes_rome)
@@ -106,18 +108,14 @@ class AgentCorrecteurLangue(BaseAgent):
             # Récupérer les fiches qui n'ont pas été corrigées récemment
             fiches = self.repository.get_all_fiches(limit=self.config.veille.batch_size)
 
-        resultats = []
-        nb_corrigees = 0
-        nb_erreurs = 0
-
-        for fiche in fiches:
+        async def traiter(fiche: FicheMetier) -> Tuple[Dict[str, Any], bool]:
             try:
                 rapport = await self.corriger_fiche(fiche)
-                if rapport.has_corrections():
+                corrigee = rapport.has_corrections()
+                if corrigee:
                     # Appliquer les corrections
                     fiche_corrigee = self._appliquer_corrections(fiche, rapport)
                     self.repository.update_fiche(fiche_corrigee)
-                    nb_corrigees += 1
 
                     # Log audit
                     self.log_audit(
@@ -128,22 +126,26 @@ class AgentCorrecteurLangue(BaseAgent):
                         donnees_apres=rapport.texte_corrige[:500]
                     )
 
-                resultats.append({
+                return {
                     "code_rome": fiche.code_rome,
                     "nb_corrections": rapport.nb_corrections,
                     "corrections": [
                         {"type": c.type_erreur, "original": c.texte_original[:50]}
                         for c in rapport.corrections
                     ]
-                })
+                }, corrigee
 
             except Exception as e:
-                nb_erreurs += 1
                 self.logger.error(f"Erreur correction {fiche.code_rome}: {e}")
-                resultats.append({
+                return {
                     "code_rome": fiche.code_rome,
                     "error": str(e)
-                })
+                }, False
+
+        traitements = await self.traiter_en_parallele(fiches, traiter, concurrency)
+        resultats = [detail for detail, _ in traitements]
+        nb_corrigees = sum(1 for _, corrigee in traitements if corrigee)
+        nb_erreurs = sum(1 for detail in resultats if "error" in detail)
 
         self._stats["elements_traites"] += len(fiches)
 
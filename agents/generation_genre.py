@@ -163,12 +163,14 @@ class AgentGenerationGenre(BaseAgent):
         Args:
             codes_rome: Liste de codes ROME à traiter (optionnel)
             force: Forcer la regénération même si déjà fait
+            concurrency: Fiches traitées simultanément (défaut: config.veille.concurrency)
 
         Returns:
             Résultats de la génération
         """
         codes_rome = kwargs.get("codes_rome", [])
         force = kwargs.get("force", False)
+        concurrency = kwargs.get("concurrency")
 
         if codes_rome:
             fiches = self.repository.get_fiches_by_codes(codes_rome)
@@ -183,9 +185,10 @@ class AgentGenerationGenre(BaseAgent):
             "details": []
         }
 
-        for fiche in fiches:
+        async def traiter(fiche: FicheMetier) -> Tuple[Optional[Dict[str, Any]], bool]:
             try:
                 resultat = await self._generer_versions_genre(fiche)
+                detail = None
                 if resultat:
                     # Mettre à jour la fiche
                     fiche.nom_masculin = resultat.nom_masculin
@@ -194,7 +197,6 @@ class AgentGenerationGenre(BaseAgent):
                     fiche.metadata.date_maj = datetime.now()
 
                     self.repository.update_fiche(fiche)
-                    resultats["fiches_generees"] += 1
 
                     # Log audit
                     self.log_audit(
@@ -203,7 +205,7 @@ class AgentGenerationGenre(BaseAgent):
                         description=f"Génération versions genrées (méthode: {resultat.methode})"
                     )
 
-                    resultats["details"].append({
+                    detail = {
                         "code_rome": fiche.code_rome,
                         "status": "generated",
                         "methode": resultat.methode,
@@ -213,18 +215,26 @@ class AgentGenerationGenre(BaseAgent):
                             "feminin": resultat.nom_feminin,
                             "epicene": resultat.nom_epicene
                         }
-                    })
-
-                resultats["fiches_traitees"] += 1
+                    }
+                return detail, True
 
             except Exception as e:
-                resultats["erreurs"] += 1
                 self.logger.error(f"Erreur génération genre {fiche.code_rome}: {e}")
-                resultats["details"].append({
+                return {
                     "code_rome": fiche.code_rome,
                     "status": "error",
                     "error": str(e)
-                })
+                }, False
+
+        for detail, ok in await self.traiter_en_parallele(fiches, traiter, concurrency):
+            if ok:
+                resultats["fiches_traitees"] += 1
+                if detail:
+                    resultats["fiches_generees"] += 1
+            else:
+                resultats["erreurs"] += 1
+            if detail:
+                resultats["details"].append(detail)
 
         self._stats["elements_traites"] += resultats["fiches_traitees"]
 
@@ -43,7 +43,7 @@ class AgentRedacteurFiche(BaseAgent):
         self.config = get_config()
 
     async def _call_claude(self, **kwargs):
-        """Call Claude API with streaming + automatic retry on overload (529)."""
+        """Call Claude API with streaming + exponential backoff on overload (529) / rate limit (429)."""
         max_retries = 3
         for attempt in range(max_retries + 1):
             try:
@@ -52,10 +52,14 @@ class AgentRedacteurFiche(BaseAgent):
                     response = await stream.get_final_message()
                 return response
             except Exception as e:
-                error_str = str(e)
-                if ("529" in error_str or "overloaded" in error_str.lower()) and attempt < max_retries:
-                    wait = 10 * (attempt + 1)
-                    self.logger.warning(f"Claude overloaded, retry {attempt+1}/{max_retries} in {wait}s...")
+                error_str = str(e).lower()
+                retryable = (
+                    "529" in error_str or "overloaded" in error_str
+                    or "429" in error_str or "rate_limit" in error_str
+                )
+                if retryable and attempt < max_retries:
+                    wait = 10 * 2 ** attempt
+                    self.logger.warning(f"Claude overloaded / rate limited, retry {attempt+1}/{max_retries} in {wait}s...")
                     await asyncio.sleep(wait)
                     continue
                 raise
@@ -74,6 +78,7 @@ class AgentRedacteurFiche(BaseAgent):
             codes_rome: Liste de codes ROME à traiter (optionnel)
             nom_metier: Nom d'un métier à créer de zéro (optionnel)
             batch_size: Nombre de fiches à traiter par lot (défaut: 5)
+            concurrency: Nombre d'appels Claude simultanés (défaut: config.veille.concurrency)
 
         Returns:
             Résultats de l'enrichissement
@@ -81,6 +86,7 @@ class AgentRedacteurFiche(BaseAgent):
         codes_rome = kwargs.get("codes_rome", [])
         nom_metier = kwargs.get("nom_metier")
         batch_size = kwargs.get("batch_size", 5)
+        concurrency = kwargs.get("concurrency")
 
         # Mode création : générer une fiche à partir d'un nom
         if nom_metier and not codes_rome:
@@ -96,15 +102,12 @@ class AgentRedacteurFiche(BaseAgent):
                 limit=batch_size
             )
 
-        resultats = []
-        nb_enrichies = 0
-        nb_erreurs = 0
-
-        for fiche in fiches:
+        # Les appels Claude (plusieurs secondes chacun) se recouvrent ; l'écriture
+        # en base reste séquentielle (aucun await entre update_fiche et log_audit)
+        async def enrichir(fiche: FicheMetier) -> Dict[str, Any]:
             try:
                 fiche_enrichie = await self.enrichir_fiche(fiche)
                 self.repository.update_fiche(fiche_enrichie)
-                nb_enrichies += 1
 
                 self.log_audit(
                     type_evenement=TypeEvenement.MODIFICATION,
@@ -114,21 +117,24 @@ class AgentRedacteurFiche(BaseAgent):
                     donnees_apres=fiche_enrichie.description[:200]
                 )
 
-                resultats.append({
+                return {
                     "code_rome": fiche.code_rome,
                     "nom": fiche.nom_masculin,
                     "status": "enrichie"
-                })
+                }
 
             except Exception as e:
-                nb_erreurs += 1
                 self.logger.error(f"Erreur enrichissement {fiche.code_rome}: {e}")
-                resultats.append({
+                return {
                     "code_rome": fiche.code_rome,
                     "nom": fiche.nom_masculin,
                     "status": "erreur",
                     "error": str(e)
-                })
+                }
+
+        resultats = await self.traiter_en_parallele(fiches, enrichir, concurrency)
+        nb_erreurs = sum(1 for r in resultats if r["status"] == "erreur")
+        nb_enrichies = len(resultats) - nb_erreurs
 
         self._stats["elements_traites"] += len(fiches)
 
@@ -2,6 +2,7 @@
 Agent de veille sur l'évolution des métiers.
 """
 import asyncio
+from collections import Counter
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
@@ -369,14 +370,12 @@ class AgentVeilleMetiers(BaseAgent):
 
     def _extraire_competences_offres(self, offres: List[Dict]) -> List[str]:
         """Extrait les compétences les plus fréquentes des offres."""
-        competences_count = {}
-        for offre in offres:
-            for comp in offre.get("competences", []):
-                competences_count[comp] = competences_count.get(comp, 0) + 1
+        competences_count = Counter(
+            comp for offre in offres for comp in offre.get("competences", [])
+        )
 
-        # Retourner les plus fréquentes
-        sorted_comps = sorted(competences_count.items(), key=lambda x: x[1], reverse=True)
-        return [c for c, _ in sorted_comps[:10]]
+        # Retourner les plus fréquentes (sélection par tas, sans tri complet)
+        return [c for c, _ in competences_count.most_common(10)]
 
     def _generer_recommandations(
         self,
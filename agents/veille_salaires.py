@@ -301,11 +301,12 @@ class AgentVeilleSalaires(BaseAgent):
         if salaires_agreges.model_dump() == ancien_salaires:
             return None
 
-        # Stocker les données brutes
+        # Stocker les données brutes (une seule transaction pour les 3 niveaux)
+        salaires_bruts = []
         for niveau in [NiveauExperience.JUNIOR, NiveauExperience.CONFIRME, NiveauExperience.SENIOR]:
             niveau_str = niveau.value
             salaire_niveau = getattr(salaires_agreges, niveau_str)
-            salaire = Salaire(
+            salaires_bruts.append(Salaire(
                 code_rome=fiche.code_rome,
                 niveau=niveau,
                 min_salaire=salaire_niveau.min,
@@ -313,8 +314,8 @@ class AgentVeilleSalaires(BaseAgent):
                 median_salaire=salaire_niveau.median,
                 source=", ".join([d.source for d in donnees]),
                 date_collecte=datetime.now()
-            )
-            self.repository.add_salaire(salaire)
+            ))
+        self.repository.add_salaires_bulk(salaires_bruts)
 
         # Mettre à jour la fiche
         fiche.salaires = salaires_agreges
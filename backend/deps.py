@@ -21,6 +21,40 @@ repo = Repository(
 repo.init_db()
 
 
+async def shared_repo_session():
+    """Dépendance FastAPI : une seule session DB pour tous les appels repo de la requête.
+
+    À réserver aux endpoints sans appel réseau long (la connexion reste
+    empruntée au pool pendant toute la requête).
+    """
+    with repo.shared_session():
+        yield
+
+
+# ---------- Async repository singleton ----------
+_async_repo = None
+
+
+def get_async_repo():
+    """Dépendance FastAPI : AsyncRepository (asyncpg / aiosqlite), créé au premier appel."""
+    global _async_repo
+    if _async_repo is None:
+        from database.async_repository import AsyncRepository
+        _async_repo = AsyncRepository(
+            db_path=config.db_path if not config.database.database_url else None,
+            database_url=config.database.database_url
+        )
+    return _async_repo
+
+
+async def close_async_repo():
+    """Ferme le pool de l'AsyncRepository (arrêt du service)."""
+    global _async_repo
+    if _async_repo is not None:
+        await _async_repo.dispose()
+        _async_repo = None
+
+
 _claude_client = None
 _claude_client_initialized = False
 
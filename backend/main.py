@@ -19,7 +19,11 @@ async def lifespan(app: FastAPI):
     """Application lifespan: startup and shutdown."""
     await _startup()
     yield
-    # Shutdown: nothing to clean up
+    # Shutdown: close the shared HTTP client (France Travail / ROME) and the async DB pool
+    from sources.france_travail import close_http_client
+    from .deps import close_async_repo
+    await close_http_client()
+    await close_async_repo()
 
 
 app = FastAPI(
@@ -393,8 +393,7 @@ async def generate_variantes(code_rome: str, req: VariantesGenerateRequest, user
             fiche, langues=langues, tranches_age=tranches, formats=formats, genres=genres
         )
 
-        for v in variantes:
-            repo.save_variante(v)
+        repo.save_variantes_bulk(variantes)
 
         return {
             "message": f"{len(variantes)} variantes générées",
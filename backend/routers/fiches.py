@@ -1,6 +1,7 @@
 """
 CRUD endpoints for fiches métiers.
 """
+import heapq
 import re
 import logging
 import unicodedata
@@ -9,7 +10,7 @@ from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Query, Depends
 from pydantic import BaseModel, Field
 
-from ..deps import repo, validate_code_rome
+from ..deps import repo, validate_code_rome, shared_repo_session, get_async_repo
 from ..auth_middleware import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -115,12 +116,13 @@ def _build_responses(fiches_list) -> list:
 
 # ==================== ROUTES ====================
 
-@router.get("/fiches")
+@router.get("/fiches", dependencies=[Depends(shared_repo_session)])
 async def get_fiches(
     statut: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    async_repo=Depends(get_async_repo)
 ):
     """Liste les fiches métiers avec filtres et pagination."""
     try:
@@ -133,7 +135,7 @@ async def get_fiches(
 
         if search:
             # Recherche : charger TOUTES les fiches pour scoring côté Python
-            fiches = repo.get_all_fiches(statut=statut_enum, limit=10000)
+            fiches = await async_repo.get_all_fiches(statut=statut_enum, limit=10000)
             tokens = [_normalize_text(t) for t in search.strip().split() if t.strip()]
             if tokens:
                 scored_fiches = []
@@ -202,7 +204,7 @@ async def get_fiches(
         else:
             # Pas de recherche : pagination SQL directe (performant)
             total = repo.count_fiches(statut_enum)
-            fiches = repo.get_all_fiches(statut=statut_enum, limit=limit, offset=offset)
+            fiches = await async_repo.get_all_fiches(statut=statut_enum, limit=limit, offset=offset)
             results = _build_responses(fiches)
 
         return {"total": total, "limit": limit, "offset": offset, "results": results}
@@ -220,17 +222,17 @@ async def autocomplete_fiches(
 ):
     """Recherche rapide pour autocomplétion."""
     try:
-        fiches = repo.get_all_fiches(limit=10000)
         q_norm = _normalize_text(q)
         if not q_norm:
             return []
 
+        # Projection étroite : seuls les noms et champs affichés sont lus
         scored = []
-        for f in fiches:
-            code_n = _normalize_text(f.code_rome)
-            nom_m_n = _normalize_text(f.nom_masculin)
-            nom_f_n = _normalize_text(f.nom_feminin)
-            nom_e_n = _normalize_text(f.nom_epicene)
+        for row in repo.iter_fiches_noms(limit=10000):
+            code_n = _normalize_text(row[0])
+            nom_m_n = _normalize_text(row[1])
+            nom_f_n = _normalize_text(row[2])
+            nom_e_n = _normalize_text(row[3])
 
             score = 0
             # Exact match code ROME
@@ -250,28 +252,29 @@ async def autocomplete_fiches(
             else:
                 continue
 
-            scored.append((score, f))
+            scored.append((score, row))
 
-        scored.sort(key=lambda x: x[0], reverse=True)
         results = []
-        for _, f in scored[:limit]:
+        for _, (code_rome, nom_masculin, nom_feminin, _, statut, description_courte) in heapq.nlargest(
+            limit, scored, key=lambda x: x[0]
+        ):
             results.append(AutocompleteItem(
-                code_rome=f.code_rome,
-                nom_masculin=f.nom_masculin,
-                nom_feminin=f.nom_feminin,
-                statut=f.metadata.statut.value,
-                description_courte=f.description_courte
+                code_rome=code_rome,
+                nom_masculin=nom_masculin,
+                nom_feminin=nom_feminin,
+                statut=statut,
+                description_courte=description_courte
             ))
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail="Erreur interne. Veuillez réessayer.")
 
 
-@router.get("/fiches/{code_rome}")
-async def get_fiche_detail(code_rome: str):
+@router.get("/fiches/{code_rome}", dependencies=[Depends(shared_repo_session)])
+async def get_fiche_detail(code_rome: str, async_repo=Depends(get_async_repo)):
     """Récupère le détail complet d'une fiche métier."""
     try:
-        fiche = repo.get_fiche(code_rome)
+        fiche = await async_repo.get_fiche(code_rome)
         if not fiche:
             raise HTTPException(status_code=404, detail=f"Fiche {code_rome} non trouvée")
 
@@ -3,7 +3,7 @@ Stats and audit-logs endpoints.
 """
 from fastapi import APIRouter, HTTPException, Query, Depends
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 
 from ..deps import repo
 from ..auth_middleware import get_current_user
@@ -36,6 +36,42 @@ async def get_stats():
         raise HTTPException(status_code=500, detail="Erreur interne. Veuillez réessayer.")
 
 
+class TopTensionItem(BaseModel):
+    code_rome: str
+    nom_masculin: str
+    tension: float
+    tendance: Optional[str] = None
+
+
+class DashboardResponse(BaseModel):
+    total: int
+    statuts: Dict[str, int]
+    tendances: Dict[str, int]
+    top_tension: List[TopTensionItem]
+
+
+@router.get("/stats/dashboard", response_model=DashboardResponse)
+async def get_dashboard_stats(top: int = Query(10, ge=1, le=100)):
+    """
+    Agrégats du tableau de bord (statuts, tendances, top tension) en une seule session.
+
+    Endpoint d'API uniquement : le dashboard Next.js s'appuie sur /api/stats.
+    """
+    try:
+        aggregates = repo.get_dashboard_aggregates(top)
+        return DashboardResponse(
+            total=aggregates.total,
+            statuts=aggregates.statuts,
+            tendances=aggregates.tendances,
+            top_tension=[
+                TopTensionItem(code_rome=code_rome, nom_masculin=nom, tension=tension, tendance=tendance)
+                for code_rome, nom, tension, tendance in aggregates.top_tension
+            ],
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Erreur interne. Veuillez réessayer.")
+
+
 @router.get("/audit-logs")
 async def get_audit_logs(
     limit: int = Query(15, ge=1, le=200),
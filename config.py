@@ -81,6 +81,8 @@ class VeilleConfig:
     interval_salaires: int = 24 * 7  # Hebdomadaire
     interval_metiers: int = 24  # Quotidien
     interval_correction: int = 24 * 30  # Mensuel
+    # Purge des refresh tokens (en minutes)
+    interval_nettoyage_tokens: int = 15
 
     # Seuils d'alerte
     seuil_tension_haute: float = 0.7
@@ -88,6 +90,8 @@ class VeilleConfig:
 
     # Nombre max de fiches à traiter par cycle
     batch_size: int = 50
+    # Fiches traitées simultanément par les agents (appels Claude en parallèle)
+    concurrency: int = 5
 
 
 @dataclass
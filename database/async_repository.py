@@ -0,0 +1,141 @@
+"""
+Variante asynchrone du Repository (sqlalchemy.ext.asyncio).
+
+PostgreSQL via asyncpg, SQLite via aiosqlite. Ne couvre que les lectures
+chaudes de l'API (backend/routers/fiches.py) et l'ajout d'audit ; la
+création du schéma et les migrations restent dans Repository.init_db().
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from .models import FicheMetierDB, FicheMetier, AuditLog, StatutFiche
+from .repository import _select_fiche, _select_fiches, _select_search_fiches, _audit_log_to_db
+
+logger = logging.getLogger(__name__)
+
+# Taille des lots pour les lectures parallélisées (export)
+FETCH_CHUNK_SIZE = 200
+
+
+def _async_url(database_url: str):
+    """Convertit une URL synchrone (psycopg2 / sqlite) vers le driver async."""
+    url = make_url(database_url.replace("postgres://", "postgresql://", 1))
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+        # asyncpg ne connaît pas sslmode (paramètre libpq)
+        if "sslmode" in url.query:
+            url = url.update_query_dict({"ssl": url.query["sslmode"]})
+            url = url.difference_update_query(["sslmode"])
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+class AsyncRepository:
+    """Accès asynchrone aux fiches (même schéma et mêmes requêtes que Repository)."""
+
+    def __init__(self, db_path: Optional[Path] = None, database_url: Optional[str] = None, echo: bool = False):
+        if database_url:
+            url = _async_url(database_url)
+        elif db_path:
+            url = _async_url(f"sqlite:///{db_path}")
+        else:
+            raise ValueError("db_path ou database_url doit être fourni")
+
+        if url.get_backend_name() == "postgresql":
+            self.engine = create_async_engine(
+                url,
+                echo=echo,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+                pool_size=20,
+                max_overflow=10,
+                pool_use_lifo=True,
+            )
+        else:
+            # SQLite (dev / tests) : connexion ouverte par session, aucune
+            # connexion aiosqlite liée à une boucle asyncio déjà fermée
+            self.engine = create_async_engine(url, echo=echo, poolclass=NullPool)
+
+        self.SessionLocal = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Context manager pour une session async (commit / rollback)."""
+        async with self.SessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def dispose(self) -> None:
+        """Ferme les connexions du pool."""
+        await self.engine.dispose()
+
+    async def get_fiche(self, code_rome: str) -> Optional[FicheMetier]:
+        """Récupère une fiche par son code ROME."""
+        async with self.session() as session:
+            result = (await session.execute(_select_fiche(code_rome))).scalar_one_or_none()
+            return result.to_pydantic() if result else None
+
+    async def get_all_fiches(
+        self,
+        statut: Optional[StatutFiche] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[FicheMetier]:
+        """Récupère toutes les fiches, avec filtrage optionnel."""
+        async with self.session() as session:
+            results = (await session.execute(_select_fiches(statut, limit, offset))).scalars().all()
+            return [r.to_pydantic() for r in results]
+
+    async def search_fiches(
+        self,
+        query: str,
+        limit: int = 20,
+        statut: Optional[StatutFiche] = None
+    ) -> List[FicheMetier]:
+        """Recherche des fiches par nom ou description, filtrable par statut."""
+        async with self.session() as session:
+            results = (await session.execute(_select_search_fiches(query, limit, statut))).scalars().all()
+            return [r.to_pydantic() for r in results]
+
+    async def get_fiches_by_codes(
+        self,
+        codes_rome: List[str],
+        chunk_size: int = FETCH_CHUNK_SIZE
+    ) -> List[FicheMetier]:
+        """
+        Récupère plusieurs fiches par leurs codes ROME.
+
+        Les codes sont découpés en lots lus en parallèle (une session par lot).
+        """
+        async def fetch(chunk: List[str]) -> List[FicheMetier]:
+            async with self.session() as session:
+                results = (await session.execute(
+                    select(FicheMetierDB).where(FicheMetierDB.code_rome.in_(chunk))
+                )).scalars().all()
+                return [r.to_pydantic() for r in results]
+
+        chunks = [codes_rome[i:i + chunk_size] for i in range(0, len(codes_rome), chunk_size)]
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return [fiche for chunk in results for fiche in chunk]
+
+    async def add_audit_log(self, log: AuditLog) -> AuditLog:
+        """Ajoute un enregistrement d'audit."""
+        async with self.session() as session:
+            db_log = _audit_log_to_db(log)
+            session.add(db_log)
+            await session.flush()
+            log.id = db_log.id
+            return log
@@ -6,6 +6,7 @@ from enum import Enum
 from typing import Optional, Dict, List, Any
 from dataclasses import dataclass, field
 from pydantic import BaseModel, Field, field_validator, model_validator
+import hashlib
 import json
 
 
@@ -142,6 +143,19 @@ class MetadataFiche(BaseModel):
     tags: List[str] = Field(default_factory=list)
 
 
+# Champs ignorés par FicheMetier.compute_content_hash : horodatage/versionnage
+# gérés par le repository, et validation IA non persistée par update_fiche.
+_CONTENT_HASH_EXCLUDE = {
+    "validation_ia_score": True,
+    "validation_ia_date": True,
+    "validation_ia_details": True,
+    "metadata": {"date_creation", "date_maj", "version"},
+}
+
+# Champs ignorés par VarianteFiche.compute_content_hash
+_VARIANTE_HASH_EXCLUDE = {"id", "date_creation", "date_maj", "version"}
+
+
 class FicheMetier(BaseModel):
     """Modèle complet d'une fiche métier."""
     # Identifiants
@@ -379,6 +393,11 @@ class FicheMetier(BaseModel):
             score += 4
         return min(score, 100)
 
+    def compute_content_hash(self) -> str:
+        """Empreinte SHA-1 du contenu éditable (détection des mises à jour sans effet)."""
+        payload = self.model_dump_json(exclude=_CONTENT_HASH_EXCLUDE)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
     def to_dict(self) -> Dict[str, Any]:
         """Convertit la fiche en dictionnaire."""
         return self.model_dump(mode="json")
@@ -467,6 +486,11 @@ class VarianteFiche(BaseModel):
     date_maj: datetime = Field(default_factory=datetime.now)
     version: int = Field(1)
 
+    def compute_content_hash(self) -> str:
+        """Empreinte SHA-1 du contenu de la variante (axes + textes)."""
+        payload = self.model_dump_json(exclude=_VARIANTE_HASH_EXCLUDE)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
 
 # ============================================================================
 # Tables SQLAlchemy pour la persistance
@@ -476,10 +500,14 @@ from sqlalchemy import (
     Column, Integer, String, Text, Float, Boolean, DateTime,
     ForeignKey, JSON, Enum as SQLEnum, create_engine, Index
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
+# JSON en SQLite, JSONB en PostgreSQL (stockage binaire, indexable en GIN)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 def _parse_json_field(value):
     """Parse a JSON field that might be stored as string in SQLite."""
@@ -574,58 +602,61 @@ class FicheMetierDB(Base):
     description_courte = Column(String(500), nullable=True)
 
     # Données JSON pour les listes et objets complexes
-    competences = Column(JSON, default=list)
-    competences_transversales = Column(JSON, default=list)
-    formations = Column(JSON, default=list)
-    certifications = Column(JSON, default=list)
-    conditions_travail = Column(JSON, default=list)
-    environnements = Column(JSON, default=list)
-    metiers_proches = Column(JSON, default=list)
-    secteurs_activite = Column(JSON, default=list)
+    competences = Column(JSONType, default=list)
+    competences_transversales = Column(JSONType, default=list)
+    formations = Column(JSONType, default=list)
+    certifications = Column(JSONType, default=list)
+    conditions_travail = Column(JSONType, default=list)
+    environnements = Column(JSONType, default=list)
+    metiers_proches = Column(JSONType, default=list)
+    secteurs_activite = Column(JSONType, default=list)
 
     # Contenu enrichi
-    missions_principales = Column(JSON, default=list)
+    missions_principales = Column(JSONType, default=list)
     acces_metier = Column(Text, nullable=True)
-    savoirs = Column(JSON, default=list)
-    autres_appellations = Column(JSON, default=list)
-    traits_personnalite = Column(JSON, default=list)
-    aptitudes = Column(JSON, default=list)
-    profil_riasec = Column(JSON, nullable=True)
-    competences_dimensions = Column(JSON, nullable=True)
-    domaine_professionnel = Column(JSON, nullable=True)
-    preferences_interets = Column(JSON, nullable=True)
-    sites_utiles = Column(JSON, default=list)
-    conditions_travail_detaillees = Column(JSON, nullable=True)
-    statuts_professionnels = Column(JSON, default=list)
+    savoirs = Column(JSONType, default=list)
+    autres_appellations = Column(JSONType, default=list)
+    traits_personnalite = Column(JSONType, default=list)
+    aptitudes = Column(JSONType, default=list)
+    profil_riasec = Column(JSONType, nullable=True)
+    competences_dimensions = Column(JSONType, nullable=True)
+    domaine_professionnel = Column(JSONType, nullable=True)
+    preferences_interets = Column(JSONType, nullable=True)
+    sites_utiles = Column(JSONType, default=list)
+    conditions_travail_detaillees = Column(JSONType, nullable=True)
+    statuts_professionnels = Column(JSONType, default=list)
     niveau_formation = Column(String(100), nullable=True)
-    types_contrats = Column(JSON, nullable=True)
+    types_contrats = Column(JSONType, nullable=True)
     rome_update_pending = Column(Integer, default=0)
 
     # Validation IA
     validation_ia_score = Column(Integer, nullable=True)
     validation_ia_date = Column(DateTime, nullable=True)
-    validation_ia_details = Column(JSON, nullable=True)
+    validation_ia_details = Column(JSONType, nullable=True)
 
     # Données salariales (JSON)
-    salaires = Column(JSON, default=dict)
+    salaires = Column(JSONType, default=dict)
 
     # Perspectives (JSON)
-    perspectives = Column(JSON, default=dict)
+    perspectives = Column(JSONType, default=dict)
 
     # Métadonnées
     statut = Column(String(20), default="brouillon")
     version = Column(Integer, default=1)
     source = Column(String(50), default="ROME")
-    tags = Column(JSON, default=list)
+    tags = Column(JSONType, default=list)
 
     date_creation = Column(DateTime, default=datetime.now)
     date_maj = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     auteur = Column(String(100), nullable=True)
+    content_hash = Column(String(40), nullable=True)
 
     # Index pour recherche
     __table_args__ = (
         Index("idx_nom_masculin", "nom_masculin"),
         Index("idx_statut", "statut"),
+        # Filtre par statut + tri/pagination par code ROME
+        Index("idx_statut_code_rome", "statut", "code_rome"),
     )
 
     def to_pydantic(self) -> FicheMetier:
@@ -647,25 +678,25 @@ class FicheMetierDB(Base):
             environnements=self.environnements or [],
             metiers_proches=self.metiers_proches or [],
             secteurs_activite=self.secteurs_activite or [],
-            missions_principales=getattr(self, 'missions_principales', None) or [],
-            acces_metier=getattr(self, 'acces_metier', None),
-            savoirs=getattr(self, 'savoirs', None) or [],
-            autres_appellations=getattr(self, 'autres_appellations', None) or [],
-            traits_personnalite=getattr(self, 'traits_personnalite', None) or [],
-            aptitudes=getattr(self, 'aptitudes', None) or [],
-            profil_riasec=getattr(self, 'profil_riasec', None),
-            competences_dimensions=getattr(self, 'competences_dimensions', None),
-            domaine_professionnel=getattr(self, 'domaine_professionnel', None),
-            preferences_interets=getattr(self, 'preferences_interets', None),
-            sites_utiles=getattr(self, 'sites_utiles', None) or [],
-            conditions_travail_detaillees=getattr(self, 'conditions_travail_detaillees', None),
-            statuts_professionnels=getattr(self, 'statuts_professionnels', None) or [],
-            niveau_formation=getattr(self, 'niveau_formation', None),
-            types_contrats=getattr(self, 'types_contrats', None),
-            rome_update_pending=bool(getattr(self, 'rome_update_pending', 0)),
-            validation_ia_score=getattr(self, 'validation_ia_score', None),
-            validation_ia_date=getattr(self, 'validation_ia_date', None),
-            validation_ia_details=getattr(self, 'validation_ia_details', None),
+            missions_principales=self.missions_principales or [],
+            acces_metier=self.acces_metier,
+            savoirs=self.savoirs or [],
+            autres_appellations=self.autres_appellations or [],
+            traits_personnalite=self.traits_personnalite or [],
+            aptitudes=self.aptitudes or [],
+            profil_riasec=self.profil_riasec,
+            competences_dimensions=self.competences_dimensions,
+            domaine_professionnel=self.domaine_professionnel,
+            preferences_interets=self.preferences_interets,
+            sites_utiles=self.sites_utiles or [],
+            conditions_travail_detaillees=self.conditions_travail_detaillees,
+            statuts_professionnels=self.statuts_professionnels or [],
+            niveau_formation=self.niveau_formation,
+            types_contrats=self.types_contrats,
+            rome_update_pending=bool(self.rome_update_pending or 0),
+            validation_ia_score=self.validation_ia_score,
+            validation_ia_date=self.validation_ia_date,
+            validation_ia_details=self.validation_ia_details,
             salaires=self.salaires or {},
             perspectives=self.perspectives or {},
             metadata=MetadataFiche(
@@ -725,7 +756,8 @@ class FicheMetierDB(Base):
             tags=fiche.metadata.tags,
             date_creation=fiche.metadata.date_creation,
             date_maj=fiche.metadata.date_maj,
-            auteur=fiche.metadata.auteur
+            auteur=fiche.metadata.auteur,
+            content_hash=fiche.compute_content_hash()
         )
 
 
@@ -795,11 +827,18 @@ class RefreshTokenDB(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     token_hash = Column(String(64), unique=True, nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
     revoked = Column(Boolean, default=False)
 
+    # Index des requêtes de révocation / purge
+    __table_args__ = (
+        Index("idx_rt_user_active", "user_id", "revoked"),
+        Index("idx_rt_expires", "expires_at"),
+        Index("idx_rt_revoked_expires", "revoked", "expires_at"),
+    )
+
 
 class DictionnaireGenreDB(Base):
     """Table du dictionnaire de correspondances de genre."""
@@ -841,11 +880,15 @@ class VarianteFicheDB(Base):
     date_creation = Column(DateTime, default=datetime.now)
     date_maj = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     version = Column(Integer, default=1)
+    content_hash = Column(String(40), nullable=True)
 
     # Index composite unique pour éviter les doublons
     __table_args__ = (
+        # INCLUDE (PostgreSQL) : la sonde d'upsert lit id/version/date_maj
+        # directement dans l'index, sans accès au heap
         Index("idx_variante_unique", "code_rome", "langue", "tranche_age",
-              "format_contenu", "genre", unique=True),
+              "format_contenu", "genre", unique=True,
+              postgresql_include=["id", "version", "date_maj"]),
     )
 
     def to_pydantic(self) -> VarianteFiche:
@@ -891,5 +934,6 @@ class VarianteFicheDB(Base):
             environnements=variante.environnements,
             date_creation=variante.date_creation,
             date_maj=variante.date_maj,
-            version=variante.version
+            version=variante.version,
+            content_hash=variante.compute_content_hash()
         )
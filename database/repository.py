@@ -1,14 +1,26 @@
 """
 Repository pour l'accès aux données des fiches métiers.
 """
+import atexit
+import io
 import json
 import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
 from contextlib import contextmanager
+from contextvars import ContextVar
 
-from sqlalchemy import create_engine, select, update, delete, func, or_
+from sqlalchemy import (
+    JSON, create_engine, event, inspect, select, insert, update, delete, func, and_, or_, text,
+    bindparam, exists, literal_column, type_coerce,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -23,6 +35,303 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Index GIN trigram (PostgreSQL) : accélèrent les recherches ILIKE '%...%'
+# qui, sans eux, imposent un parcours séquentiel de la table.
+TRGM_INDEXES = [
+    ("ix_fiche_nom_masculin_trgm", "fiches_metiers", "nom_masculin"),
+    ("ix_fiche_nom_feminin_trgm", "fiches_metiers", "nom_feminin"),
+    ("ix_fiche_description_trgm", "fiches_metiers", "description"),
+    ("ix_audit_code_rome_trgm", "audit_log", "code_rome"),
+    ("ix_audit_description_trgm", "audit_log", "description"),
+    ("ix_audit_agent_trgm", "audit_log", "agent"),
+]
+
+# Recherche plein texte sur audit_log (PostgreSQL) : colonne générée + index GIN
+AUDIT_SEARCH_VEC_DDL = [
+    "ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS search_vec tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', "
+    "coalesce(code_rome, '') || ' ' || coalesce(description, '') || ' ' || coalesce(agent, '')"
+    ")) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_audit_search_vec ON audit_log USING gin (search_vec)",
+]
+
+# Index spécifiques PostgreSQL sur les colonnes JSONB de fiches_metiers
+JSONB_INDEXES = [
+    ("ix_fiche_tags_gin", "USING gin (tags jsonb_path_ops)"),
+    ("ix_fiche_perspectives_tendance", "((perspectives->>'tendance'))"),
+]
+
+# Clé composite d'une variante (index unique idx_variante_unique)
+VARIANTE_KEY_COLUMNS = ("code_rome", "langue", "tranche_age", "format_contenu", "genre")
+
+# Colonnes de contenu recopiées lors d'un upsert de variante
+VARIANTE_CONTENT_COLUMNS = (
+    "nom", "description", "description_courte", "competences",
+    "competences_transversales", "formations", "certifications",
+    "conditions_travail", "environnements", "content_hash",
+)
+
+# Nombre de refresh tokens supprimés par transaction (cleanup_expired_tokens)
+TOKEN_CLEANUP_BATCH_SIZE = 1000
+
+# Taille des lots lus par export_all_fiches_json / iter_fiches_summary
+EXPORT_BATCH_SIZE = 200
+SUMMARY_BATCH_SIZE = 200
+
+# Session active dans le contexte courant (thread / tâche asyncio), sous la
+# forme (repository, session) : les appels imbriqués du même repository la
+# rejoignent au lieu d'en ouvrir une autre. Une seule ContextVar au niveau du
+# module (les Context gardent une référence forte sur leurs variables).
+_active_session: ContextVar[Optional[tuple]] = ContextVar("repository_session", default=None)
+
+# Durée de validité (s) du dictionnaire de genre préchargé en mémoire
+GENRE_CACHE_TTL = 3600
+
+# Réglages appliqués à chaque connexion SQLite (dev/tests). Le mode WAL crée
+# deux fichiers annexes à côté de la base : <db>-wal et <db>-shm.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# Repositories SQLite ouverts : le WAL est réintégré à la base en fin de processus
+_sqlite_repositories: "weakref.WeakSet[Repository]" = weakref.WeakSet()
+
+
+@atexit.register
+def _dispose_sqlite_repositories() -> None:
+    for repository in list(_sqlite_repositories):
+        repository.dispose()
+
+
+# Colonnes ajoutées au schéma après coup : (table, colonne, type SQL)
+ADDED_COLUMNS = [
+    ("fiches_metiers", "content_hash", "VARCHAR(40)"),
+    ("variantes_fiches", "content_hash", "VARCHAR(40)"),
+]
+
+# Index ajoutés à des tables existantes (create_all ne les crée pas) : (table, index)
+ADDED_INDEXES = [
+    ("refresh_tokens", "idx_rt_user_active"),
+    ("refresh_tokens", "idx_rt_expires"),
+    ("refresh_tokens", "idx_rt_revoked_expires"),
+    ("fiches_metiers", "idx_statut_code_rome"),
+]
+
+# Durée de validité (s) du cache des compteurs (dashboards). Les écritures
+# faites via ce repository l'invalident immédiatement ; le TTL borne le
+# retard vis-à-vis des autres processus (CLI, scheduler).
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_MAX_ENTRIES = 512
+
+# Au-delà de ce nombre de lignes, les insertions en lot passent par COPY (PostgreSQL)
+COPY_THRESHOLD = 100
+
+
+def _copy_text_value(value: Any) -> str:
+    """Formate une valeur pour COPY ... FROM STDIN (format texte PostgreSQL)."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _column_values(db_obj) -> Dict[str, Any]:
+    """Valeurs des colonnes d'un objet ORM (hors clé primaire) pour un INSERT en lot."""
+    return {
+        c.key: getattr(db_obj, c.key)
+        for c in db_obj.__table__.columns
+        if not c.primary_key
+    }
+
+
+def _apply_variante_update(db_variante: "VarianteFicheDB", variante: VarianteFiche) -> bool:
+    """
+    Recopie le contenu d'une variante sur l'enregistrement existant.
+
+    Retourne False sans rien modifier si le contenu est identique
+    (même content_hash) : ni date_maj ni version ne bougent.
+    """
+    content_hash = variante.compute_content_hash()
+    if db_variante.content_hash == content_hash:
+        return False
+    db_variante.nom = variante.nom
+    db_variante.description = variante.description
+    db_variante.description_courte = variante.description_courte
+    db_variante.competences = variante.competences
+    db_variante.competences_transversales = variante.competences_transversales
+    db_variante.formations = variante.formations
+    db_variante.certifications = variante.certifications
+    db_variante.conditions_travail = variante.conditions_travail
+    db_variante.environnements = variante.environnements
+    db_variante.content_hash = content_hash
+    db_variante.date_maj = datetime.now()
+    db_variante.version += 1
+    return True
+
+
+def _apply_fiche_update(db_fiche: FicheMetierDB, fiche: FicheMetier, content_hash: str) -> None:
+    """Recopie une FicheMetier sur sa ligne existante (version incrémentée)."""
+    db_fiche.nom_masculin = fiche.nom_masculin
+    db_fiche.nom_feminin = fiche.nom_feminin
+    db_fiche.nom_epicene = fiche.nom_epicene
+    db_fiche.description = fiche.description
+    db_fiche.description_courte = fiche.description_courte
+    db_fiche.competences = fiche.competences
+    db_fiche.competences_transversales = fiche.competences_transversales
+    db_fiche.formations = fiche.formations
+    db_fiche.certifications = fiche.certifications
+    db_fiche.conditions_travail = fiche.conditions_travail
+    db_fiche.environnements = fiche.environnements
+    db_fiche.metiers_proches = fiche.metiers_proches
+    db_fiche.secteurs_activite = fiche.secteurs_activite
+    db_fiche.missions_principales = fiche.missions_principales
+    db_fiche.acces_metier = fiche.acces_metier
+    db_fiche.savoirs = fiche.savoirs
+    db_fiche.autres_appellations = fiche.autres_appellations
+    db_fiche.traits_personnalite = fiche.traits_personnalite
+    db_fiche.aptitudes = fiche.aptitudes
+    db_fiche.profil_riasec = fiche.profil_riasec
+    db_fiche.competences_dimensions = fiche.competences_dimensions
+    db_fiche.domaine_professionnel = fiche.domaine_professionnel
+    db_fiche.preferences_interets = fiche.preferences_interets
+    db_fiche.sites_utiles = fiche.sites_utiles
+    db_fiche.conditions_travail_detaillees = fiche.conditions_travail_detaillees
+    db_fiche.statuts_professionnels = fiche.statuts_professionnels
+    db_fiche.niveau_formation = fiche.niveau_formation
+    db_fiche.types_contrats = fiche.types_contrats
+    db_fiche.rome_update_pending = int(fiche.rome_update_pending)
+    db_fiche.salaires = fiche.salaires.model_dump(mode="json")
+    db_fiche.perspectives = fiche.perspectives.model_dump(mode="json")
+    db_fiche.statut = fiche.metadata.statut.value
+    db_fiche.version = fiche.metadata.version + 1
+    db_fiche.tags = fiche.metadata.tags
+    db_fiche.date_maj = datetime.now()
+    db_fiche.auteur = fiche.metadata.auteur
+    db_fiche.content_hash = content_hash
+
+
+def _fiche_json_bytes(fiche: FicheMetier) -> bytes:
+    """JSON d'export (identique à fiche.to_json()) sérialisé directement en UTF-8."""
+    return fiche.__pydantic_serializer__.to_json(fiche, indent=2)
+
+
+# Requêtes de lecture des fiches
+
+def _select_fiche(code_rome: str):
+    return select(FicheMetierDB).where(FicheMetierDB.code_rome == code_rome)
+
+
+def _select_fiches(statut: Optional[StatutFiche], limit: int, offset: int):
+    query = select(FicheMetierDB)
+    if statut:
+        query = query.where(FicheMetierDB.statut == statut.value)
+    # Tri déterministe pour pagination cohérente
+    return query.order_by(FicheMetierDB.code_rome).limit(limit).offset(offset)
+
+
+def _search_condition(query: str):
+    search_pattern = f"%{query}%"
+    return or_(
+        FicheMetierDB.nom_masculin.ilike(search_pattern),
+        FicheMetierDB.nom_feminin.ilike(search_pattern),
+        FicheMetierDB.description.ilike(search_pattern)
+    )
+
+
+def _select_search_fiches(query: str, limit: int, statut: Optional[StatutFiche] = None):
+    select_query = select(FicheMetierDB).where(_search_condition(query))
+    if statut:
+        select_query = select_query.where(FicheMetierDB.statut == statut.value)
+    return select_query.limit(limit)
+
+
+def _audit_log_to_db(log: AuditLog) -> AuditLogDB:
+    return AuditLogDB(
+        timestamp=log.timestamp,
+        type_evenement=log.type_evenement.value,
+        code_rome=log.code_rome,
+        agent=log.agent,
+        description=log.description,
+        donnees_avant=log.donnees_avant,
+        donnees_apres=log.donnees_apres,
+        validateur=log.validateur
+    )
+
+
+# Statements construits une fois à l'import (chemins d'authentification) :
+# seuls les paramètres liés changent d'un appel à l'autre.
+_GET_REFRESH_TOKEN = select(
+    RefreshTokenDB.id,
+    RefreshTokenDB.token_hash,
+    RefreshTokenDB.user_id,
+    RefreshTokenDB.expires_at,
+    RefreshTokenDB.created_at,
+).where(RefreshTokenDB.token_hash == bindparam("h"), RefreshTokenDB.revoked == False)
+
+_REVOKE_REFRESH_TOKEN = (
+    update(RefreshTokenDB)
+    .where(RefreshTokenDB.token_hash == bindparam("h"), RefreshTokenDB.revoked == False)
+    .values(revoked=True)
+)
+
+_REVOKE_USER_TOKENS = (
+    update(RefreshTokenDB)
+    .where(RefreshTokenDB.user_id == bindparam("u"), RefreshTokenDB.revoked == False)
+    .values(revoked=True)
+    .returning(RefreshTokenDB.id)
+)
+
+
+@dataclass(slots=True)
+class DashboardAggregates:
+    """Agrégats affichés par les tableaux de bord (voir get_dashboard_aggregates)."""
+    statuts: Dict[str, int] = field(default_factory=dict)
+    tendances: Dict[str, int] = field(default_factory=dict)
+    top_tension: List[tuple] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.statuts.values())
+
+
+def _delete_tokens_batch(predicate):
+    """DELETE d'au plus :n tokens vérifiant le prédicat (clé primaire en sous-requête)."""
+    batch = select(RefreshTokenDB.id).where(predicate).limit(bindparam("n")).scalar_subquery()
+    return delete(RefreshTokenDB).where(RefreshTokenDB.id.in_(batch))
+
+
+# Deux prédicats plutôt qu'un OR : chacun a son index
+# (idx_rt_expires, idx_rt_revoked_expires)
+_CLEANUP_TOKENS_BATCHES = (
+    _delete_tokens_batch(RefreshTokenDB.expires_at < bindparam("now")),
+    _delete_tokens_batch(
+        and_(RefreshTokenDB.revoked == True, RefreshTokenDB.expires_at >= bindparam("now"))
+    ),
+)
+
 
 class Repository:
     """Repository pour l'accès à la base de données."""
@@ -51,6 +360,9 @@ class Repository:
                 echo=echo,
                 pool_pre_ping=True,  # Vérifier la connexion avant utilisation
                 pool_recycle=3600,   # Recycler les connexions toutes les heures
+                pool_size=20,
+                max_overflow=10,
+                pool_use_lifo=True,  # Réutiliser les connexions les plus chaudes
             )
         elif db_path:
             # SQLite (développement local)
@@ -59,23 +371,180 @@ class Repository:
                 echo=echo,
                 connect_args={"check_same_thread": False}
             )
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+            _sqlite_repositories.add(self)
         else:
             raise ValueError("db_path ou database_url doit être fourni")
 
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        # expire_on_commit=False : les objets restent lisibles après commit sans
+        # SELECT de rechargement. Chaque session étant courte, le risque de lire
+        # un attribut rendu obsolète par un autre writer reste limité au bloc.
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        # Colonne audit_log.search_vec disponible (PostgreSQL, voir init_db)
+        self._audit_fulltext = False
+        # Cache des compteurs : clé -> (timestamp, valeur)
+        self._count_cache: Dict[tuple, tuple] = {}
+        # init_db() déjà exécuté sur cette instance
+        self._db_initialized = False
+        # Dictionnaire de genre préchargé : masculin -> correspondance
+        self._genre_cache: Optional[Dict[str, DictionnaireGenre]] = None
+        self._genre_cache_ts = 0.0
+        self._genre_lock = threading.Lock()
+
+    def dispose(self) -> None:
+        """
+        Ferme les connexions du pool.
+
+        Sur SQLite, le WAL est d'abord réintégré à la base (checkpoint) et le
+        journal repasse en mode DELETE : le fichier .db se suffit à lui-même,
+        sans <db>-wal ni <db>-shm (la base de dev est versionnée).
+        """
+        self.engine.dispose()
+        if self.engine.dialect.name != "sqlite":
+            return
+        try:
+            with self.engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+        except SQLAlchemyError as e:
+            # Base encore ouverte par un autre processus : il fera le checkpoint
+            logger.debug(f"Checkpoint WAL non appliqué: {type(e).__name__}: {e}")
+        finally:
+            self.engine.dispose()
 
     def init_db(self) -> None:
-        """Crée les tables si elles n'existent pas."""
+        """
+        Crée les tables si elles n'existent pas et applique les migrations.
+
+        N'est exécuté qu'une fois par instance : les appels suivants
+        (CLI, startup API) ne refont pas l'introspection du schéma.
+        """
+        if self._db_initialized:
+            return
         Base.metadata.create_all(self.engine)
+        # Un seul inspecteur (avec son cache) pour toutes les vérifications
+        inspector = inspect(self.engine)
+        self._add_missing_columns(inspector)
+        self._add_missing_indexes(inspector)
+        if self.engine.dialect.name == "postgresql":
+            self._migrate_json_to_jsonb(inspector)
+            self._ensure_trgm_indexes()
+            self._ensure_audit_search_vec()
+            self._ensure_variante_key_include()
+        self._db_initialized = True
+
+    def _ensure_variante_key_include(self) -> None:
+        """Recrée idx_variante_unique avec INCLUDE si la base date d'avant (idempotent)."""
+        try:
+            with self.engine.begin() as conn:
+                indexdef = conn.execute(text(
+                    "SELECT indexdef FROM pg_indexes WHERE indexname = 'idx_variante_unique'"
+                )).scalar_one_or_none()
+                if indexdef is None or "INCLUDE" in indexdef:
+                    return
+                logger.info("Migration variantes_fiches: idx_variante_unique + INCLUDE")
+                index = next(i for i in VarianteFicheDB.__table__.indexes
+                             if i.name == "idx_variante_unique")
+                conn.execute(text("DROP INDEX idx_variante_unique"))
+                index.create(conn)
+        except SQLAlchemyError as e:
+            logger.warning(f"Migration idx_variante_unique ignorée: {type(e).__name__}: {e}")
+
+    def _ensure_audit_search_vec(self) -> None:
+        """Crée la colonne tsvector de recherche sur audit_log (idempotent)."""
+        try:
+            with self.engine.begin() as conn:
+                for ddl in AUDIT_SEARCH_VEC_DDL:
+                    conn.execute(text(ddl))
+            self._audit_fulltext = True
+        except SQLAlchemyError as e:
+            logger.warning(f"Recherche plein texte audit_log indisponible: {type(e).__name__}: {e}")
+
+    def _migrate_json_to_jsonb(self, inspector) -> None:
+        """Convertit en JSONB les colonnes JSON de fiches_metiers créées avant le passage à JSONB."""
+        if "fiches_metiers" not in inspector.get_table_names():
+            return
+        json_columns = [
+            c["name"] for c in inspector.get_columns("fiches_metiers")
+            if isinstance(c["type"], JSON) and not isinstance(c["type"], JSONB)
+        ]
+        try:
+            with self.engine.begin() as conn:
+                for column in json_columns:
+                    logger.info(f"Migration fiches_metiers: {column} JSON -> JSONB")
+                    conn.execute(text(
+                        f"ALTER TABLE fiches_metiers ALTER COLUMN {column} "
+                        f"TYPE jsonb USING {column}::jsonb"
+                    ))
+                for index_name, definition in JSONB_INDEXES:
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS {index_name} ON fiches_metiers {definition}"
+                    ))
+        except SQLAlchemyError as e:
+            logger.warning(f"Migration JSONB non appliquée: {type(e).__name__}: {e}")
+
+    def _add_missing_indexes(self, inspector) -> None:
+        """Crée sur les tables existantes les index introduits après leur création."""
+        for table_name, index_name in ADDED_INDEXES:
+            if index_name in {i["name"] for i in inspector.get_indexes(table_name)}:
+                continue
+            table = Base.metadata.tables[table_name]
+            index = next(i for i in table.indexes if i.name == index_name)
+            index.create(self.engine)
+
+    def _add_missing_columns(self, inspector) -> None:
+        """Ajoute aux tables existantes les colonnes introduites après leur création."""
+        for table, column, ddl_type in ADDED_COLUMNS:
+            if table not in inspector.get_table_names():
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            if column not in existing:
+                logger.info(f"Migration {table}: ajout de la colonne {column}")
+                with self.engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+    def _ensure_trgm_indexes(self) -> None:
+        """Crée l'extension pg_trgm et les index GIN de recherche (idempotent)."""
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                for index_name, table, column in TRGM_INDEXES:
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS {index_name} "
+                        f"ON {table} USING gin ({column} gin_trgm_ops)"
+                    ))
+        except SQLAlchemyError as e:
+            # Extension non autorisée (droits insuffisants) : la recherche
+            # reste fonctionnelle, simplement sans index.
+            logger.warning(f"Index trigram non créés: {type(e).__name__}: {e}")
 
     def drop_all(self) -> None:
         """Supprime toutes les tables (attention!)."""
         Base.metadata.drop_all(self.engine)
+        self._db_initialized = False
+
+    def _current_session(self) -> Optional[Session]:
+        """Session de ce repository ouverte dans le contexte courant, s'il y en a une."""
+        active = _active_session.get()
+        if active is not None and active[0] is self:
+            return active[1]
+        return None
 
     @contextmanager
     def session(self):
-        """Context manager pour les sessions de base de données."""
+        """
+        Context manager pour les sessions de base de données.
+
+        Si une session est déjà ouverte dans le contexte courant, elle est
+        réutilisée : le commit/rollback reste à la charge du bloc englobant.
+        """
+        active = self._current_session()
+        if active is not None:
+            yield active
+            return
+
         session = self.SessionLocal()
+        token = _active_session.set((self, session))
         try:
             yield session
             session.flush()  # Valider les changements avant commit
@@ -89,8 +558,100 @@ class Repository:
             logger.error(f"Unexpected error in session: {type(e).__name__}: {e}")
             raise
         finally:
+            _active_session.reset(token)
             session.close()
 
+    @contextmanager
+    def shared_session(self):
+        """
+        Ouvre une session partagée par tous les appels repo du bloc.
+
+        Contrairement à session(), les exceptions ne sont pas journalisées :
+        destiné à encadrer une requête HTTP complète (voir deps.shared_repo_session).
+        """
+        if self._current_session() is not None:
+            yield
+            return
+
+        session = self.SessionLocal()
+        token = _active_session.set((self, session))
+        try:
+            yield
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            _active_session.reset(token)
+            session.close()
+
+    @contextmanager
+    def _read_session(self):
+        """
+        Session de lecture pour les générateurs (iter_*).
+
+        Un générateur s'exécute dans le contexte de son appelant : une session
+        publiée dans la ContextVar serait rejointe par les appels faits pendant
+        qu'il est suspendu, et leurs écritures perdues s'il est fermé avant la
+        fin. Cette session n'est donc pas publiée (elle rejoint en revanche une
+        session englobante déjà ouverte).
+        """
+        active = self._current_session()
+        if active is not None:
+            yield active
+            return
+        session = self.SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def _bulk_insert(self, session: Session, model, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insère des lignes en lot dans la table du modèle.
+
+        PostgreSQL + gros volume : COPY FROM STDIN sur la connexion DBAPI.
+        Sinon : executemany via insert() (insertmanyvalues côté SQLAlchemy).
+        """
+        if not rows:
+            return 0
+        if self.engine.dialect.name == "postgresql" and len(rows) >= COPY_THRESHOLD:
+            columns = list(rows[0].keys())
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write("\t".join(_copy_text_value(row[c]) for c in columns))
+                buffer.write("\n")
+            buffer.seek(0)
+            raw = session.connection().connection.driver_connection
+            with raw.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN",
+                    buffer,
+                )
+        else:
+            session.execute(insert(model), rows)
+        return len(rows)
+
+    def _get_cached_count(self, key: tuple) -> Optional[Any]:
+        entry = self._count_cache.get(key)
+        if entry and time.monotonic() - entry[0] < COUNT_CACHE_TTL:
+            return entry[1]
+        return None
+
+    def _set_cached_count(self, key: tuple, value: Any) -> None:
+        if len(self._count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+            self._count_cache.clear()
+        self._count_cache[key] = (time.monotonic(), value)
+
+    def _invalidate_counts(self) -> None:
+        """
+        Vide le cache des compteurs après une écriture sur fiches/variantes.
+
+        Appelée après le bloc session(), donc après le commit : un lecteur
+        concurrent ne peut pas remettre en cache un compteur d'avant l'écriture.
+        """
+        self._count_cache.clear()
+
     # =========================================================================
     # Fiches Métiers
     # =========================================================================
@@ -101,14 +662,33 @@ class Repository:
             db_fiche = FicheMetierDB.from_pydantic(fiche)
             session.add(db_fiche)
             session.flush()
-            return db_fiche.to_pydantic()
+            creee = db_fiche.to_pydantic()
+        self._invalidate_counts()
+        return creee
+
+    def create_fiches_bulk(self, fiches: List[FicheMetier]) -> List[FicheMetier]:
+        """
+        Crée plusieurs fiches en une seule instruction INSERT ... RETURNING.
+
+        Les fiches sont renvoyées dans l'ordre d'entrée. Toute la liste est
+        annulée si un code ROME existe déjà.
+        """
+        if not fiches:
+            return []
+        rows = [_column_values(FicheMetierDB.from_pydantic(f)) for f in fiches]
+        with self.session() as session:
+            created = session.execute(
+                insert(FicheMetierDB).returning(FicheMetierDB, sort_by_parameter_order=True),
+                rows,
+            ).scalars().all()
+            creees = [r.to_pydantic() for r in created]
+        self._invalidate_counts()
+        return creees
 
     def get_fiche(self, code_rome: str) -> Optional[FicheMetier]:
         """Récupère une fiche par son code ROME."""
         with self.session() as session:
-            result = session.execute(
-                select(FicheMetierDB).where(FicheMetierDB.code_rome == code_rome)
-            ).scalar_one_or_none()
+            result = session.execute(_select_fiche(code_rome)).scalar_one_or_none()
             return result.to_pydantic() if result else None
 
     def get_all_fiches(
@@ -119,16 +699,106 @@ class Repository:
     ) -> List[FicheMetier]:
         """Récupère toutes les fiches, avec filtrage optionnel."""
         with self.session() as session:
-            query = select(FicheMetierDB)
-            if statut:
-                query = query.where(FicheMetierDB.statut == statut.value)
-            # Tri déterministe pour pagination cohérente
-            query = query.order_by(FicheMetierDB.code_rome).limit(limit).offset(offset)
-            results = session.execute(query).scalars().all()
+            results = session.execute(_select_fiches(statut, limit, offset)).scalars().all()
             return [r.to_pydantic() for r in results]
 
-    def update_fiche(self, fiche: FicheMetier) -> FicheMetier:
-        """Met à jour une fiche existante."""
+    def iter_fiches_summary(
+        self,
+        statut: Optional[StatutFiche] = None,
+        limit: Optional[int] = None,
+        with_total: bool = False,
+        search: Optional[str] = None
+    ) -> Iterator[tuple]:
+        """
+        Parcourt les fiches sous forme de tuples légers, sans hydratation ORM.
+
+        Args:
+            search: Filtre texte (mêmes critères que search_fiches)
+            with_total: Ajoute à chaque tuple le nombre total de fiches
+                correspondant au filtre (COUNT(*) OVER (), calculé avant LIMIT),
+                ce qui évite un count_fiches séparé.
+
+        Yields:
+            (code_rome, nom_masculin, statut, tension, date_maj[, total]), triés par code ROME
+        """
+        columns = [
+            FicheMetierDB.code_rome,
+            FicheMetierDB.nom_masculin,
+            FicheMetierDB.statut,
+            FicheMetierDB.perspectives["tension"].as_float(),
+            FicheMetierDB.date_maj,
+        ]
+        if with_total:
+            columns.append(func.count().over())
+        query = select(*columns)
+        if statut:
+            query = query.where(FicheMetierDB.statut == statut.value)
+        if search:
+            query = query.where(_search_condition(search))
+        query = query.order_by(FicheMetierDB.code_rome).limit(limit)
+        with self._read_session() as session:
+            for row in session.execute(query.execution_options(yield_per=SUMMARY_BATCH_SIZE)):
+                yield tuple(row)
+
+    def iter_fiches_noms(self, limit: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Parcourt les noms des fiches (projection étroite pour l'autocomplétion).
+
+        Yields:
+            (code_rome, nom_masculin, nom_feminin, nom_epicene, statut,
+            description_courte), triés par code ROME
+        """
+        query = select(
+            FicheMetierDB.code_rome,
+            FicheMetierDB.nom_masculin,
+            FicheMetierDB.nom_feminin,
+            FicheMetierDB.nom_epicene,
+            FicheMetierDB.statut,
+            FicheMetierDB.description_courte,
+        ).order_by(FicheMetierDB.code_rome).limit(limit)
+        with self._read_session() as session:
+            for row in session.execute(query.execution_options(yield_per=SUMMARY_BATCH_SIZE)):
+                yield tuple(row)
+
+    def get_top_fiches_by_tension(self, n: int = 10) -> List[tuple]:
+        """
+        Métiers les plus en tension, triés et limités côté SQL.
+
+        Le résultat partage le cache des compteurs (invalidé par les écritures).
+
+        Returns:
+            Jusqu'à n tuples (code_rome, nom_masculin, tension, tendance),
+            par tension décroissante
+        """
+        cached = self._get_cached_count(("top_tension", n))
+        if cached is not None:
+            return list(cached)
+        tension = FicheMetierDB.perspectives["tension"].as_float()
+        query = (
+            select(
+                FicheMetierDB.code_rome,
+                FicheMetierDB.nom_masculin,
+                tension,
+                FicheMetierDB.perspectives["tendance"].as_string(),
+            )
+            .where(tension > 0)
+            .order_by(tension.desc(), FicheMetierDB.code_rome)
+            .limit(n)
+        )
+        with self.session() as session:
+            top = [tuple(row) for row in session.execute(query)]
+        self._set_cached_count(("top_tension", n), top)
+        return list(top)
+
+    def update_fiche(self, fiche: FicheMetier, force: bool = False) -> FicheMetier:
+        """
+        Met à jour une fiche existante.
+
+        Si le contenu est identique à celui en base (même content_hash), rien
+        n'est réécrit et la version n'est pas incrémentée. force=True réécrit
+        quand même (migrations).
+        """
+        content_hash = fiche.compute_content_hash()
         with self.session() as session:
             db_fiche = session.execute(
                 select(FicheMetierDB).where(FicheMetierDB.code_rome == fiche.code_rome)
@@ -137,46 +807,52 @@ class Repository:
             if not db_fiche:
                 raise ValueError(f"Fiche {fiche.code_rome} non trouvée")
 
-            # Mise à jour des champs
-            db_fiche.nom_masculin = fiche.nom_masculin
-            db_fiche.nom_feminin = fiche.nom_feminin
-            db_fiche.nom_epicene = fiche.nom_epicene
-            db_fiche.description = fiche.description
-            db_fiche.description_courte = fiche.description_courte
-            db_fiche.competences = fiche.competences
-            db_fiche.competences_transversales = fiche.competences_transversales
-            db_fiche.formations = fiche.formations
-            db_fiche.certifications = fiche.certifications
-            db_fiche.conditions_travail = fiche.conditions_travail
-            db_fiche.environnements = fiche.environnements
-            db_fiche.metiers_proches = fiche.metiers_proches
-            db_fiche.secteurs_activite = fiche.secteurs_activite
-            db_fiche.missions_principales = fiche.missions_principales
-            db_fiche.acces_metier = fiche.acces_metier
-            db_fiche.savoirs = fiche.savoirs
-            db_fiche.autres_appellations = fiche.autres_appellations
-            db_fiche.traits_personnalite = fiche.traits_personnalite
-            db_fiche.aptitudes = fiche.aptitudes
-            db_fiche.profil_riasec = fiche.profil_riasec
-            db_fiche.competences_dimensions = fiche.competences_dimensions
-            db_fiche.domaine_professionnel = fiche.domaine_professionnel
-            db_fiche.preferences_interets = fiche.preferences_interets
-            db_fiche.sites_utiles = fiche.sites_utiles
-            db_fiche.conditions_travail_detaillees = fiche.conditions_travail_detaillees
-            db_fiche.statuts_professionnels = fiche.statuts_professionnels
-            db_fiche.niveau_formation = fiche.niveau_formation
-            db_fiche.types_contrats = fiche.types_contrats
-            db_fiche.rome_update_pending = int(fiche.rome_update_pending)
-            db_fiche.salaires = fiche.salaires.model_dump(mode="json")
-            db_fiche.perspectives = fiche.perspectives.model_dump(mode="json")
-            db_fiche.statut = fiche.metadata.statut.value
-            db_fiche.version = fiche.metadata.version + 1
-            db_fiche.tags = fiche.metadata.tags
-            db_fiche.date_maj = datetime.now()
-            db_fiche.auteur = fiche.metadata.auteur
+            if not force and db_fiche.content_hash == content_hash:
+                return db_fiche.to_pydantic()
+
+            _apply_fiche_update(db_fiche, fiche, content_hash)
 
             session.flush()
-            return db_fiche.to_pydantic()
+            mise_a_jour = db_fiche.to_pydantic()
+        self._invalidate_counts()
+        return mise_a_jour
+
+    def update_fiches_bulk(self, fiches: List[FicheMetier]) -> List[FicheMetier]:
+        """
+        Met à jour plusieurs fiches existantes dans une seule transaction.
+
+        Les lignes sont chargées en un SELECT ... IN, les fiches au contenu
+        inchangé (même content_hash) sont ignorées, puis un seul flush / commit
+        est émis. Rien n'est écrit si une fiche est introuvable.
+        """
+        if not fiches:
+            return []
+        with self.session() as session:
+            db_fiches = {
+                f.code_rome: f
+                for f in session.execute(
+                    select(FicheMetierDB).where(
+                        FicheMetierDB.code_rome.in_([f.code_rome for f in fiches])
+                    )
+                ).scalars()
+            }
+            manquantes = [f.code_rome for f in fiches if f.code_rome not in db_fiches]
+            if manquantes:
+                raise ValueError(f"Fiches non trouvées : {', '.join(manquantes)}")
+
+            modifiees = False
+            for fiche in fiches:
+                db_fiche = db_fiches[fiche.code_rome]
+                content_hash = fiche.compute_content_hash()
+                if db_fiche.content_hash != content_hash:
+                    _apply_fiche_update(db_fiche, fiche, content_hash)
+                    modifiees = True
+
+            session.flush()
+            mises_a_jour = [db_fiches[f.code_rome].to_pydantic() for f in fiches]
+        if modifiees:
+            self._invalidate_counts()
+        return mises_a_jour
 
     def delete_fiche(self, code_rome: str) -> bool:
         """Supprime une fiche métier et ses données liées (salaires, variantes)."""
@@ -191,25 +867,55 @@ class Repository:
             result = session.execute(
                 delete(FicheMetierDB).where(FicheMetierDB.code_rome == code_rome)
             )
-            return result.rowcount > 0
+        self._invalidate_counts()
+        return result.rowcount > 0
+
+    def publish_fiches_by_statut(self, statuts: List[StatutFiche]) -> List[tuple]:
+        """
+        Publie en un seul UPDATE toutes les fiches ayant l'un des statuts donnés.
+
+        La version est incrémentée et content_hash remis à NULL (le statut
+        fait partie du contenu haché). Retourne les (code_rome, nom_masculin)
+        publiés.
+
+        Un EXISTS (idx_statut) précède l'UPDATE : quand il n'y a rien à
+        publier, aucune transaction d'écriture n'est ouverte (pas de verrou
+        d'écriture SQLite).
+        """
+        a_publier = FicheMetierDB.statut.in_([s.value for s in statuts])
+        with self.session() as session:
+            if not session.scalar(select(exists().where(a_publier))):
+                return []
+            rows = session.execute(
+                update(FicheMetierDB)
+                .where(a_publier)
+                .values(
+                    statut=StatutFiche.PUBLIEE.value,
+                    version=FicheMetierDB.version + 1,
+                    date_maj=datetime.now(),
+                    content_hash=None,
+                )
+                .returning(FicheMetierDB.code_rome, FicheMetierDB.nom_masculin)
+            ).all()
+        if rows:
+            self._invalidate_counts()
+        return sorted(tuple(r) for r in rows)
 
     def search_fiches(
         self,
         query: str,
-        limit: int = 20
+        limit: int = 20,
+        statut: Optional[StatutFiche] = None
     ) -> List[FicheMetier]:
-        """Recherche des fiches par nom ou description."""
+        """
+        Recherche des fiches par nom ou description, filtrable par statut.
+
+        Sur PostgreSQL, les ILIKE '%...%' sont servis par les index GIN
+        trigram créés dans init_db() (voir TRGM_INDEXES). Le filtre statut
+        est appliqué en SQL, avant le LIMIT.
+        """
         with self.session() as session:
-            search_pattern = f"%{query}%"
-            results = session.execute(
-                select(FicheMetierDB).where(
-                    or_(
-                        FicheMetierDB.nom_masculin.ilike(search_pattern),
-                        FicheMetierDB.nom_feminin.ilike(search_pattern),
-                        FicheMetierDB.description.ilike(search_pattern)
-                    )
-                ).limit(limit)
-            ).scalars().all()
+            results = session.execute(_select_search_fiches(query, limit, statut)).scalars().all()
             return [r.to_pydantic() for r in results]
 
     def count_fiches(self, statut: Optional[StatutFiche] = None) -> int:
@@ -221,13 +927,49 @@ class Repository:
             return session.execute(query).scalar()
 
     def count_fiches_by_statut(self) -> dict:
-        """Compte les fiches par statut en une seule requête GROUP BY."""
+        """Compte les fiches par statut en une seule requête GROUP BY (mis en cache)."""
+        cached = self._get_cached_count(("statut",))
+        if cached is not None:
+            return dict(cached)
         with self.session() as session:
             results = session.execute(
                 select(FicheMetierDB.statut, func.count(FicheMetierDB.id))
                 .group_by(FicheMetierDB.statut)
             ).all()
-            return {statut: count for statut, count in results}
+            counts = {statut: count for statut, count in results}
+        self._set_cached_count(("statut",), counts)
+        return dict(counts)
+
+    def count_fiches_by_tendance(self) -> dict:
+        """
+        Compte les fiches par tendance (perspectives->tendance) en une seule
+        requête GROUP BY (mis en cache, comme count_fiches_by_statut).
+        """
+        cached = self._get_cached_count(("tendance",))
+        if cached is not None:
+            return dict(cached)
+        tendance = FicheMetierDB.perspectives["tendance"].as_string()
+        with self.session() as session:
+            results = session.execute(
+                select(tendance, func.count(FicheMetierDB.id))
+                .where(tendance.is_not(None))
+                .group_by(tendance)
+            ).all()
+            counts = {valeur: count for valeur, count in results}
+        self._set_cached_count(("tendance",), counts)
+        return dict(counts)
+
+    def get_dashboard_aggregates(self, top_n: int = 10) -> DashboardAggregates:
+        """
+        Agrégats du tableau de bord en une seule session : comptes par statut,
+        comptes par tendance et top des métiers en tension.
+        """
+        with self.session():
+            return DashboardAggregates(
+                statuts=self.count_fiches_by_statut(),
+                tendances=self.count_fiches_by_tendance(),
+                top_tension=self.get_top_fiches_by_tension(top_n),
+            )
 
     def get_fiches_by_codes(self, codes_rome: List[str]) -> List[FicheMetier]:
         """Récupère plusieurs fiches par leurs codes ROME."""
@@ -237,6 +979,38 @@ class Repository:
             ).scalars().all()
             return [r.to_pydantic() for r in results]
 
+    def get_fiche_versions(self, codes_rome: List[str]) -> Dict[str, int]:
+        """
+        Numéros de version des fiches, sans les charger.
+
+        Permet de savoir quelles fiches déjà lues ont été réécrites depuis
+        (toute écriture incrémente la version).
+        """
+        with self.session() as session:
+            return dict(session.execute(
+                select(FicheMetierDB.code_rome, FicheMetierDB.version)
+                .where(FicheMetierDB.code_rome.in_(codes_rome))
+            ).all())
+
+    def get_fiches_by_tag(self, tag: str, limit: int = 100) -> List[FicheMetier]:
+        """
+        Récupère les fiches portant un tag (metadata.tags).
+
+        PostgreSQL : containment JSONB (tags @> '["tag"]'), servi par l'index
+        GIN ix_fiche_tags_gin. SQLite : EXISTS sur json_each(tags).
+        """
+        if self.engine.dialect.name == "postgresql":
+            condition = type_coerce(FicheMetierDB.tags, JSONB).contains([tag])
+        else:
+            elements = func.json_each(FicheMetierDB.tags).table_valued("value")
+            condition = select(elements.c.value).where(elements.c.value == tag).exists()
+        with self.session() as session:
+            results = session.execute(
+                select(FicheMetierDB).where(condition)
+                .order_by(FicheMetierDB.code_rome).limit(limit)
+            ).scalars().all()
+            return [r.to_pydantic() for r in results]
+
     def upsert_fiche(self, fiche: FicheMetier) -> FicheMetier:
         """Crée ou met à jour une fiche."""
         existing = self.get_fiche(fiche.code_rome)
@@ -245,6 +1019,56 @@ class Repository:
         else:
             return self.create_fiche(fiche)
 
+    def upsert_fiches_bulk(self, fiches: List[FicheMetier]) -> List[FicheMetier]:
+        """
+        Crée ou met à jour plusieurs fiches dans une seule transaction.
+
+        Les fiches existantes sont chargées en un SELECT ... IN et mises à jour
+        si leur contenu a changé (content_hash), les nouvelles sont insérées en
+        lot (INSERT ... RETURNING). Si la liste contient deux fois le même code
+        ROME, la dernière l'emporte.
+
+        Returns:
+            Fiches sauvegardées, dans l'ordre d'entrée
+        """
+        if not fiches:
+            return []
+
+        dernieres = {f.code_rome: f for f in fiches}
+        with self.session() as session:
+            saved = {
+                f.code_rome: f
+                for f in session.execute(
+                    select(FicheMetierDB).where(FicheMetierDB.code_rome.in_(list(dernieres)))
+                ).scalars()
+            }
+
+            modifiees = False
+            pending: Dict[str, Dict[str, Any]] = {}
+            for code_rome, fiche in dernieres.items():
+                db_fiche = saved.get(code_rome)
+                if db_fiche is None:
+                    pending[code_rome] = _column_values(FicheMetierDB.from_pydantic(fiche))
+                    continue
+                content_hash = fiche.compute_content_hash()
+                if db_fiche.content_hash != content_hash:
+                    _apply_fiche_update(db_fiche, fiche, content_hash)
+                    modifiees = True
+
+            if pending:
+                inserted = session.execute(
+                    insert(FicheMetierDB).returning(FicheMetierDB, sort_by_parameter_order=True),
+                    list(pending.values()),
+                ).scalars().all()
+                saved.update(zip(pending, inserted))
+                modifiees = True
+
+            session.flush()
+            enregistrees = [saved[f.code_rome].to_pydantic() for f in fiches]
+        if modifiees:
+            self._invalidate_counts()
+        return enregistrees
+
     # =========================================================================
     # Salaires
     # =========================================================================
@@ -267,6 +1091,24 @@ class Repository:
             salaire.id = db_salaire.id
             return salaire
 
+    def add_salaires_bulk(self, salaires: List[Salaire]) -> int:
+        """Ajoute plusieurs enregistrements de salaire en une seule transaction."""
+        rows = [
+            {
+                "code_rome": s.code_rome,
+                "niveau": s.niveau.value,
+                "region": s.region,
+                "min_salaire": s.min_salaire,
+                "max_salaire": s.max_salaire,
+                "median_salaire": s.median_salaire,
+                "source": s.source,
+                "date_collecte": s.date_collecte,
+            }
+            for s in salaires
+        ]
+        with self.session() as session:
+            return self._bulk_insert(session, SalaireDB, rows)
+
     def get_salaires_metier(
         self,
         code_rome: str,
@@ -349,6 +1191,24 @@ class Repository:
             historique.id = db_hist.id
             return historique
 
+    def add_historiques_veille_bulk(self, historiques: List[HistoriqueVeille]) -> int:
+        """Ajoute plusieurs enregistrements d'historique de veille en lot."""
+        rows = [
+            {
+                "type_veille": h.type_veille,
+                "source": h.source,
+                "date_execution": h.date_execution,
+                "nb_elements_traites": h.nb_elements_traites,
+                "nb_mises_a_jour": h.nb_mises_a_jour,
+                "nb_erreurs": h.nb_erreurs,
+                "details": h.details,
+                "succes": h.succes,
+            }
+            for h in historiques
+        ]
+        with self.session() as session:
+            return self._bulk_insert(session, HistoriqueVeilleDB, rows)
+
     def get_derniere_veille(self, type_veille: str) -> Optional[HistoriqueVeille]:
         """Récupère le dernier enregistrement de veille d'un type donné."""
         with self.session() as session:
@@ -380,21 +1240,30 @@ class Repository:
     def add_audit_log(self, log: AuditLog) -> AuditLog:
         """Ajoute un enregistrement d'audit."""
         with self.session() as session:
-            db_log = AuditLogDB(
-                timestamp=log.timestamp,
-                type_evenement=log.type_evenement.value,
-                code_rome=log.code_rome,
-                agent=log.agent,
-                description=log.description,
-                donnees_avant=log.donnees_avant,
-                donnees_apres=log.donnees_apres,
-                validateur=log.validateur
-            )
+            db_log = _audit_log_to_db(log)
             session.add(db_log)
             session.flush()
             log.id = db_log.id
             return log
 
+    def add_audit_logs_bulk(self, logs: List[AuditLog]) -> int:
+        """Ajoute plusieurs enregistrements d'audit en lot."""
+        rows = [
+            {
+                "timestamp": log.timestamp,
+                "type_evenement": log.type_evenement.value,
+                "code_rome": log.code_rome,
+                "agent": log.agent,
+                "description": log.description,
+                "donnees_avant": log.donnees_avant,
+                "donnees_apres": log.donnees_apres,
+                "validateur": log.validateur,
+            }
+            for log in logs
+        ]
+        with self.session() as session:
+            return self._bulk_insert(session, AuditLogDB, rows)
+
     def get_audit_logs(
         self,
         code_rome: Optional[str] = None,
@@ -414,12 +1283,24 @@ class Repository:
                 query = query.where(AuditLogDB.type_evenement == type_evenement.value)
             if search:
                 pattern = f"%{search}%"
-                query = query.where(
-                    or_(
-                        AuditLogDB.code_rome.ilike(pattern),
-                        AuditLogDB.description.ilike(pattern),
+                if self._audit_fulltext:
+                    # Index GIN sur search_vec ; le code ROME garde une recherche
+                    # partielle (ex: "M18") que la tokenisation ne couvre pas.
+                    query = query.where(
+                        or_(
+                            literal_column("audit_log.search_vec").op("@@")(
+                                func.websearch_to_tsquery("simple", search)
+                            ),
+                            AuditLogDB.code_rome.ilike(pattern),
+                        )
+                    )
+                else:
+                    query = query.where(
+                        or_(
+                            AuditLogDB.code_rome.ilike(pattern),
+                            AuditLogDB.description.ilike(pattern),
+                        )
                     )
-                )
             if agent:
                 query = query.where(AuditLogDB.agent.ilike(f"%{agent}%"))
             if since:
@@ -460,23 +1341,27 @@ class Repository:
                 categorie=correspondance.categorie
             )
             session.add(db_entry)
+        with self._genre_lock:
+            self._genre_cache = None
 
     def get_correspondance_genre(self, masculin: str) -> Optional[DictionnaireGenre]:
-        """Récupère une correspondance de genre par le terme masculin."""
-        with self.session() as session:
-            result = session.execute(
-                select(DictionnaireGenreDB)
-                .where(DictionnaireGenreDB.masculin == masculin)
-            ).scalar_one_or_none()
+        """
+        Récupère une correspondance de genre par le terme masculin.
 
-            if result:
-                return DictionnaireGenre(
-                    masculin=result.masculin,
-                    feminin=result.feminin,
-                    epicene=result.epicene,
-                    categorie=result.categorie
-                )
-            return None
+        La table est préchargée en mémoire (GENRE_CACHE_TTL) : appelée mot par
+        mot lors de la féminisation, elle évite une requête par terme.
+        """
+        with self._genre_lock:
+            if (
+                self._genre_cache is None
+                or time.monotonic() - self._genre_cache_ts > GENRE_CACHE_TTL
+            ):
+                self._genre_cache = {
+                    c.masculin: c for c in self.get_all_correspondances_genre()
+                }
+                self._genre_cache_ts = time.monotonic()
+            result = self._genre_cache.get(masculin)
+        return result.model_copy() if result else None
 
     def get_all_correspondances_genre(self) -> List[DictionnaireGenre]:
         """Récupère tout le dictionnaire de correspondances de genre."""
@@ -501,7 +1386,7 @@ class Repository:
         fiche = self.get_fiche(code_rome)
         if not fiche:
             return False
-        output_path.write_text(fiche.to_json(), encoding="utf-8")
+        output_path.write_bytes(_fiche_json_bytes(fiche))
         return True
 
     def import_fiche_json(self, json_path: Path) -> FicheMetier:
@@ -511,13 +1396,25 @@ class Repository:
         return self.upsert_fiche(fiche)
 
     def export_all_fiches_json(self, output_dir: Path) -> int:
-        """Exporte toutes les fiches en JSON dans un répertoire."""
+        """
+        Exporte toutes les fiches en JSON dans un répertoire.
+
+        Les lignes sont lues par lots (yield_per, curseur serveur sur
+        PostgreSQL) et écrites au fil de l'eau : la mémoire ne dépend pas
+        du nombre de fiches.
+        """
         output_dir.mkdir(parents=True, exist_ok=True)
-        fiches = self.get_all_fiches(limit=10000)
-        for fiche in fiches:
-            file_path = output_dir / f"{fiche.code_rome}.json"
-            file_path.write_text(fiche.to_json(), encoding="utf-8")
-        return len(fiches)
+        count = 0
+        with self.session() as session:
+            results = session.execute(
+                select(FicheMetierDB).order_by(FicheMetierDB.code_rome)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            ).scalars()
+            for db_fiche in results:
+                file_path = output_dir / f"{db_fiche.code_rome}.json"
+                file_path.write_bytes(_fiche_json_bytes(db_fiche.to_pydantic()))
+                count += 1
+        return count
 
     # =========================================================================
     # Variantes de Fiches
@@ -533,39 +1430,91 @@ class Repository:
         Returns:
             Variante sauvegardée avec ID
         """
+        values = _column_values(VarianteFicheDB.from_pydantic(variante))
+        dialect_insert = pg_insert if self.engine.dialect.name == "postgresql" else sqlite_insert
+        stmt = dialect_insert(VarianteFicheDB).values(**values)
+        # Un seul aller-retour : INSERT ... ON CONFLICT (clé composite) DO UPDATE,
+        # sauf si le contenu est inchangé (même content_hash)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(VARIANTE_KEY_COLUMNS),
+            set_={
+                **{c: stmt.excluded[c] for c in VARIANTE_CONTENT_COLUMNS},
+                "date_maj": datetime.now(),
+                "version": VarianteFicheDB.version + 1,
+            },
+            where=VarianteFicheDB.content_hash.is_distinct_from(stmt.excluded.content_hash),
+        ).returning(VarianteFicheDB)
+
         with self.session() as session:
-            # Recherche variante existante par clé composite
-            existing = session.execute(
-                select(VarianteFicheDB).where(
-                    VarianteFicheDB.code_rome == variante.code_rome,
-                    VarianteFicheDB.langue == variante.langue.value,
-                    VarianteFicheDB.tranche_age == variante.tranche_age.value,
-                    VarianteFicheDB.format_contenu == variante.format_contenu.value,
-                    VarianteFicheDB.genre == variante.genre.value
-                )
+            db_variante = session.execute(
+                stmt, execution_options={"populate_existing": True}
             ).scalar_one_or_none()
+            if db_variante is None:
+                # Contenu identique : rien n'a été écrit, on relit la ligne existante
+                return session.execute(
+                    select(VarianteFicheDB).where(
+                        *(getattr(VarianteFicheDB, c) == values[c] for c in VARIANTE_KEY_COLUMNS)
+                    )
+                ).scalar_one().to_pydantic()
+            enregistree = db_variante.to_pydantic()
+        self._invalidate_counts()
+        return enregistree
 
-            if existing:
-                # Mise à jour
-                existing.nom = variante.nom
-                existing.description = variante.description
-                existing.description_courte = variante.description_courte
-                existing.competences = variante.competences
-                existing.competences_transversales = variante.competences_transversales
-                existing.formations = variante.formations
-                existing.certifications = variante.certifications
-                existing.conditions_travail = variante.conditions_travail
-                existing.environnements = variante.environnements
-                existing.date_maj = datetime.now()
-                existing.version += 1
-                session.flush()
-                return existing.to_pydantic()
-            else:
-                # Création
-                db_variante = VarianteFicheDB.from_pydantic(variante)
-                session.add(db_variante)
-                session.flush()
-                return db_variante.to_pydantic()
+    def save_variantes_bulk(self, variantes: List[VarianteFiche]) -> List[VarianteFiche]:
+        """
+        Sauvegarde plusieurs variantes (upsert) dans une seule transaction.
+
+        Les variantes existantes sont chargées en une requête et mises à jour,
+        les nouvelles sont insérées en lot (INSERT ... RETURNING). Si la liste
+        contient deux fois la même clé composite, la dernière l'emporte.
+
+        Args:
+            variantes: Variantes à sauvegarder
+
+        Returns:
+            Variantes sauvegardées avec ID, dans l'ordre d'entrée
+        """
+        if not variantes:
+            return []
+
+        with self.session() as session:
+            # Clé composite : (code_rome, langue, tranche_age, format_contenu, genre)
+            existing = {
+                (e.code_rome, e.langue, e.tranche_age, e.format_contenu, e.genre): e
+                for e in session.execute(
+                    select(VarianteFicheDB).where(
+                        VarianteFicheDB.code_rome.in_({v.code_rome for v in variantes})
+                    )
+                ).scalars()
+            }
+
+            saved: List[Optional[VarianteFicheDB]] = [None] * len(variantes)
+            pending: Dict[tuple, Dict[str, Any]] = {}
+            pending_positions: Dict[tuple, List[int]] = {}
+            for i, variante in enumerate(variantes):
+                key = (variante.code_rome, variante.langue.value, variante.tranche_age.value,
+                       variante.format_contenu.value, variante.genre.value)
+                if key in existing:
+                    _apply_variante_update(existing[key], variante)
+                    saved[i] = existing[key]
+                else:
+                    pending[key] = _column_values(VarianteFicheDB.from_pydantic(variante))
+                    pending_positions.setdefault(key, []).append(i)
+
+            if pending:
+                inserted = session.execute(
+                    insert(VarianteFicheDB).returning(VarianteFicheDB, sort_by_parameter_order=True),
+                    list(pending.values()),
+                ).scalars().all()
+                for key, db_variante in zip(pending, inserted):
+                    for i in pending_positions[key]:
+                        saved[i] = db_variante
+
+            session.flush()
+            enregistrees = [v.to_pydantic() for v in saved]
+        if pending:
+            self._invalidate_counts()
+        return enregistrees
 
     def get_variante(
         self,
@@ -621,6 +1570,7 @@ class Repository:
         """
         Compte les variantes pour plusieurs fiches en une seule requête.
         Résout le problème N+1 queries sur la liste des fiches.
+        Le résultat est mis en cache (COUNT_CACHE_TTL).
 
         Args:
             codes_rome: Liste de codes ROME
@@ -630,15 +1580,19 @@ class Repository:
         """
         if not codes_rome:
             return {}
-        with self.session() as session:
-            results = session.execute(
-                select(VarianteFicheDB.code_rome, func.count(VarianteFicheDB.id))
-                .where(VarianteFicheDB.code_rome.in_(codes_rome))
-                .group_by(VarianteFicheDB.code_rome)
-            ).all()
-            counts = {code_rome: count for code_rome, count in results}
-            # Retourner 0 pour les fiches sans variantes
-            return {code: counts.get(code, 0) for code in codes_rome}
+        cache_key = ("variantes", tuple(sorted(set(codes_rome))))
+        counts = self._get_cached_count(cache_key)
+        if counts is None:
+            with self.session() as session:
+                results = session.execute(
+                    select(VarianteFicheDB.code_rome, func.count(VarianteFicheDB.id))
+                    .where(VarianteFicheDB.code_rome.in_(codes_rome))
+                    .group_by(VarianteFicheDB.code_rome)
+                ).all()
+                counts = {code_rome: count for code_rome, count in results}
+            self._set_cached_count(cache_key, counts)
+        # Retourner 0 pour les fiches sans variantes
+        return {code: counts.get(code, 0) for code in codes_rome}
 
     def get_all_variantes(self, code_rome: str) -> List[VarianteFiche]:
         """
@@ -679,7 +1633,8 @@ class Repository:
                     VarianteFicheDB.code_rome == code_rome
                 )
             )
-            return result.rowcount
+        self._invalidate_counts()
+        return result.rowcount
 
     # ============================================================================
     # Users (persistance en base)
@@ -733,62 +1688,70 @@ class Repository:
 
     def save_refresh_token(self, token_hash: str, user_id: int, expires_at: datetime) -> None:
         """Store a hashed refresh token."""
+        self.save_refresh_tokens_bulk([
+            {"token_hash": token_hash, "user_id": user_id, "expires_at": expires_at}
+        ])
+
+    def save_refresh_tokens_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Store several hashed refresh tokens in one transaction. Returns count stored.
+
+        Each row needs token_hash, user_id and expires_at. created_at and
+        revoked are filled here because the COPY path skips column defaults.
+        """
+        now = datetime.now()
+        rows = [
+            {"created_at": now, "revoked": False, **row}
+            for row in rows
+        ]
         with self.session() as session:
-            rt = RefreshTokenDB(
-                token_hash=token_hash,
-                user_id=user_id,
-                expires_at=expires_at,
-            )
-            session.add(rt)
+            return self._bulk_insert(session, RefreshTokenDB, rows)
 
     def get_refresh_token(self, token_hash: str) -> Optional[dict]:
         """Get a refresh token by its hash. Returns None if not found or revoked."""
+        # Core select of the needed columns: no ORM instance on this hot path
         with self.session() as session:
-            row = session.execute(
-                select(RefreshTokenDB).where(
-                    RefreshTokenDB.token_hash == token_hash,
-                    RefreshTokenDB.revoked == False,
-                )
-            ).scalar_one_or_none()
-            if row is None:
-                return None
-            return {
-                "id": row.id,
-                "token_hash": row.token_hash,
-                "user_id": row.user_id,
-                "expires_at": row.expires_at,
-                "created_at": row.created_at,
-            }
+            row = session.execute(_GET_REFRESH_TOKEN, {"h": token_hash}).first()
+            return None if row is None else dict(row._mapping)
 
     def revoke_refresh_token(self, token_hash: str) -> bool:
         """Revoke a specific refresh token. Returns True if found and revoked."""
+        # No prior read: the revoked == False filter makes a replayed revoke
+        # a no-op UPDATE (rowcount 0) on the token_hash unique index
         with self.session() as session:
-            result = session.execute(
-                update(RefreshTokenDB)
-                .where(RefreshTokenDB.token_hash == token_hash, RefreshTokenDB.revoked == False)
-                .values(revoked=True)
-            )
+            result = session.execute(_REVOKE_REFRESH_TOKEN, {"h": token_hash})
             return result.rowcount > 0
 
-    def revoke_all_user_tokens(self, user_id: int) -> int:
-        """Revoke all refresh tokens for a user. Returns count revoked."""
-        with self.session() as session:
-            result = session.execute(
-                update(RefreshTokenDB)
-                .where(RefreshTokenDB.user_id == user_id, RefreshTokenDB.revoked == False)
-                .values(revoked=True)
-            )
-            return result.rowcount
+    def revoke_all_user_tokens(self, user_id: int) -> List[int]:
+        """
+        Revoke all active refresh tokens for a user.
 
-    def cleanup_expired_tokens(self) -> int:
-        """Delete expired or revoked refresh tokens. Returns count deleted."""
+        Already-revoked rows are not touched again. Returns the ids of the
+        newly revoked tokens (UPDATE ... RETURNING, no follow-up SELECT).
+        """
         with self.session() as session:
-            result = session.execute(
-                delete(RefreshTokenDB).where(
-                    or_(
-                        RefreshTokenDB.expires_at < datetime.now(),
-                        RefreshTokenDB.revoked == True,
-                    )
-                )
-            )
-            return result.rowcount
+            return list(session.execute(_REVOKE_USER_TOKENS, {"u": user_id}).scalars())
+
+    def cleanup_expired_tokens(self, batch_size: int = TOKEN_CLEANUP_BATCH_SIZE) -> int:
+        """
+        Delete expired or revoked refresh tokens. Returns count deleted.
+
+        Deletes in batches of batch_size rows (DELETE ... WHERE id IN
+        (SELECT id ... LIMIT n)), one transaction per batch, so locks are
+        held briefly even when the table has grown large.
+
+        "now" is a bound parameter taken from the application clock, not
+        func.now(): expires_at is written and checked (auth router) as naive
+        local time, whereas CURRENT_TIMESTAMP is UTC on SQLite. The statement
+        text stays constant, so its compiled form is cached across runs.
+        """
+        params = {"now": datetime.now(), "n": batch_size}
+        total = 0
+        for statement in _CLEANUP_TOKENS_BATCHES:
+            while True:
+                with self.session() as session:
+                    deleted = session.execute(statement, params).rowcount
+                total += deleted
+                if deleted < batch_size:
+                    break
+        return total
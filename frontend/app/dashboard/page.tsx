@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { memo, useEffect, useMemo, useState } from "react";
 import Link from "next/link";
 import { api, Stats, AuditLog } from "@/lib/api";
 import SectionHeader from "@/components/SectionHeader";
@@ -10,9 +10,172 @@ import {
   BarChart, Bar, XAxis, YAxis, CartesianGrid,
 } from "recharts";
 
+const EVENT_ICONS: Record<string, string> = {
+  creation: "N",
+  modification: "E",
+  enrichissement: "E",
+  correction: "C",
+  validation: "V",
+  validation_ia: "V",
+  validation_humaine: "H",
+  modification_humaine: "M",
+  publication: "P",
+  suppression: "X",
+  archivage: "A",
+  veille_salaires: "S",
+  veille_metiers: "M",
+};
+
+const EVENT_LABELS: Record<string, string> = {
+  creation: "CRÉATION",
+  modification: "ENRICHISSEMENT IA",
+  enrichissement: "ENRICHISSEMENT IA",
+  correction: "CORRECTION",
+  validation: "VALIDATION IA",
+  validation_ia: "VALIDATION IA",
+  validation_humaine: "VALIDATION HUMAINE",
+  modification_humaine: "MODIFICATION",
+  publication: "PUBLICATION",
+  suppression: "SUPPRESSION",
+  archivage: "ARCHIVAGE",
+  veille_salaires: "VEILLE SALAIRES",
+  veille_metiers: "VEILLE MÉTIERS",
+};
+
+// Séries et styles des graphiques (constants : non recréés à chaque rendu)
+const STATUS_SERIES: { key: Exclude<keyof Stats, "total">; label: string; color: string }[] = [
+  { key: "brouillons", label: "Brouillons", color: "#6B7280" },
+  { key: "enrichis", label: "Enrichis", color: "#3B82F6" },
+  { key: "valides", label: "Valid\u00e9s IA", color: "#06B6D4" },
+  { key: "publiees", label: "Publi\u00e9es", color: "#10B981" },
+];
+
+const PIE_TOOLTIP_STYLE = { backgroundColor: "#0c0c1a", border: "1px solid rgba(255,255,255,0.1)", borderRadius: "12px", color: "#e5e7eb" };
+const BAR_TOOLTIP_STYLE = { borderRadius: "16px", border: "1px solid rgba(255,255,255,0.1)", backgroundColor: "#0c0c1a", fontSize: 13, color: "#e5e7eb" };
+const LEGEND_STYLE = { fontSize: 13, color: "#9CA3AF" };
+const BAR_MARGIN = { top: 10, right: 10, left: -10, bottom: 5 };
+const X_TICK = { fontSize: 12, fill: "#9CA3AF" };
+const Y_TICK = { fontSize: 11, fill: "#9CA3AF" };
+
+const formatFichesTooltip = (value: number): [number, string] => [value, "Fiches"];
+
+// Formateurs partagés : évite de reconstruire un formateur de locale par appel
+const DATE_FORMAT = new Intl.DateTimeFormat("fr-FR");
+const TIME_FORMAT = new Intl.DateTimeFormat("fr-FR", { hour: "2-digit", minute: "2-digit" });
+const NUMBER_FORMAT = new Intl.NumberFormat("fr-FR");
+
+function ActivityRowComponent({ log }: { log: AuditLog }) {
+  const icon = EVENT_ICONS[log.type_evenement] || "•";
+  const timestamp = new Date(log.timestamp);
+
+  const card = (
+    <div className={`sojai-card ${log.code_rome ? "cursor-pointer hover:shadow-card-hover transition-shadow" : ""}`} style={{ borderLeft: "3px solid #4F46E5" }}>
+      <div className="flex justify-between items-start">
+        <div className="flex items-start gap-4 flex-1">
+          <div className="w-8 h-8 rounded-full bg-indigo-500/20 flex items-center justify-center text-sm font-bold text-indigo-400 mt-0.5 shrink-0">{icon}</div>
+          <div className="flex-1 min-w-0">
+            <div className="flex items-center gap-2 flex-wrap">
+              <span className="font-semibold text-white">
+                {EVENT_LABELS[log.type_evenement] || log.type_evenement.replace("_", " ").toUpperCase()}
+              </span>
+              {log.code_rome && (
+                <span className="badge badge-purple text-xs">
+                  {log.code_rome}
+                </span>
+              )}
+              {log.agent && (
+                <span className={`text-xs px-2 py-0.5 rounded-full ${
+                  log.agent === "Claude IA"
+                    ? "bg-blue-500/20 text-blue-300"
+                    : "bg-white/[0.06] text-gray-400"
+                }`}>
+                  {log.agent}
+                </span>
+              )}
+            </div>
+            <div className="text-sm text-gray-400 mt-1">
+              {log.description}
+            </div>
+            {log.validateur && (
+              <div className="text-xs text-emerald-400 mt-1">
+                Validateur : {log.validateur}
+              </div>
+            )}
+          </div>
+        </div>
+        <div className="text-xs text-gray-400 text-right shrink-0 ml-4">
+          {DATE_FORMAT.format(timestamp)}
+          <br />
+          {TIME_FORMAT.format(timestamp)}
+        </div>
+      </div>
+    </div>
+  );
+
+  return log.code_rome ? (
+    <Link href={`/fiches/${log.code_rome}`}>
+      {card}
+    </Link>
+  ) : (
+    card
+  );
+}
+
+// Une ligne d'activité ne se re-rend que si son log change
+const ActivityRow = memo(ActivityRowComponent);
+
+// Le fil d'activité se rafraîchit seul : graphiques et métriques ne sont pas re-rendus
+const ACTIVITY_REFRESH_MS = 60_000;
+
+function RecentActivity() {
+  const [logs, setLogs] = useState<AuditLog[] | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    async function loadLogs() {
+      try {
+        const logsData = await api.getAuditLogs({ limit: 15 });
+        if (!cancelled) setLogs(logsData.logs);
+      } catch (err) {
+        console.error("Erreur chargement activité:", err);
+        if (!cancelled) setLogs((prev) => prev ?? []);
+      }
+    }
+    loadLogs();
+    const timer = setInterval(loadLogs, ACTIVITY_REFRESH_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(timer);
+    };
+  }, []);
+
+  if (logs === null) {
+    return <div className="animate-shimmer h-32 rounded-card"></div>;
+  }
+
+  return (
+    <StaggerContainer stagger={0.08} className="space-y-3">
+      {logs.length > 0 ? (
+        logs.map((log) => (
+          <StaggerItem key={log.id}>
+            <ActivityRow log={log} />
+          </StaggerItem>
+        ))
+      ) : (
+        <div className="sojai-card text-center py-12">
+          <div className="text-xl mb-4 text-gray-500">Aucune donnée</div>
+          <h4 className="text-xl font-semibold mb-2">Aucune activité</h4>
+          <p className="text-gray-400">
+            Les actions effectuées s'afficheront ici
+          </p>
+        </div>
+      )}
+    </StaggerContainer>
+  );
+}
+
 export default function DashboardPage() {
   const [stats, setStats] = useState<Stats | null>(null);
-  const [logs, setLogs] = useState<AuditLog[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [lastUpdate, setLastUpdate] = useState<Date | null>(null);
@@ -20,12 +183,8 @@ export default function DashboardPage() {
   useEffect(() => {
     async function loadData() {
       try {
-        const [statsData, logsData] = await Promise.all([
-          api.getStats(),
-          api.getAuditLogs({ limit: 15 }),
-        ]);
+        const statsData = await api.getStats();
         setStats(statsData);
-        setLogs(logsData.logs);
         setLastUpdate(new Date());
       } catch (err) {
         console.error("Erreur chargement données:", err);
@@ -37,6 +196,26 @@ export default function DashboardPage() {
     loadData();
   }, []);
 
+  // Données des graphiques, recalculées uniquement quand les stats changent
+  const pieData = useMemo(() => stats
+    ? STATUS_SERIES.map(({ key, label, color }) => ({ name: label, value: stats[key], color }))
+      .filter(d => d.value > 0)
+    : [], [stats]);
+
+  const barData = useMemo(() => stats
+    ? STATUS_SERIES.map(({ key, label, color }) => ({ etape: label, count: stats[key], fill: color }))
+    : [], [stats]);
+
+  // Valeurs des métriques formatées une seule fois (séparateur de milliers français)
+  const statsFmt = useMemo(() => ({
+    total: NUMBER_FORMAT.format(stats?.total || 0),
+    brouillons: NUMBER_FORMAT.format(stats?.brouillons || 0),
+    enrichis: NUMBER_FORMAT.format(stats?.enrichis || 0),
+    valides: NUMBER_FORMAT.format(stats?.valides || 0),
+    publiees: NUMBER_FORMAT.format(stats?.publiees || 0),
+    progression: NUMBER_FORMAT.format(stats ? stats.enrichis + stats.valides + stats.publiees : 0),
+  }), [stats]);
+
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -86,7 +265,7 @@ export default function DashboardPage() {
               </div>
               <div className="text-right">
                 <div className="text-2xl font-bold text-white">{progressPercentage.toFixed(1)}%</div>
-                <div className="text-xs text-gray-400">{progressTotal} / {stats?.total || 0} fiches</div>
+                <div className="text-xs text-gray-400">{statsFmt.progression} / {statsFmt.total} fiches</div>
               </div>
             </div>
             <div className="w-full bg-white/[0.06] rounded-full h-3">
@@ -107,7 +286,7 @@ export default function DashboardPage() {
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M19 11H5m14 0a2 2 0 012 2v6a2 2 0 01-2 2H5a2 2 0 01-2-2v-6a2 2 0 012-2m14 0V9a2 2 0 00-2-2M5 11V9a2 2 0 012-2m0 0V5a2 2 0 012-2h6a2 2 0 012 2v2M7 7h10" />
                 </svg>
               </div>
-              <div className="text-2xl font-bold text-indigo-400 mb-1">{stats?.total || 0}</div>
+              <div className="text-2xl font-bold text-indigo-400 mb-1">{statsFmt.total}</div>
               <div className="text-xs text-indigo-400">Total</div>
             </div>
           </StaggerItem>
@@ -118,7 +297,7 @@ export default function DashboardPage() {
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
                 </svg>
               </div>
-              <div className="text-2xl font-bold text-gray-400 mb-1">{stats?.brouillons || 0}</div>
+              <div className="text-2xl font-bold text-gray-400 mb-1">{statsFmt.brouillons}</div>
               <div className="text-xs text-gray-400">Brouillons</div>
             </div>
           </StaggerItem>
@@ -129,7 +308,7 @@ export default function DashboardPage() {
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M13 10V3L4 14h7v7l9-11h-7z" />
                 </svg>
               </div>
-              <div className="text-2xl font-bold text-blue-400 mb-1">{stats?.enrichis || 0}</div>
+              <div className="text-2xl font-bold text-blue-400 mb-1">{statsFmt.enrichis}</div>
               <div className="text-xs text-blue-400">Enrichis</div>
             </div>
           </StaggerItem>
@@ -140,7 +319,7 @@ export default function DashboardPage() {
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12l2 2 4-4M7.835 4.697a3.42 3.42 0 001.946-.806 3.42 3.42 0 014.438 0 3.42 3.42 0 001.946.806 3.42 3.42 0 013.138 3.138 3.42 3.42 0 00.806 1.946 3.42 3.42 0 010 4.438 3.42 3.42 0 00-.806 1.946 3.42 3.42 0 01-3.138 3.138 3.42 3.42 0 00-1.946.806 3.42 3.42 0 01-4.438 0 3.42 3.42 0 00-1.946-.806 3.42 3.42 0 01-3.138-3.138 3.42 3.42 0 00-.806-1.946 3.42 3.42 0 010-4.438 3.42 3.42 0 00.806-1.946 3.42 3.42 0 013.138-3.138z" />
                 </svg>
               </div>
-              <div className="text-2xl font-bold text-cyan-400 mb-1">{stats?.valides || 0}</div>
+              <div className="text-2xl font-bold text-cyan-400 mb-1">{statsFmt.valides}</div>
               <div className="text-xs text-cyan-400">Valid&eacute;s IA</div>
             </div>
           </StaggerItem>
@@ -151,7 +330,7 @@ export default function DashboardPage() {
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M5 3v4M3 5h4M6 17v4m-2-2h4m5-16l2.286 6.857L21 12l-5.714 2.143L13 21l-2.286-6.857L5 12l5.714-2.143L13 3z" />
                 </svg>
               </div>
-              <div className="text-2xl font-bold text-emerald-400 mb-1">{stats?.publiees || 0}</div>
+              <div className="text-2xl font-bold text-emerald-400 mb-1">{statsFmt.publiees}</div>
               <div className="text-xs text-emerald-400">Publi&eacute;es</div>
             </div>
           </StaggerItem>
@@ -223,14 +402,7 @@ export default function DashboardPage() {
               Répartition par statut
             </h3>
             <div className="h-56 md:h-72">
-              {stats && stats.total > 0 ? (() => {
-                const pieData = [
-                  { name: "Brouillons", value: stats.brouillons, color: "#6B7280" },
-                  { name: "Enrichis", value: stats.enrichis, color: "#3B82F6" },
-                  { name: "Valid\u00e9s IA", value: stats.valides, color: "#06B6D4" },
-                  { name: "Publi\u00e9es", value: stats.publiees, color: "#10B981" },
-                ].filter(d => d.value > 0);
-                return (
+              {stats && stats.total > 0 ? (
                 <ResponsiveContainer width="100%" height="100%">
                   <PieChart>
                     <Pie
@@ -248,12 +420,11 @@ export default function DashboardPage() {
                         <Cell key={i} fill={entry.color} />
                       ))}
                     </Pie>
-                    <Tooltip formatter={(value: number) => [value, "Fiches"]} contentStyle={{ backgroundColor: "#0c0c1a", border: "1px solid rgba(255,255,255,0.1)", borderRadius: "12px", color: "#e5e7eb" }} />
-                    <Legend iconType="circle" iconSize={8} wrapperStyle={{ fontSize: 13, color: "#9CA3AF" }} />
+                    <Tooltip formatter={formatFichesTooltip} contentStyle={PIE_TOOLTIP_STYLE} />
+                    <Legend iconType="circle" iconSize={8} wrapperStyle={LEGEND_STYLE} />
                   </PieChart>
                 </ResponsiveContainer>
-                );
-              })() : (
+              ) : (
                 <div className="h-full flex items-center justify-center text-gray-400">
                   Aucune donnée
                 </div>
@@ -269,37 +440,27 @@ export default function DashboardPage() {
               {stats && stats.total > 0 ? (
                 <ResponsiveContainer width="100%" height="100%">
                   <BarChart
-                    data={[
-                      { etape: "Brouillons", count: stats.brouillons, fill: "#6B7280" },
-                      { etape: "Enrichis", count: stats.enrichis, fill: "#3B82F6" },
-                      { etape: "Valid\u00e9s IA", count: stats.valides, fill: "#06B6D4" },
-                      { etape: "Publi\u00e9es", count: stats.publiees, fill: "#10B981" },
-                    ]}
-                    margin={{ top: 10, right: 10, left: -10, bottom: 5 }}
+                    data={barData}
+                    margin={BAR_MARGIN}
                   >
                     <CartesianGrid strokeDasharray="3 3" vertical={false} stroke="rgba(255,255,255,0.06)" />
                     <XAxis
                       dataKey="etape"
-                      tick={{ fontSize: 12, fill: "#9CA3AF" }}
+                      tick={X_TICK}
                       axisLine={false}
                       tickLine={false}
                     />
                     <YAxis
-                      tick={{ fontSize: 11, fill: "#9CA3AF" }}
+                      tick={Y_TICK}
                       axisLine={false}
                       tickLine={false}
                     />
                     <Tooltip
-                      formatter={(value: number) => [value, "Fiches"]}
-                      contentStyle={{ borderRadius: "16px", border: "1px solid rgba(255,255,255,0.1)", backgroundColor: "#0c0c1a", fontSize: 13, color: "#e5e7eb" }}
+                      formatter={formatFichesTooltip}
+                      contentStyle={BAR_TOOLTIP_STYLE}
                     />
                     <Bar dataKey="count" radius={[6, 6, 0, 0]} barSize={50}>
-                      {[
-                        { fill: "#6B7280" },
-                        { fill: "#3B82F6" },
-                        { fill: "#06B6D4" },
-                        { fill: "#10B981" },
-                      ].map((entry, i) => (
+                      {barData.map((entry, i) => (
                         <Cell key={i} fill={entry.fill} />
                       ))}
                     </Bar>
@@ -321,111 +482,7 @@ export default function DashboardPage() {
           description="Les 15 dernières actions effectuées sur les fiches"
         />
 
-        <StaggerContainer stagger={0.08} className="space-y-3">
-          {logs.length > 0 ? (
-            logs.map((log) => {
-              const icons: Record<string, string> = {
-                creation: "N",
-                modification: "E",
-                enrichissement: "E",
-                correction: "C",
-                validation: "V",
-                validation_ia: "V",
-                validation_humaine: "H",
-                modification_humaine: "M",
-                publication: "P",
-                suppression: "X",
-                archivage: "A",
-                veille_salaires: "S",
-                veille_metiers: "M",
-              };
-              const icon = icons[log.type_evenement] || "•";
-
-              const typeLabels: Record<string, string> = {
-                creation: "CRÉATION",
-                modification: "ENRICHISSEMENT IA",
-                enrichissement: "ENRICHISSEMENT IA",
-                correction: "CORRECTION",
-                validation: "VALIDATION IA",
-                validation_ia: "VALIDATION IA",
-                validation_humaine: "VALIDATION HUMAINE",
-                modification_humaine: "MODIFICATION",
-                publication: "PUBLICATION",
-                suppression: "SUPPRESSION",
-                archivage: "ARCHIVAGE",
-                veille_salaires: "VEILLE SALAIRES",
-                veille_metiers: "VEILLE MÉTIERS",
-              };
-
-              const card = (
-                <div className={`sojai-card ${log.code_rome ? "cursor-pointer hover:shadow-card-hover transition-shadow" : ""}`} style={{ borderLeft: "3px solid #4F46E5" }}>
-                  <div className="flex justify-between items-start">
-                    <div className="flex items-start gap-4 flex-1">
-                      <div className="w-8 h-8 rounded-full bg-indigo-500/20 flex items-center justify-center text-sm font-bold text-indigo-400 mt-0.5 shrink-0">{icon}</div>
-                      <div className="flex-1 min-w-0">
-                        <div className="flex items-center gap-2 flex-wrap">
-                          <span className="font-semibold text-white">
-                            {typeLabels[log.type_evenement] || log.type_evenement.replace("_", " ").toUpperCase()}
-                          </span>
-                          {log.code_rome && (
-                            <span className="badge badge-purple text-xs">
-                              {log.code_rome}
-                            </span>
-                          )}
-                          {log.agent && (
-                            <span className={`text-xs px-2 py-0.5 rounded-full ${
-                              log.agent === "Claude IA"
-                                ? "bg-blue-500/20 text-blue-300"
-                                : "bg-white/[0.06] text-gray-400"
-                            }`}>
-                              {log.agent}
-                            </span>
-                          )}
-                        </div>
-                        <div className="text-sm text-gray-400 mt-1">
-                          {log.description}
-                        </div>
-                        {log.validateur && (
-                          <div className="text-xs text-emerald-400 mt-1">
-                            Validateur : {log.validateur}
-                          </div>
-                        )}
-                      </div>
-                    </div>
-                    <div className="text-xs text-gray-400 text-right shrink-0 ml-4">
-                      {new Date(log.timestamp).toLocaleDateString("fr-FR")}
-                      <br />
-                      {new Date(log.timestamp).toLocaleTimeString("fr-FR", {
-                        hour: "2-digit",
-                        minute: "2-digit",
-                      })}
-                    </div>
-                  </div>
-                </div>
-              );
-
-              return (
-                <StaggerItem key={log.id}>
-                  {log.code_rome ? (
-                    <Link href={`/fiches/${log.code_rome}`}>
-                      {card}
-                    </Link>
-                  ) : (
-                    card
-                  )}
-                </StaggerItem>
-              );
-            })
-          ) : (
-            <div className="sojai-card text-center py-12">
-              <div className="text-xl mb-4 text-gray-500">Aucune donnée</div>
-              <h4 className="text-xl font-semibold mb-2">Aucune activité</h4>
-              <p className="text-gray-400">
-                Les actions effectuées s'afficheront ici
-              </p>
-            </div>
-          )}
-        </StaggerContainer>
+        <RecentActivity />
 
         {/* Footer */}
         <div className="mt-12 pt-8 border-t border-white/[0.06] text-center">
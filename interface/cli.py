@@ -2,6 +2,7 @@
 Interface en ligne de commande pour le système de fiches métiers.
 """
 import asyncio
+import functools
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -10,7 +11,7 @@ import click
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, MofNCompleteColumn
 from rich.tree import Tree
 from rich import print as rprint
 
@@ -20,32 +21,52 @@ from database.models import StatutFiche
 from orchestrator.orchestrator import Orchestrator, TypeTache
 from logging_system.journal import Journal
 from interface.validation import ValidationSystem
+from sources.france_travail import close_http_client
 
 
 console = Console()
 
+# Taille des lots de check-all (un appel par agent et par lot)
+CHECK_ALL_BATCH_SIZE = 10
 
+
+@functools.lru_cache(maxsize=1)
 def get_repository() -> Repository:
-    """Crée et retourne le repository."""
+    """Crée et retourne le repository (un seul engine / pool par processus)."""
     config = get_config()
     repo = Repository(config.db_path)
     repo.init_db()
     return repo
 
 
-def get_orchestrator(repo: Repository, journal: Journal) -> Orchestrator:
-    """Crée et retourne l'orchestrateur avec clients France Travail."""
+@functools.lru_cache(maxsize=1)
+def get_france_travail_clients() -> tuple:
+    """
+    Clients France Travail (offres/IMT, ROME), créés une fois par processus
+    pour conserver leurs tokens OAuth. (None, None) sans credentials.
+    """
     from sources.france_travail import FranceTravailClient
     from sources.france_travail_rome import FranceTravailROMEClient
 
     config = get_config()
-
-    # Instancier les clients France Travail si credentials disponibles
-    france_travail_client = None
-    rome_client = None
     if config.api.france_travail_client_id and config.api.france_travail_client_secret:
-        france_travail_client = FranceTravailClient()
-        rome_client = FranceTravailROMEClient()
+        return FranceTravailClient(), FranceTravailROMEClient()
+    return None, None
+
+
+@functools.lru_cache(maxsize=1)
+def get_claude_client():
+    """Client Claude async partagé par processus (None si indisponible)."""
+    try:
+        import anthropic
+        return anthropic.AsyncAnthropic()
+    except Exception:
+        return None
+
+
+def get_orchestrator(repo: Repository, journal: Journal) -> Orchestrator:
+    """Crée et retourne l'orchestrateur avec clients France Travail."""
+    france_travail_client, rome_client = get_france_travail_clients()
 
     return Orchestrator(
         repository=repo,
@@ -55,6 +76,17 @@ def get_orchestrator(repo: Repository, journal: Journal) -> Orchestrator:
     )
 
 
+def run_async(coro):
+    """asyncio.run qui ferme le client HTTP partagé avant de quitter la boucle."""
+    async def avec_fermeture():
+        try:
+            return await coro
+        finally:
+            await close_http_client()
+
+    return asyncio.run(avec_fermeture())
+
+
 @click.group()
 @click.version_option(version="1.0.0", prog_name="agents-metiers")
 def cli():
@@ -131,7 +163,7 @@ def import_rome(limit: int):
             progress.update(task, description="Import terminé ✓")
         return result
 
-    result = asyncio.run(run_import())
+    result = run_async(run_import())
 
     if result.get("status") == "success":
         console.print(f"\n[green]✓ Import terminé[/green]")
@@ -186,7 +218,7 @@ def veille(veille_type: str, codes: tuple):
 
         return results
 
-    results = asyncio.run(run_veille())
+    results = run_async(run_veille())
 
     # Afficher les résultats
     for type_veille, result in results.items():
@@ -211,7 +243,6 @@ def list_fiches(statut: Optional[str], limit: int):
     repo = get_repository()
 
     statut_enum = StatutFiche(statut) if statut else None
-    fiches = repo.get_all_fiches(statut=statut_enum, limit=limit)
 
     table = Table(title="Fiches Métiers")
     table.add_column("Code ROME", style="cyan")
@@ -220,19 +251,23 @@ def list_fiches(statut: Optional[str], limit: int):
     table.add_column("Tension", style="magenta")
     table.add_column("MAJ", style="dim")
 
-    for fiche in fiches:
-        tension = f"{fiche.perspectives.tension:.0%}" if fiche.perspectives.tension else "-"
-        date_maj = fiche.metadata.date_maj.strftime("%Y-%m-%d") if fiche.metadata.date_maj else "-"
-        table.add_row(
-            fiche.code_rome,
-            fiche.nom_masculin[:40],
-            fiche.metadata.statut.value,
-            tension,
-            date_maj
+    # Colonnes affichées uniquement, lues en flux (pas de FicheMetier complète),
+    # avec le total calculé dans la même requête
+    total = 0
+    rows = repo.iter_fiches_summary(statut_enum, limit, with_total=True)
+    add_row = table.add_row
+    format_pct = "{:.0%}".format
+    for code_rome, nom, statut_fiche, tension, date_maj, total in rows:
+        add_row(
+            code_rome,
+            nom[:40],
+            statut_fiche,
+            format_pct(tension) if tension else "-",
+            date_maj.strftime("%Y-%m-%d") if date_maj else "-"
         )
 
     console.print(table)
-    console.print(f"\nTotal: {repo.count_fiches(statut_enum)} fiches")
+    console.print(f"\nTotal: {total} fiches")
 
 
 @cli.command("show")
@@ -316,7 +351,7 @@ def check_fiche(code_rome: str):
         console=console
     ) as progress:
         task = progress.add_task("Traitement en cours...", total=None)
-        result = asyncio.run(run_check())
+        result = run_async(run_check())
         progress.update(task, description="Traitement terminé ✓")
 
     # Afficher les résultats
@@ -331,9 +366,10 @@ def check_fiche(code_rome: str):
 def search(query: str, limit: int):
     """Recherche des fiches par nom ou description."""
     repo = get_repository()
-    fiches = repo.search_fiches(query, limit=limit)
+    # Seules les colonnes affichées sont lues (pas de FicheMetier complète)
+    rows = list(repo.iter_fiches_summary(limit=limit, search=query))
 
-    if not fiches:
+    if not rows:
         console.print(f"[yellow]Aucun résultat pour '{query}'[/yellow]")
         return
 
@@ -342,12 +378,8 @@ def search(query: str, limit: int):
     table.add_column("Nom", style="green")
     table.add_column("Statut", style="yellow")
 
-    for fiche in fiches:
-        table.add_row(
-            fiche.code_rome,
-            fiche.nom_masculin,
-            fiche.metadata.statut.value
-        )
+    for code_rome, nom, statut_fiche, _tension, _date_maj in rows:
+        table.add_row(code_rome, nom, statut_fiche)
 
     console.print(table)
 
@@ -367,8 +399,10 @@ def list_validations():
     """Liste les demandes de validation en attente."""
     repo = get_repository()
     validation_sys = ValidationSystem(repo)
-
-    demandes = validation_sys.get_demandes_en_attente()
+    try:
+        demandes = validation_sys.get_demandes_en_attente()
+    finally:
+        validation_sys.close()
 
     if not demandes:
         console.print("[green]Aucune demande de validation en attente[/green]")
@@ -418,26 +452,17 @@ def publish_all_fiches():
     """Publie toutes les fiches non publiées."""
     repo = get_repository()
 
-    # Récupérer les fiches non publiées
-    fiches_brouillon = repo.get_all_fiches(statut=StatutFiche.BROUILLON, limit=1000)
-    fiches_enrichi = repo.get_all_fiches(statut=StatutFiche.ENRICHI, limit=1000)
-    fiches = fiches_brouillon + fiches_enrichi
+    # Un seul UPDATE pour toutes les fiches non publiées
+    publiees = repo.publish_fiches_by_statut([StatutFiche.BROUILLON, StatutFiche.ENRICHI])
 
-    if not fiches:
+    if not publiees:
         console.print("[green]Toutes les fiches sont déjà publiées ![/green]")
         return
 
-    console.print(f"[bold]Publication de {len(fiches)} fiches...[/bold]\n")
-
-    count = 0
-    for fiche in fiches:
-        fiche.metadata.statut = StatutFiche.PUBLIEE
-        fiche.metadata.date_maj = datetime.now()
-        repo.update_fiche(fiche)
-        console.print(f"  ✓ {fiche.code_rome} - {fiche.nom_masculin}")
-        count += 1
+    for code_rome, nom in publiees:
+        console.print(f"  ✓ {code_rome} - {nom}")
 
-    console.print(f"\n[green]✓ {count} fiches publiées ![/green]")
+    console.print(f"\n[green]✓ {len(publiees)} fiches publiées ![/green]")
 
 
 @cli.command("enrich")
@@ -457,11 +482,8 @@ def enrich_fiche(code_rome: str):
 
     async def run_enrich():
         from agents.redacteur_fiche import AgentRedacteurFiche
-        try:
-            import anthropic
-            claude_client = anthropic.AsyncAnthropic()
-        except Exception:
-            claude_client = None
+        claude_client = get_claude_client()
+        if claude_client is None:
             console.print("[yellow]Client Claude non disponible, mode simulation[/yellow]")
 
         agent = AgentRedacteurFiche(repository=repo, claude_client=claude_client)
@@ -473,7 +495,7 @@ def enrich_fiche(code_rome: str):
         console=console
     ) as progress:
         task = progress.add_task("Enrichissement en cours...", total=None)
-        result = asyncio.run(run_enrich())
+        result = run_async(run_enrich())
         progress.update(task, description="Enrichissement terminé ✓")
 
     if result.get("status") == "success":
@@ -488,7 +510,10 @@ def enrich_fiche(code_rome: str):
 @click.option("--batch-size", default=5, help="Nombre de fiches à traiter par lot")
 @click.option("--statut", type=click.Choice(["brouillon", "enrichi"]),
               default="brouillon", help="Statut des fiches à enrichir")
-def enrich_batch(batch_size: int, statut: str):
+@click.option("--concurrency", default=lambda: get_config().veille.concurrency,
+              type=click.IntRange(min=1),
+              help="Nombre d'appels Claude simultanés")
+def enrich_batch(batch_size: int, statut: str, concurrency: int):
     """Enrichit un lot de fiches brouillon via Claude API."""
     repo = get_repository()
 
@@ -505,15 +530,12 @@ def enrich_batch(batch_size: int, statut: str):
 
     async def run_enrich():
         from agents.redacteur_fiche import AgentRedacteurFiche
-        try:
-            import anthropic
-            claude_client = anthropic.AsyncAnthropic()
-        except Exception:
-            claude_client = None
+        claude_client = get_claude_client()
+        if claude_client is None:
             console.print("[yellow]Client Claude non disponible, mode simulation[/yellow]")
 
         agent = AgentRedacteurFiche(repository=repo, claude_client=claude_client)
-        return await agent.run(batch_size=batch_size)
+        return await agent.run(batch_size=batch_size, concurrency=concurrency)
 
     with Progress(
         SpinnerColumn(),
@@ -521,7 +543,7 @@ def enrich_batch(batch_size: int, statut: str):
         console=console
     ) as progress:
         task = progress.add_task("Enrichissement du lot...", total=None)
-        result = asyncio.run(run_enrich())
+        result = run_async(run_enrich())
         progress.update(task, description="Lot terminé ✓")
 
     if result.get("status") == "success":
@@ -546,11 +568,8 @@ def create_fiche(nom_metier: str):
 
     async def run_create():
         from agents.redacteur_fiche import AgentRedacteurFiche
-        try:
-            import anthropic
-            claude_client = anthropic.AsyncAnthropic()
-        except Exception:
-            claude_client = None
+        claude_client = get_claude_client()
+        if claude_client is None:
             console.print("[yellow]Client Claude non disponible, mode simulation[/yellow]")
 
         agent = AgentRedacteurFiche(repository=repo, claude_client=claude_client)
@@ -562,7 +581,7 @@ def create_fiche(nom_metier: str):
         console=console
     ) as progress:
         task = progress.add_task("Génération en cours...", total=None)
-        result = asyncio.run(run_create())
+        result = run_async(run_create())
         progress.update(task, description="Génération terminée ✓")
 
     if result.get("status") == "success":
@@ -575,38 +594,50 @@ def create_fiche(nom_metier: str):
 
 
 @cli.command("check-all")
-def check_all_fiches():
+@click.option("--batch-size", default=CHECK_ALL_BATCH_SIZE, type=click.IntRange(min=1),
+              help="Nombre de fiches traitées par lot")
+def check_all_fiches(batch_size: int):
     """Vérifie et traite toutes les fiches (correction + genre)."""
     repo = get_repository()
     journal = Journal()
-    fiches = repo.get_all_fiches(limit=1000)
+    codes = [row[0] for row in repo.iter_fiches_summary(limit=1000)]
 
-    if not fiches:
+    if not codes:
         console.print("[yellow]Aucune fiche à traiter[/yellow]")
         return
 
-    console.print(f"[bold]Traitement de {len(fiches)} fiches...[/bold]\n")
-
-    async def run_check_all():
-        orchestrator = get_orchestrator(repo, journal)
-        results = []
-        for fiche in fiches:
-            result = await orchestrator.traiter_fiche(fiche.code_rome)
-            results.append((fiche.code_rome, result))
-        return results
+    console.print(f"[bold]Traitement de {len(codes)} fiches...[/bold]\n")
 
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
+        MofNCompleteColumn(),
         console=console
     ) as progress:
-        task = progress.add_task("Traitement en cours...", total=None)
-        results = asyncio.run(run_check_all())
+        task = progress.add_task("Traitement en cours...", total=len(codes))
+
+        async def run_check_all():
+            orchestrator = get_orchestrator(repo, journal)
+            # Les agents sont partagés : les lots passent l'un après l'autre,
+            # les fiches d'un lot sont traitées en parallèle par chaque agent
+            results = []
+            for i in range(0, len(codes), batch_size):
+                lot = codes[i:i + batch_size]
+                results.append(await orchestrator.traiter_fiches(lot))
+                progress.advance(task, len(lot))
+            return results
+
+        results = run_async(run_check_all())
         progress.update(task, description="Traitement terminé ✓")
 
     # Résumé
-    success = sum(1 for _, r in results if r.get("status") == "success")
-    console.print(f"\n[green]✓ {success}/{len(fiches)} fiches traitées avec succès[/green]")
+    for r in results:
+        if r.get("error"):
+            console.print(f"[red]✗ {r['error']}[/red]")
+    success = sum(
+        len(r["etapes"].get("validation", {}).get("codes_rome", [])) for r in results
+    )
+    console.print(f"\n[green]✓ {success}/{len(codes)} fiches traitées avec succès[/green]")
 
 
 # =============================================================================
@@ -626,14 +657,28 @@ def stats():
     table.add_column("Statut", style="cyan")
     table.add_column("Nombre", style="green")
 
+    # Statuts et top tension lus dans une seule session
+    aggregates = repo.get_dashboard_aggregates(top_n=10)
+    counts = aggregates.statuts
     for statut in StatutFiche:
-        count = repo.count_fiches(statut)
-        table.add_row(statut.value, str(count))
+        table.add_row(statut.value, str(counts.get(statut.value, 0)))
 
-    table.add_row("[bold]Total[/bold]", f"[bold]{repo.count_fiches()}[/bold]")
+    table.add_row("[bold]Total[/bold]", f"[bold]{aggregates.total}[/bold]")
 
     console.print(table)
 
+    # Métiers en tension (top 10 trié côté SQL)
+    top = aggregates.top_tension
+    if top:
+        table = Table(title="Métiers en tension")
+        table.add_column("Code ROME", style="cyan")
+        table.add_column("Nom")
+        table.add_column("Tension", style="green")
+        table.add_column("Tendance")
+        for code_rome, nom, tension, tendance in top:
+            table.add_row(code_rome, nom, f"{tension:.0%}", tendance or "-")
+        console.print(table)
+
     # Stats logs
     log_stats = journal.get_stats()
     console.print("\n[bold]Logs:[/bold]")
@@ -693,7 +738,7 @@ def serve(interval: int):
             await orchestrator.arreter()
             console.print("[green]Service arrêté[/green]")
 
-    asyncio.run(run_service())
+    run_async(run_service())
 
 
 class CLI:
@@ -1,13 +1,36 @@
 """
 Système de validation humaine des fiches métiers.
 """
+import atexit
+import heapq
+import json
+import logging
+import threading
+import weakref
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Callable, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
 from database.models import FicheMetier, StatutFiche
 from database.repository import Repository
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Notification des callbacks hors du thread appelant
+CALLBACK_WORKERS = 4
+CALLBACK_FILE_MAX = 1000  # au-delà, le callback s'exécute dans le thread appelant
+
+# Résultats gardés en mémoire ; les plus anciens sont archivés en JSONL
+HISTORIQUE_MAX = 10000
+
+# Champs modifiables d'une fiche (calculé une fois)
+_CHAMPS_FICHE = frozenset(FicheMetier.model_fields)
 
 
 class ActionValidation(Enum):
@@ -18,7 +41,7 @@ class ActionValidation(Enum):
     REPORTER = "reporter"
 
 
-@dataclass
+@dataclass(slots=True)
 class DemandeValidation:
     """Représente une demande de validation."""
     id: str
@@ -35,7 +58,7 @@ class DemandeValidation:
         return hash(self.id)
 
 
-@dataclass
+@dataclass(slots=True)
 class ResultatValidation:
     """Résultat d'une validation."""
     demande_id: str
@@ -44,6 +67,19 @@ class ResultatValidation:
     date_validation: datetime
     commentaire: Optional[str] = None
     modifications_appliquees: Optional[Dict] = None
+    type_modification: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit en dictionnaire (archivage JSONL)."""
+        return {
+            "demande_id": self.demande_id,
+            "action": self.action.value,
+            "validateur": self.validateur,
+            "date_validation": self.date_validation.isoformat(),
+            "commentaire": self.commentaire,
+            "modifications_appliquees": self.modifications_appliquees,
+            "type_modification": self.type_modification,
+        }
 
 
 class ValidationSystem:
@@ -57,18 +93,43 @@ class ValidationSystem:
     - Suivre l'historique des validations
     """
 
-    def __init__(self, repository: Repository):
+    def __init__(
+        self,
+        repository: Repository,
+        historique_max: int = HISTORIQUE_MAX,
+        archive_path: Optional[Path] = None
+    ):
         """
         Initialise le système de validation.
 
         Args:
             repository: Repository pour l'accès aux données
+            historique_max: Nombre de résultats gardés en mémoire
+            archive_path: Fichier JSONL recevant les résultats évincés
+                (défaut : rapports/validations_historique.jsonl)
         """
         self.repository = repository
+        self.archive_path = archive_path or get_config().rapports_path / "validations_historique.jsonl"
         self._demandes: Dict[str, DemandeValidation] = {}
-        self._historique: List[ResultatValidation] = []
-        self._callbacks: List[Callable[[ResultatValidation], None]] = []
+        # Index des demandes en attente (tenus à jour par les méthodes
+        # ci-dessous : priorite / assignee ne doivent pas être modifiés
+        # directement sur une demande)
+        self._par_priorite: Dict[int, Dict[str, DemandeValidation]] = defaultdict(dict)
+        self._par_assignee: Dict[str, Set[str]] = defaultdict(set)
+        self._historique: Deque[ResultatValidation] = deque(maxlen=historique_max)
+        # Compteurs des validations traitées, tenus à jour par _archiver
+        self._nb_par_action: Dict[ActionValidation, int] = defaultdict(int)
+        # Abonnés par (action, type_modification) ; None = toutes valeurs
+        self._callbacks: Dict[
+            Tuple[Optional[ActionValidation], Optional[str]],
+            List[Callable[[ResultatValidation], None]]
+        ] = defaultdict(list)
+        self._executor = ThreadPoolExecutor(
+            max_workers=CALLBACK_WORKERS, thread_name_prefix="validation-cb"
+        )
+        self._places_callbacks = threading.BoundedSemaphore(CALLBACK_FILE_MAX)
         self._compteur = 0
+        _systemes_ouverts.add(self)
 
     def creer_demande(
         self,
@@ -105,6 +166,7 @@ class ValidationSystem:
         )
 
         self._demandes[demande_id] = demande
+        self._indexer(demande)
 
         # Mettre la fiche en statut valide
         fiche.metadata.statut = StatutFiche.VALIDE
@@ -112,6 +174,39 @@ class ValidationSystem:
 
         return demande
 
+    def _indexer(self, demande: DemandeValidation) -> None:
+        """Ajoute une demande aux index priorité / assigné."""
+        self._par_priorite[demande.priorite][demande.id] = demande
+        if demande.assignee:
+            self._par_assignee[demande.assignee].add(demande.id)
+
+    def _desindexer(self, demande: DemandeValidation) -> None:
+        """Retire une demande des index priorité / assigné."""
+        self._par_priorite[demande.priorite].pop(demande.id, None)
+        if demande.assignee:
+            self._par_assignee[demande.assignee].discard(demande.id)
+
+    def _retirer_demande(self, demande: DemandeValidation) -> None:
+        """Retire une demande traitée de la file d'attente."""
+        self._desindexer(demande)
+        del self._demandes[demande.id]
+
+    def _archiver(self, resultat: ResultatValidation) -> None:
+        """Ajoute un résultat à l'historique et met à jour les compteurs."""
+        if len(self._historique) == self._historique.maxlen:
+            self._archiver_historique(self._historique[0])
+        self._historique.append(resultat)
+        self._nb_par_action[resultat.action] += 1
+
+    def _archiver_historique(self, resultat: ResultatValidation) -> None:
+        """Écrit dans le fichier d'archive un résultat évincé de la mémoire."""
+        try:
+            self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.archive_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(resultat.to_dict(), ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            logger.error(f"Archivage de {resultat.demande_id} impossible: {e}")
+
     def get_demande(self, demande_id: str) -> Optional[DemandeValidation]:
         """Récupère une demande par son ID."""
         return self._demandes.get(demande_id)
@@ -119,7 +214,8 @@ class ValidationSystem:
     def get_demandes_en_attente(
         self,
         assignee: Optional[str] = None,
-        priorite_max: Optional[int] = None
+        priorite_max: Optional[int] = None,
+        limite: Optional[int] = None
     ) -> List[DemandeValidation]:
         """
         Récupère les demandes en attente.
@@ -127,22 +223,31 @@ class ValidationSystem:
         Args:
             assignee: Filtrer par assigné
             priorite_max: Filtrer par priorité max
+            limite: Nombre max de demandes (les plus prioritaires)
 
         Returns:
             Liste des demandes
         """
-        demandes = list(self._demandes.values())
-
+        # Seules les demandes candidates sont parcourues (index)
         if assignee:
-            demandes = [d for d in demandes if d.assignee == assignee]
-
-        if priorite_max:
-            demandes = [d for d in demandes if d.priorite <= priorite_max]
-
-        # Trier par priorité puis date
-        demandes.sort(key=lambda d: (d.priorite, d.date_demande))
-
-        return demandes
+            demandes = [self._demandes[i] for i in self._par_assignee.get(assignee, ())]
+            if priorite_max:
+                demandes = [d for d in demandes if d.priorite <= priorite_max]
+        else:
+            demandes = [
+                d
+                for priorite, bucket in self._par_priorite.items()
+                if not priorite_max or priorite <= priorite_max
+                for d in bucket.values()
+            ]
+
+        # Trier par priorité puis date (top-K par tas si la limite est petite)
+        cle = lambda d: (d.priorite, d.date_demande)
+        if limite is not None and limite * 4 < len(demandes):
+            return heapq.nsmallest(limite, demandes, key=cle)
+
+        demandes.sort(key=cle)
+        return demandes[:limite] if limite is not None else demandes
 
     def assigner_demande(
         self,
@@ -163,7 +268,9 @@ class ValidationSystem:
         if not demande:
             return False
 
+        self._desindexer(demande)
         demande.assignee = assignee
+        self._indexer(demande)
         return True
 
     def approuver(
@@ -187,31 +294,84 @@ class ValidationSystem:
         if not demande:
             return None
 
-        # Appliquer les modifications
+        maintenant = datetime.now()
+        fiche = self._appliquer_modifications(demande, validateur, maintenant)
+        self.repository.update_fiche(fiche)
+
+        return self._cloturer_approbation(demande, validateur, commentaire, maintenant)
+
+    def approuver_batch(
+        self,
+        demande_ids: List[str],
+        validateur: str,
+        commentaire: Optional[str] = None
+    ) -> List[ResultatValidation]:
+        """
+        Approuve plusieurs demandes en une seule écriture en base.
+
+        Les fiches sont mises à jour dans une même transaction
+        (repository.update_fiches_bulk) ; les IDs inconnus sont ignorés.
+
+        Args:
+            demande_ids: IDs des demandes
+            validateur: Identifiant du validateur
+            commentaire: Commentaire optionnel (commun à toutes les demandes)
+
+        Returns:
+            Résultats des validations, dans l'ordre des IDs
+        """
+        demandes = [self._demandes[i] for i in dict.fromkeys(demande_ids) if i in self._demandes]
+        if not demandes:
+            return []
+
+        maintenant = datetime.now()
+        fiches = [self._appliquer_modifications(d, validateur, maintenant) for d in demandes]
+        self.repository.update_fiches_bulk(fiches)
+
+        return [
+            self._cloturer_approbation(d, validateur, commentaire, maintenant)
+            for d in demandes
+        ]
+
+    def _appliquer_modifications(
+        self,
+        demande: DemandeValidation,
+        validateur: str,
+        maintenant: datetime
+    ) -> FicheMetier:
+        """Applique en mémoire les modifications d'une demande approuvée."""
         fiche = demande.fiche
-        for key, value in demande.modifications.items():
-            if hasattr(fiche, key):
-                setattr(fiche, key, value)
+        # Seuls les champs de FicheMetier sont appliqués ; les autres clés sont ignorées
+        for champ, valeur in demande.modifications.items():
+            if champ in _CHAMPS_FICHE:
+                setattr(fiche, champ, valeur)
 
         fiche.metadata.statut = StatutFiche.PUBLIEE
-        fiche.metadata.date_maj = datetime.now()
+        fiche.metadata.date_maj = maintenant
         fiche.metadata.auteur = validateur
+        return fiche
 
-        self.repository.update_fiche(fiche)
-
-        # Créer le résultat
+    def _cloturer_approbation(
+        self,
+        demande: DemandeValidation,
+        validateur: str,
+        commentaire: Optional[str],
+        maintenant: datetime
+    ) -> ResultatValidation:
+        """Archive une approbation enregistrée en base et notifie les callbacks."""
         resultat = ResultatValidation(
-            demande_id=demande_id,
+            demande_id=demande.id,
             action=ActionValidation.APPROUVER,
             validateur=validateur,
-            date_validation=datetime.now(),
+            date_validation=maintenant,
             commentaire=commentaire,
-            modifications_appliquees=demande.modifications
+            modifications_appliquees=demande.modifications,
+            type_modification=demande.type_modification
         )
 
         # Archiver
-        self._historique.append(resultat)
-        del self._demandes[demande_id]
+        self._archiver(resultat)
+        self._retirer_demande(demande)
 
         # Notifier les callbacks
         self._notifier(resultat)
@@ -250,12 +410,13 @@ class ValidationSystem:
             action=ActionValidation.REJETER,
             validateur=validateur,
             date_validation=datetime.now(),
-            commentaire=motif
+            commentaire=motif,
+            type_modification=demande.type_modification
         )
 
         # Archiver
-        self._historique.append(resultat)
-        del self._demandes[demande_id]
+        self._archiver(resultat)
+        self._retirer_demande(demande)
 
         # Notifier les callbacks
         self._notifier(resultat)
@@ -284,7 +445,9 @@ class ValidationSystem:
             return False
 
         demande.commentaires.append(f"[{validateur}] Report: {commentaire}")
+        self._desindexer(demande)
         demande.priorite = min(demande.priorite + 1, 5)  # Baisser la priorité
+        self._indexer(demande)
 
         return True
 
@@ -316,23 +479,72 @@ class ValidationSystem:
 
     def on_validation(
         self,
-        callback: Callable[[ResultatValidation], None]
+        callback: Callable[[ResultatValidation], None],
+        *,
+        action: Optional[ActionValidation] = None,
+        type_modification: Optional[str] = None
     ) -> None:
         """
         Enregistre un callback appelé après chaque validation.
 
+        Les callbacks sont exécutés dans un pool de threads (ils ne bloquent
+        pas approuver / rejeter) et doivent donc être thread-safe. File pleine
+        ou pool arrêté : le callback est exécuté dans le thread appelant.
+
         Args:
             callback: Fonction à appeler
+            action: Ne notifier que pour cette action (toutes si None)
+            type_modification: Ne notifier que pour ce type (tous si None)
         """
-        self._callbacks.append(callback)
+        self._callbacks[(action, type_modification)].append(callback)
 
     def _notifier(self, resultat: ResultatValidation) -> None:
-        """Notifie les callbacks enregistrés."""
-        for callback in self._callbacks:
-            try:
-                callback(resultat)
-            except Exception:
-                pass
+        """Notifie les seuls callbacks abonnés à l'action / au type du résultat."""
+        action, type_modification = resultat.action, resultat.type_modification
+        cles = dict.fromkeys((
+            (action, type_modification),
+            (action, None),
+            (None, type_modification),
+            (None, None),
+        ))
+        for cle in cles:
+            for callback in self._callbacks.get(cle, ()):
+                if self._places_callbacks.acquire(blocking=False):
+                    try:
+                        self._executor.submit(self._executer_callback_pool, callback, resultat)
+                        continue
+                    except RuntimeError:
+                        # Pool arrêté (close)
+                        self._places_callbacks.release()
+                # File pleine ou pool arrêté : pas de notification perdue
+                self._executer_callback(callback, resultat)
+
+    def _executer_callback_pool(
+        self,
+        callback: Callable[[ResultatValidation], None],
+        resultat: ResultatValidation
+    ) -> None:
+        """Exécute un callback dans le pool et libère sa place dans la file."""
+        try:
+            self._executer_callback(callback, resultat)
+        finally:
+            self._places_callbacks.release()
+
+    @staticmethod
+    def _executer_callback(
+        callback: Callable[[ResultatValidation], None],
+        resultat: ResultatValidation
+    ) -> None:
+        """Exécute un callback ; ses erreurs sont ignorées."""
+        try:
+            callback(resultat)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Attend la fin des notifications en cours et arrête le pool."""
+        _systemes_ouverts.discard(self)
+        self._executor.shutdown(wait=True)
 
     def get_historique(
         self,
@@ -342,30 +554,38 @@ class ValidationSystem:
         """
         Récupère l'historique des validations.
 
+        Seuls les historique_max derniers résultats sont en mémoire ; les plus
+        anciens sont dans le fichier archive_path.
+
         Args:
             limite: Nombre max de résultats
             validateur: Filtrer par validateur
 
         Returns:
-            Liste des résultats
+            Liste des résultats (du plus ancien au plus récent)
         """
-        historique = self._historique
+        historique = reversed(self._historique)
 
         if validateur:
-            historique = [h for h in historique if h.validateur == validateur]
+            historique = (h for h in historique if h.validateur == validateur)
 
-        return historique[-limite:]
+        resultats = list(islice(historique, limite))
+        resultats.reverse()
+        return resultats
 
     def get_statistiques(self) -> Dict[str, Any]:
         """
         Récupère les statistiques de validation.
 
+        Compteurs et index tenus à jour au fil de l'eau : aucun parcours
+        de l'historique ni des demandes.
+
         Returns:
             Statistiques
         """
-        total_historique = len(self._historique)
-        approuvees = len([h for h in self._historique if h.action == ActionValidation.APPROUVER])
-        rejetees = len([h for h in self._historique if h.action == ActionValidation.REJETER])
+        total_historique = sum(self._nb_par_action.values())
+        approuvees = self._nb_par_action[ActionValidation.APPROUVER]
+        rejetees = self._nb_par_action[ActionValidation.REJETER]
 
         return {
             "en_attente": len(self._demandes),
@@ -374,7 +594,7 @@ class ValidationSystem:
             "rejetees": rejetees,
             "taux_approbation": approuvees / total_historique if total_historique > 0 else 0,
             "par_priorite": {
-                p: len([d for d in self._demandes.values() if d.priorite == p])
+                p: len(self._par_priorite.get(p, ()))
                 for p in range(1, 6)
             }
         }
@@ -402,8 +622,11 @@ class ValidationSystem:
         if not fiche_actuelle:
             return {}
 
+        valeurs_actuelles = fiche_actuelle.__dict__
         for key, nouvelle_valeur in demande.modifications.items():
-            ancienne_valeur = getattr(fiche_actuelle, key, None)
+            if key not in _CHAMPS_FICHE:
+                continue
+            ancienne_valeur = valeurs_actuelles.get(key)
             if ancienne_valeur != nouvelle_valeur:
                 differences[key] = {
                     "avant": ancienne_valeur,
@@ -411,3 +634,13 @@ class ValidationSystem:
                 }
 
         return differences
+
+
+# Systèmes ouverts : un seul hook atexit attend leurs notifications en cours
+_systemes_ouverts: "weakref.WeakSet[ValidationSystem]" = weakref.WeakSet()
+
+
+@atexit.register
+def _fermer_systemes_validation() -> None:
+    for systeme in list(_systemes_ouverts):
+        systeme.close()
@@ -1,29 +1,99 @@
 """
 Système de journalisation et d'audit pour le système multi-agents.
 """
+import atexit
 import json
 import logging
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from datetime import date, datetime, time as time_of_day
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, List, Optional, Union
+from dataclasses import dataclass, field
 from enum import Enum
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from config import get_config
 
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle : repli sur json
+    orjson = None
+
+# Écriture du fichier JSONL par un thread dédié
+JSON_QUEUE_SIZE = 10000
+JSON_BATCH_SIZE = 256
+JSON_FLUSH_INTERVAL = 1.0  # secondes
+JSON_FILE_BUFFER = 64 * 1024
+
+_FIN_ECRITURE = object()  # sentinelle d'arrêt du thread d'écriture
+
+
+def _json_default(value: Any) -> str:
+    """Valeurs non sérialisables : dates en ISO 8601, le reste via str()."""
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps_bytes(data: Dict[str, Any]) -> bytes:
+    """
+    Sérialise en JSON UTF-8 (orjson si disponible).
+
+    Les dates passent par _json_default dans les deux cas (orjson ne les
+    sérialise pas lui-même) et le repli json reprend la forme compacte
+    d'orjson : la sortie ne dépend pas de la présence d'orjson.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return _json_dumps(data).encode("utf-8")
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Comme _dumps_bytes, sous forme de str."""
+    if orjson is not None:
+        return _dumps_bytes(data).decode("utf-8")
+    return _json_dumps(data)
+
+
+def _json_dumps(data: Dict[str, Any]) -> str:
+    """Repli json, mêmes octets qu'orjson (compact, UTF-8 non échappé)."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
 
 class NiveauLog(Enum):
-    """Niveaux de log."""
+    """Niveaux de log (rank : ordre de gravité, DEBUG = 0 ; levelno : niveau logging)."""
     DEBUG = "DEBUG"
     INFO = "INFO"
     WARNING = "WARNING"
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
 
+    def __init__(self, value: str):
+        self.levelno = getattr(logging, value)
+
+    @property
+    def rank(self) -> int:
+        """Ordre de gravité (position dans _ORDRE_NIVEAUX)."""
+        return _RANGS_NIVEAUX[self]
+
+
+# Niveaux du moins au plus grave
+_ORDRE_NIVEAUX = (
+    NiveauLog.DEBUG, NiveauLog.INFO, NiveauLog.WARNING, NiveauLog.ERROR, NiveauLog.CRITICAL
+)
+_RANGS_NIVEAUX: Dict[NiveauLog, int] = {niveau: rang for rang, niveau in enumerate(_ORDRE_NIVEAUX)}
 
-@dataclass
+
+@dataclass(slots=True)
 class EntreeJournal:
     """Entrée de journal structurée."""
     timestamp: datetime
@@ -36,15 +106,26 @@ class EntreeJournal:
     duree_ms: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit en dictionnaire."""
-        d = asdict(self)
-        d["timestamp"] = self.timestamp.isoformat()
-        d["niveau"] = self.niveau.value
-        return d
+        """
+        Convertit en dictionnaire.
+
+        Construit directement (pas d'asdict, qui recopie récursivement
+        metadata à chaque ligne de log).
+        """
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "niveau": self.niveau.value,
+            "message": self.message,
+            "source": self.source,
+            "metadata": dict(self.metadata),
+            "code_rome": self.code_rome,
+            "agent": self.agent,
+            "duree_ms": self.duree_ms,
+        }
 
     def to_json(self) -> str:
         """Convertit en JSON."""
-        return json.dumps(self.to_dict(), ensure_ascii=False)
+        return _dumps(self.to_dict())
 
 
 class Journal:
@@ -66,7 +147,8 @@ class Journal:
         log_file: Optional[Path] = None,
         max_file_size: int = 10 * 1024 * 1024,  # 10 MB
         backup_count: int = 5,
-        console_output: bool = True
+        console_output: bool = True,
+        json_niveau: str = "INFO"
     ):
         """
         Initialise le système de journalisation.
@@ -78,9 +160,11 @@ class Journal:
             max_file_size: Taille max du fichier avant rotation
             backup_count: Nombre de fichiers de backup
             console_output: Activer la sortie console
+            json_niveau: Niveau minimum écrit dans journal.jsonl
         """
         self.nom = nom
         self.niveau = getattr(logging, niveau.upper(), logging.INFO)
+        self._json_rank = NiveauLog[json_niveau.upper()].rank
         self._stats: Dict[str, int] = {
             "debug": 0,
             "info": 0,
@@ -88,10 +172,19 @@ class Journal:
             "error": 0,
             "critical": 0
         }
-        self._entrees_recentes: List[EntreeJournal] = []
         self._max_entrees_recentes = 1000
-
-        # Configuration du logger principal
+        # Tampon circulaire : les entrées les plus anciennes sont évincées en O(1)
+        self._entrees_recentes: Deque[EntreeJournal] = deque(maxlen=self._max_entrees_recentes)
+        # Agrégats du tampon, tenus à jour à l'ajout / l'éviction (generer_rapport)
+        self._compte_niveau: Counter = Counter()
+        self._compte_source: Counter = Counter()
+        self._compte_agent: Counter = Counter()
+
+        # Configuration du logger principal. Ses handlers sont remplacés : le
+        # listener d'un Journal précédent sur le même logger n'a plus de source.
+        for precedent in list(_journaux_ouverts):
+            if precedent.nom == nom:
+                precedent._arreter_listener()
         self.logger = logging.getLogger(nom)
         self.logger.setLevel(self.niveau)
         self.logger.handlers.clear()
@@ -102,16 +195,24 @@ class Journal:
         )
         self._json_formatter = JsonFormatter()
 
-        # Handler console
+        # Handlers console / fichier, alimentés par un QueueListener :
+        # l'appelant ne fait que déposer l'enregistrement dans une file
+        handlers: List[logging.Handler] = []
         if console_output:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(self.niveau)
             console_handler.setFormatter(self._formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
 
-        # Handler fichier
         if log_file:
-            self._setup_file_handler(log_file, max_file_size, backup_count)
+            handlers.append(self._setup_file_handler(log_file, max_file_size, backup_count))
+
+        self._listener: Optional[QueueListener] = None
+        if handlers:
+            log_queue: queue.Queue = queue.Queue(-1)
+            self.logger.addHandler(QueueHandler(log_queue))
+            self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            self._listener.start()
 
         # Fichier de log JSON structuré
         config = get_config()
@@ -123,8 +224,8 @@ class Journal:
         log_file: Path,
         max_size: int,
         backup_count: int
-    ) -> None:
-        """Configure le handler de fichier avec rotation."""
+    ) -> logging.Handler:
+        """Crée le handler de fichier avec rotation."""
         log_file.parent.mkdir(parents=True, exist_ok=True)
         file_handler = RotatingFileHandler(
             log_file,
@@ -134,20 +235,85 @@ class Journal:
         )
         file_handler.setLevel(self.niveau)
         file_handler.setFormatter(self._formatter)
-        self.logger.addHandler(file_handler)
+        return file_handler
 
     def _setup_json_handler(self) -> None:
-        """Configure le handler JSON structuré."""
+        """
+        Configure le handler JSON structuré.
+
+        Les lignes sont mises en file et écrites par lots par un thread dédié,
+        avec un flush au plus toutes les JSON_FLUSH_INTERVAL secondes.
+        """
         self.json_log_path.parent.mkdir(parents=True, exist_ok=True)
-        self._json_file = open(self.json_log_path, "a", encoding="utf-8")
+        # Binaire : les lignes sont déjà encodées en UTF-8 par _dumps_bytes
+        self._json_file = open(self.json_log_path, "ab", buffering=JSON_FILE_BUFFER)
+        self._json_queue: queue.Queue = queue.Queue(maxsize=JSON_QUEUE_SIZE)
+        self._json_thread = threading.Thread(
+            target=self._json_writer_loop,
+            name=f"journal-json-{self.nom}",
+            daemon=True
+        )
+        self._json_thread.start()
+        # Vider la file à l'arrêt de l'interpréteur (thread daemon)
+        _journaux_ouverts.add(self)
 
     def _write_json(self, entree: EntreeJournal) -> None:
-        """Écrit une entrée JSON."""
+        """Met une entrée JSON en file d'écriture (la plus ancienne est perdue si la file est pleine)."""
         try:
-            self._json_file.write(entree.to_json() + "\n")
-            self._json_file.flush()
+            ligne = _dumps_bytes(entree.to_dict())
         except Exception as e:
-            self.logger.error(f"Erreur écriture JSON: {e}")
+            self.logger.error(f"Erreur sérialisation JSON: {e}")
+            return
+        while True:
+            try:
+                self._json_queue.put_nowait(ligne)
+                return
+            except queue.Full:
+                try:
+                    self._json_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _json_writer_loop(self) -> None:
+        """Thread d'écriture : vide la file par lots de JSON_BATCH_SIZE lignes."""
+        file_attente = self._json_queue
+        a_flusher = False
+        dernier_flush = time.monotonic()
+
+        while True:
+            try:
+                item = file_attente.get(timeout=JSON_FLUSH_INTERVAL)
+            except queue.Empty:
+                item = None
+
+            lot = []
+            arret = item is _FIN_ECRITURE
+            if item is not None and not arret:
+                lot.append(item)
+                while len(lot) < JSON_BATCH_SIZE:
+                    try:
+                        item = file_attente.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _FIN_ECRITURE:
+                        arret = True
+                        break
+                    lot.append(item)
+
+            try:
+                if lot:
+                    self._json_file.write(b"\n".join(lot) + b"\n")
+                    a_flusher = True
+                maintenant = time.monotonic()
+                if a_flusher and (arret or maintenant - dernier_flush >= JSON_FLUSH_INTERVAL):
+                    self._json_file.flush()
+                    a_flusher = False
+                    dernier_flush = maintenant
+            except Exception as e:
+                self.logger.error(f"Erreur écriture JSON: {e}")
+
+            if arret:
+                return
 
     def _log(
         self,
@@ -171,6 +337,10 @@ class Journal:
             duree_ms: Durée en millisecondes (optionnel)
             **metadata: Métadonnées supplémentaires
         """
+        # Niveau filtré : rien n'est construit ni enregistré
+        if not self.logger.isEnabledFor(niveau.levelno):
+            return
+
         # Créer l'entrée structurée
         entree = EntreeJournal(
             timestamp=datetime.now(),
@@ -187,25 +357,28 @@ class Journal:
         self._stats[niveau.value.lower()] += 1
 
         # Garder en mémoire
+        if len(self._entrees_recentes) == self._max_entrees_recentes:
+            self._decompter(self._entrees_recentes[0])
         self._entrees_recentes.append(entree)
-        if len(self._entrees_recentes) > self._max_entrees_recentes:
-            self._entrees_recentes.pop(0)
-
-        # Log standard
-        log_method = getattr(self.logger, niveau.value.lower())
-        extra_info = []
-        if source:
-            extra_info.append(f"[{source}]")
-        if code_rome:
-            extra_info.append(f"[{code_rome}]")
+        self._compte_niveau[niveau.value] += 1
+        self._compte_source[source] += 1
         if agent:
-            extra_info.append(f"[{agent}]")
+            self._compte_agent[agent] += 1
 
-        full_message = " ".join(extra_info + [message])
-        log_method(full_message)
+        # Log standard (formatage différé au handler)
+        prefixe = "".join(f"[{x}] " for x in (source, code_rome, agent) if x)
+        self.logger.log(niveau.levelno, "%s%s", prefixe, message)
 
         # Log JSON structuré
-        self._write_json(entree)
+        if niveau.rank >= self._json_rank:
+            self._write_json(entree)
+
+    def _decompter(self, entree: EntreeJournal) -> None:
+        """Retire des agrégats une entrée évincée du tampon."""
+        self._compte_niveau[entree.niveau.value] -= 1
+        self._compte_source[entree.source] -= 1
+        if entree.agent:
+            self._compte_agent[entree.agent] -= 1
 
     def debug(
         self,
@@ -263,6 +436,8 @@ class Journal:
         parametres: Optional[Dict] = None
     ) -> None:
         """Log le démarrage d'un agent."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.info(
             f"Démarrage: {tache}",
             source=agent,
@@ -281,6 +456,8 @@ class Journal:
         """Log la fin d'exécution d'un agent."""
         status = resultat.get("status", "unknown")
         niveau = NiveauLog.INFO if status == "success" else NiveauLog.WARNING
+        if not self.logger.isEnabledFor(niveau.levelno):
+            return
 
         self._log(
             niveau,
@@ -300,6 +477,8 @@ class Journal:
         details: Optional[str] = None
     ) -> None:
         """Log une modification de fiche."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.info(
             f"Modification: {type_modification}" + (f" - {details}" if details else ""),
             source="fiches",
@@ -318,6 +497,8 @@ class Journal:
     ) -> None:
         """Log un cycle de veille."""
         niveau = NiveauLog.INFO if erreurs == 0 else NiveauLog.WARNING
+        if not self.logger.isEnabledFor(niveau.levelno):
+            return
         self._log(
             niveau,
             f"Veille {type_veille}: {nb_traites} traités, {nb_maj} MAJ, {erreurs} erreurs",
@@ -354,23 +535,12 @@ class Journal:
         Returns:
             Liste des entrées
         """
-        niveaux_ordre = {
-            NiveauLog.DEBUG: 0,
-            NiveauLog.INFO: 1,
-            NiveauLog.WARNING: 2,
-            NiveauLog.ERROR: 3,
-            NiveauLog.CRITICAL: 4
-        }
-
-        entrees = self._entrees_recentes.copy()
+        entrees = list(self._entrees_recentes)
 
         # Filtrer par niveau
         if niveau_min:
-            niveau_min_ordre = niveaux_ordre.get(niveau_min, 0)
-            entrees = [
-                e for e in entrees
-                if niveaux_ordre.get(e.niveau, 0) >= niveau_min_ordre
-            ]
+            rang_min = niveau_min.rank
+            entrees = [e for e in entrees if e.niveau.rank >= rang_min]
 
         # Filtrer par source
         if source:
@@ -398,7 +568,31 @@ class Journal:
         Returns:
             Rapport structuré
         """
-        entrees = self._entrees_recentes
+        entrees = list(self._entrees_recentes)
+        periode = {
+            "debut": debut.isoformat() if debut else None,
+            "fin": fin.isoformat() if fin else None
+        }
+
+        # Sans période : agrégats déjà tenus à jour, seules les dernières
+        # erreurs sont recherchées (en partant de la fin)
+        if not debut and not fin:
+            rang_erreur = NiveauLog.ERROR.rank
+            erreurs = []
+            for e in reversed(entrees):
+                if e.niveau.rank >= rang_erreur:
+                    erreurs.append(e)
+                    if len(erreurs) == 10:
+                        break
+            return {
+                "periode": periode,
+                "total_entrees": len(entrees),
+                # + : retire les compteurs tombés à zéro
+                "par_niveau": dict(+self._compte_niveau),
+                "par_source": dict(+self._compte_source),
+                "par_agent": dict(+self._compte_agent),
+                "erreurs_recentes": [e.to_dict() for e in reversed(erreurs)]
+            }
 
         # Filtrer par période
         if debut:
@@ -406,36 +600,28 @@ class Journal:
         if fin:
             entrees = [e for e in entrees if e.timestamp <= fin]
 
-        # Calculer les statistiques
-        stats_niveau = {}
-        stats_source = {}
-        stats_agent = {}
+        # Calculer les statistiques (un seul passage)
+        stats_niveau = Counter()
+        stats_source = Counter()
+        stats_agent = Counter()
+        dernieres_erreurs: Deque[EntreeJournal] = deque(maxlen=10)
+        rang_erreur = NiveauLog.ERROR.rank
 
         for e in entrees:
-            # Par niveau
-            niveau = e.niveau.value
-            stats_niveau[niveau] = stats_niveau.get(niveau, 0) + 1
-
-            # Par source
-            stats_source[e.source] = stats_source.get(e.source, 0) + 1
-
-            # Par agent
+            stats_niveau[e.niveau.value] += 1
+            stats_source[e.source] += 1
             if e.agent:
-                stats_agent[e.agent] = stats_agent.get(e.agent, 0) + 1
+                stats_agent[e.agent] += 1
+            if e.niveau.rank >= rang_erreur:
+                dernieres_erreurs.append(e)
 
         return {
-            "periode": {
-                "debut": debut.isoformat() if debut else None,
-                "fin": fin.isoformat() if fin else None
-            },
+            "periode": periode,
             "total_entrees": len(entrees),
-            "par_niveau": stats_niveau,
-            "par_source": stats_source,
-            "par_agent": stats_agent,
-            "erreurs_recentes": [
-                e.to_dict() for e in entrees
-                if e.niveau in (NiveauLog.ERROR, NiveauLog.CRITICAL)
-            ][-10:]
+            "par_niveau": dict(stats_niveau),
+            "par_source": dict(stats_source),
+            "par_agent": dict(stats_agent),
+            "erreurs_recentes": [e.to_dict() for e in dernieres_erreurs]
         }
 
     # =========================================================================
@@ -459,7 +645,7 @@ class Journal:
         Returns:
             Nombre d'entrées exportées
         """
-        entrees = self._entrees_recentes
+        entrees = list(self._entrees_recentes)
 
         if debut:
             entrees = [e for e in entrees if e.timestamp >= debut]
@@ -473,11 +659,33 @@ class Journal:
         return len(entrees)
 
     def close(self) -> None:
-        """Ferme proprement le journal."""
+        """Ferme proprement le journal (les lignes en file sont écrites avant)."""
+        if self._json_thread.is_alive():
+            self._json_queue.put(_FIN_ECRITURE)
+            self._json_thread.join()
+        _journaux_ouverts.discard(self)
         try:
             self._json_file.close()
         except Exception:
             pass
+        # En dernier : le thread JSON peut encore journaliser une erreur
+        self._arreter_listener()
+
+    def _arreter_listener(self) -> None:
+        """Arrête le QueueListener (console / fichier) s'il tourne encore."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+# Journaux ouverts : un seul hook atexit les ferme tous (file JSON vidée)
+_journaux_ouverts: "weakref.WeakSet[Journal]" = weakref.WeakSet()
+
+
+@atexit.register
+def _fermer_journaux() -> None:
+    for journal in list(_journaux_ouverts):
+        journal.close()
 
 
 class JsonFormatter(logging.Formatter):
@@ -497,4 +705,4 @@ class JsonFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data, ensure_ascii=False)
+        return _dumps(log_data)
@@ -2,11 +2,17 @@
 Orchestrateur central du système multi-agents.
 """
 import asyncio
+import heapq
+import inspect
+import itertools
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Awaitable, Callable, DefaultDict, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
+from functools import cached_property, partial
 import logging
+from collections import defaultdict
+from contextvars import ContextVar, copy_context
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -22,6 +28,63 @@ from config import get_config
 from logging_system.journal import Journal
 
 
+# Étapes du workflow de traitement, dans l'ordre d'exécution
+ORDRE_ETAPES = ("correction", "genre", "validation", "validation_humaine", "publication")
+ETAPES_DEFAUT: FrozenSet[str] = frozenset({"correction", "genre", "validation"})
+_RANG_ETAPE = {etape: rang for rang, etape in enumerate(ORDRE_ETAPES)}
+
+# Taille des lots d'écriture lors de l'import ROME
+IMPORT_BATCH_SIZE = 100
+# Lots convertis en attente d'écriture (au-delà, la conversion attend)
+IMPORT_QUEUE_SIZE = 4
+
+# Tâches planifiées : jamais deux exécutions simultanées du même job, les
+# déclenchements manqués (boucle occupée, veille plus longue que l'intervalle)
+# sont fusionnés en un seul, rattrapé jusqu'à une heure après l'échéance
+SCHEDULER_JOB_DEFAULTS = {"coalesce": True, "max_instances": 1, "misfire_grace_time": 3600}
+
+# Audit tamponné pendant que l'orchestrateur tourne : écriture groupée
+# toutes les AUDIT_FLUSH_INTERVAL secondes ou dès AUDIT_BATCH_SIZE entrées
+AUDIT_BATCH_SIZE = 256
+AUDIT_FLUSH_INTERVAL = 1.0
+
+# Fiches déjà lues pendant un traitement (portée : un appel à traiter_fiches,
+# chaque tâche asyncio ayant son propre contexte)
+_fiche_cache: ContextVar[Optional[Dict[str, FicheMetier]]] = ContextVar("fiche_cache", default=None)
+
+# Client ROME partagé par processus : conserve son token OAuth d'un import
+# à l'autre (connexions HTTP déjà mutualisées, voir sources.france_travail)
+_rome_client = None
+
+
+def _get_rome_client():
+    """Retourne le client ROME partagé (import et création au premier appel)."""
+    global _rome_client
+    if _rome_client is None:
+        from sources.rome_client import ROMEClient
+        _rome_client = ROMEClient()
+    return _rome_client
+
+
+async def _run_in_executor(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Équivalent de asyncio.to_thread, sans copie de contexte quand il est vide.
+
+    Le cas courant (aucune ContextVar définie : tâches planifiées, import)
+    évite ainsi l'enveloppe ctx.run et son frame supplémentaire par appel.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = copy_context()
+    if not ctx:
+        return await loop.run_in_executor(None, func, *args)
+    return await loop.run_in_executor(None, ctx.run, func, *args)
+
+
+def _etapes_ordonnees(etapes: Iterable[str]) -> List[str]:
+    """Liste des étapes dans l'ordre du workflow (étapes inconnues en dernier)."""
+    return sorted(etapes, key=lambda e: (_RANG_ETAPE.get(e, len(_RANG_ETAPE)), e))
+
+
 class EtatOrchestration(Enum):
     """États de l'orchestrateur."""
     ARRETE = "arrete"
@@ -40,7 +103,7 @@ class TypeTache(Enum):
     VALIDATION = "validation"
 
 
-@dataclass
+@dataclass(slots=True)
 class TacheOrchestree:
     """Représente une tâche à orchestrer."""
     id: str
@@ -54,17 +117,29 @@ class TacheOrchestree:
     erreur: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowValidation:
     """Workflow de validation d'une fiche."""
     code_rome: str
-    etapes_completees: List[str] = field(default_factory=list)
-    etapes_restantes: List[str] = field(default_factory=list)
+    etapes_completees: Set[str] = field(default_factory=set)
+    etapes_restantes: Set[str] = field(default_factory=set)
     validateur: Optional[str] = None
     commentaires: List[str] = field(default_factory=list)
     date_debut: datetime = field(default_factory=datetime.now)
     date_fin: Optional[datetime] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Sérialisation (étapes en listes ordonnées)."""
+        return {
+            "code_rome": self.code_rome,
+            "etapes_completees": _etapes_ordonnees(self.etapes_completees),
+            "etapes_restantes": _etapes_ordonnees(self.etapes_restantes),
+            "validateur": self.validateur,
+            "commentaires": list(self.commentaires),
+            "date_debut": self.date_debut.isoformat(),
+            "date_fin": self.date_fin.isoformat() if self.date_fin else None
+        }
+
 
 class Orchestrator:
     """
@@ -104,20 +179,35 @@ class Orchestrator:
         """
         self.repository = repository
         self.journal = journal
+        self._journal_info = journal.info
+        self._journal_error = journal.error
         self.config = get_config()
         self.logger = logger or logging.getLogger("Orchestrator")
 
         # État
         self.etat = EtatOrchestration.ARRETE
-        self._file_taches: List[TacheOrchestree] = []
+        # File de priorité (priorite, seq, tache) : seq départage les tâches
+        # de même priorité dans l'ordre d'arrivée
+        self._file_taches: List[Tuple[int, int, TacheOrchestree]] = []
+        self._tache_seq = itertools.count()
         self._workflows_validation: Dict[str, WorkflowValidation] = {}
-        self._callbacks_evenements: Dict[str, List[Callable]] = {}
+        self._callbacks_evenements: DefaultDict[str, List[Callable]] = defaultdict(list)
+
+        # Traitements en cours : un second appel identique attend le premier
+        # au lieu de refaire les appels Claude et les écritures
+        self._traitements_en_cours: Dict[Tuple[str, FrozenSet[str]], asyncio.Future] = {}
+        self._validations_en_cours: Dict[Tuple[str, str, bool], asyncio.Future] = {}
+
+        # Audit en attente d'écriture (vidé par _flush_audit_loop)
+        self._audit_buffer: List[AuditLog] = []
+        self._audit_task: Optional[asyncio.Task] = None
 
         # Scheduler pour les tâches périodiques
-        self.scheduler = AsyncIOScheduler()
+        self.scheduler = AsyncIOScheduler(job_defaults=SCHEDULER_JOB_DEFAULTS)
 
-        # Initialiser les agents
+        # Agents créés à la première utilisation (voir _get_agent)
         self.agents: Dict[str, BaseAgent] = {}
+        self._agent_factories: Dict[str, Callable[[], BaseAgent]] = {}
         self._init_agents(
             claude_client=claude_client,
             rome_client=rome_client,
@@ -126,6 +216,16 @@ class Orchestrator:
             dares_client=dares_client
         )
 
+        # Table de dispatch des tâches (lookup direct plutôt qu'une chaîne de if)
+        self._task_handlers: Dict[TypeTache, Callable[..., Awaitable[Dict[str, Any]]]] = {
+            TypeTache.VEILLE_SALAIRES: lambda **p: self._agent_veille_salaires.run(**p),
+            TypeTache.VEILLE_METIERS: lambda **p: self._agent_veille_metiers.run(**p),
+            TypeTache.CORRECTION_LANGUE: lambda **p: self._agent_correcteur_langue.run(**p),
+            TypeTache.GENERATION_GENRE: lambda **p: self._agent_generation_genre.run(**p),
+            TypeTache.IMPORT_ROME: self._importer_rome,
+            TypeTache.VALIDATION: self._traiter_validation,
+        }
+
     def _init_agents(
         self,
         claude_client: Optional[Any] = None,
@@ -134,31 +234,57 @@ class Orchestrator:
         insee_client: Optional[Any] = None,
         dares_client: Optional[Any] = None
     ) -> None:
-        """Initialise tous les agents."""
-        self.agents["veille_salaires"] = AgentVeilleSalaires(
+        """Enregistre les fabriques des agents (instanciés à la demande)."""
+        self._agent_factories["veille_salaires"] = lambda: AgentVeilleSalaires(
             repository=self.repository,
             dares_client=dares_client,
             insee_client=insee_client,
             france_travail_client=france_travail_client
         )
 
-        self.agents["veille_metiers"] = AgentVeilleMetiers(
+        self._agent_factories["veille_metiers"] = lambda: AgentVeilleMetiers(
             repository=self.repository,
             france_travail_client=france_travail_client,
             rome_client=rome_client
         )
 
-        self.agents["correcteur_langue"] = AgentCorrecteurLangue(
+        self._agent_factories["correcteur_langue"] = lambda: AgentCorrecteurLangue(
             repository=self.repository,
             claude_client=claude_client
         )
 
-        self.agents["generation_genre"] = AgentGenerationGenre(
+        self._agent_factories["generation_genre"] = lambda: AgentGenerationGenre(
             repository=self.repository,
             claude_client=claude_client
         )
 
-        self.logger.info(f"Agents initialisés: {list(self.agents.keys())}")
+        self.logger.info(f"Agents disponibles: {list(self._agent_factories.keys())}")
+
+    def _get_agent(self, nom: str) -> BaseAgent:
+        """Retourne l'agent `nom`, créé à la première demande."""
+        agent = self.agents.get(nom)
+        if agent is None:
+            agent = self.agents[nom] = self._agent_factories[nom]()
+        return agent
+
+    # Références directes pour les tâches planifiées : après le premier
+    # accès, simple attribut d'instance (pas de lookup dans self.agents)
+
+    @cached_property
+    def _agent_veille_salaires(self) -> BaseAgent:
+        return self._get_agent("veille_salaires")
+
+    @cached_property
+    def _agent_veille_metiers(self) -> BaseAgent:
+        return self._get_agent("veille_metiers")
+
+    @cached_property
+    def _agent_correcteur_langue(self) -> BaseAgent:
+        return self._get_agent("correcteur_langue")
+
+    @cached_property
+    def _agent_generation_genre(self) -> BaseAgent:
+        return self._get_agent("generation_genre")
 
     # =========================================================================
     # Gestion du cycle de vie
@@ -179,6 +305,9 @@ class Orchestrator:
         # Démarrer le scheduler
         self.scheduler.start()
 
+        # Écriture groupée de l'audit
+        self._audit_task = asyncio.create_task(self._flush_audit_loop())
+
         # Log audit
         self._log_audit(
             TypeEvenement.MODIFICATION,
@@ -205,6 +334,16 @@ class Orchestrator:
             "Arrêt de l'orchestrateur"
         )
 
+        # Arrêter l'écriture groupée et vider le tampon
+        if self._audit_task is not None:
+            self._audit_task.cancel()
+            try:
+                await self._audit_task
+            except asyncio.CancelledError:
+                pass
+            self._audit_task = None
+        self._flush_audit()
+
         self.journal.info("Orchestrateur arrêté", source="Orchestrator")
         self.logger.info("Orchestrateur arrêté")
 
@@ -214,7 +353,10 @@ class Orchestrator:
 
         # Veille salaires (hebdomadaire par défaut)
         self.scheduler.add_job(
-            self._executer_veille_salaires,
+            partial(
+                self._executer_agent_planifie,
+                "veille_salaires", "Veille salariale", "fiches_mises_a_jour", "fiches mises à jour"
+            ),
             IntervalTrigger(hours=veille_config.interval_salaires),
             id="veille_salaires",
             name="Veille salariale",
@@ -223,7 +365,10 @@ class Orchestrator:
 
         # Veille métiers (quotidienne par défaut)
         self.scheduler.add_job(
-            self._executer_veille_metiers,
+            partial(
+                self._executer_agent_planifie,
+                "veille_metiers", "Veille métiers", "signaux_detectes", "signaux détectés"
+            ),
             IntervalTrigger(hours=veille_config.interval_metiers),
             id="veille_metiers",
             name="Veille métiers",
@@ -232,57 +377,68 @@ class Orchestrator:
 
         # Correction langue (mensuelle par défaut)
         self.scheduler.add_job(
-            self._executer_correction_langue,
+            partial(
+                self._executer_agent_planifie,
+                "correcteur_langue", "Correction linguistique", "fiches_corrigees", "fiches corrigées"
+            ),
             IntervalTrigger(hours=veille_config.interval_correction),
             id="correction_langue",
             name="Correction linguistique",
             replace_existing=True
         )
 
+        # Purge des refresh tokens expirés/révoqués (par lots, voir
+        # Repository.cleanup_expired_tokens) : la table reste petite
+        self.scheduler.add_job(
+            self._executer_nettoyage_tokens,
+            IntervalTrigger(minutes=veille_config.interval_nettoyage_tokens),
+            id="nettoyage_tokens",
+            name="Purge des refresh tokens",
+            replace_existing=True
+        )
+
         self.logger.info("Tâches planifiées configurées")
 
     # =========================================================================
     # Exécution des tâches
     # =========================================================================
 
-    async def _executer_veille_salaires(self) -> None:
-        """Exécute la veille salariale planifiée."""
-        self.journal.info("Début veille salariale planifiée", source="Orchestrator")
-        try:
-            agent = self.agents["veille_salaires"]
-            result = await agent.run()
-            self.journal.info(
-                f"Veille salariale terminée: {result.get('fiches_mises_a_jour', 0)} fiches mises à jour",
-                source="Orchestrator"
-            )
-        except Exception as e:
-            self.journal.error(f"Erreur veille salariale: {e}", source="Orchestrator")
+    async def _executer_agent_planifie(
+        self,
+        nom_agent: str,
+        libelle: str,
+        cle_resultat: str,
+        unite: str
+    ) -> None:
+        """
+        Exécute un agent planifié (veille salariale, veille métiers, correction).
 
-    async def _executer_veille_metiers(self) -> None:
-        """Exécute la veille métiers planifiée."""
-        self.journal.info("Début veille métiers planifiée", source="Orchestrator")
+        Args:
+            nom_agent: Nom de l'agent (propriété _agent_<nom>, partagée avec
+                les traitements à la demande et leur garde _running)
+            libelle: Libellé de la tâche pour le journal
+            cle_resultat: Clé du résultat donnant le nombre d'éléments traités
+            unite: Unité de ce nombre dans le message de fin
+        """
+        self._journal_info(f"Début {libelle.lower()} planifiée", source="Orchestrator")
         try:
-            agent = self.agents["veille_metiers"]
+            agent: BaseAgent = getattr(self, f"_agent_{nom_agent}")
             result = await agent.run()
-            self.journal.info(
-                f"Veille métiers terminée: {result.get('signaux_detectes', 0)} signaux détectés",
+            self._journal_info(
+                f"{libelle} terminée: {result.get(cle_resultat, 0)} {unite}",
                 source="Orchestrator"
             )
         except Exception as e:
-            self.journal.error(f"Erreur veille métiers: {e}", source="Orchestrator")
+            self._journal_error(f"Erreur {libelle.lower()}: {e}", source="Orchestrator")
 
-    async def _executer_correction_langue(self) -> None:
-        """Exécute la correction linguistique planifiée."""
-        self.journal.info("Début correction linguistique planifiée", source="Orchestrator")
+    async def _executer_nettoyage_tokens(self) -> None:
+        """Purge planifiée des refresh tokens expirés ou révoqués."""
         try:
-            agent = self.agents["correcteur_langue"]
-            result = await agent.run()
-            self.journal.info(
-                f"Correction terminée: {result.get('fiches_corrigees', 0)} fiches corrigées",
-                source="Orchestrator"
-            )
+            # DELETE synchrone : exécuté hors de la boucle asyncio
+            deleted = await _run_in_executor(self.repository.cleanup_expired_tokens)
+            self.logger.info(f"Purge refresh tokens: {deleted} supprimés")
         except Exception as e:
-            self.journal.error(f"Erreur correction: {e}", source="Orchestrator")
+            self.journal.error(f"Erreur purge refresh tokens: {e}", source="Orchestrator")
 
     async def executer_tache(
         self,
@@ -302,32 +458,26 @@ class Orchestrator:
         self.journal.info(f"Exécution tâche: {type_tache.value}", source="Orchestrator")
 
         try:
-            if type_tache == TypeTache.VEILLE_SALAIRES:
-                return await self.agents["veille_salaires"].run(**parametres)
-
-            elif type_tache == TypeTache.VEILLE_METIERS:
-                return await self.agents["veille_metiers"].run(**parametres)
-
-            elif type_tache == TypeTache.CORRECTION_LANGUE:
-                return await self.agents["correcteur_langue"].run(**parametres)
-
-            elif type_tache == TypeTache.GENERATION_GENRE:
-                return await self.agents["generation_genre"].run(**parametres)
-
-            elif type_tache == TypeTache.IMPORT_ROME:
-                return await self._importer_rome(**parametres)
-
-            elif type_tache == TypeTache.VALIDATION:
-                return await self._traiter_validation(**parametres)
-
-            else:
+            handler = self._task_handlers.get(type_tache)
+            if handler is None:
                 raise ValueError(f"Type de tâche inconnu: {type_tache}")
+            return await handler(**parametres)
 
         except Exception as e:
             self.logger.error(f"Erreur exécution tâche {type_tache}: {e}")
             self.journal.error(f"Erreur tâche {type_tache}: {e}", source="Orchestrator")
             return {"status": "error", "error": str(e)}
 
+    def enfiler(self, tache: TacheOrchestree) -> None:
+        """Ajoute une tâche à la file (O(log n))."""
+        heapq.heappush(self._file_taches, (tache.priorite, next(self._tache_seq), tache))
+
+    def defiler(self) -> Optional[TacheOrchestree]:
+        """Retire la tâche la plus prioritaire (FIFO à priorité égale), None si la file est vide."""
+        if not self._file_taches:
+            return None
+        return heapq.heappop(self._file_taches)[2]
+
     # =========================================================================
     # Workflow de traitement des fiches
     # =========================================================================
@@ -345,6 +495,9 @@ class Orchestrator:
         2. Génération des versions genrées
         3. Mise en validation
 
+        Un appel identique (même fiche, mêmes étapes) déjà en cours n'est pas
+        relancé : l'appelant attend et reçoit le même résultat.
+
         Args:
             code_rome: Code ROME de la fiche
             etapes: Liste des étapes à exécuter (optionnel)
@@ -352,57 +505,177 @@ class Orchestrator:
         Returns:
             Résultat du traitement
         """
-        if etapes is None:
-            etapes = ["correction", "genre", "validation"]
+        cle = (code_rome, ETAPES_DEFAUT if etapes is None else frozenset(etapes))
+        return await self._une_seule_fois(
+            self._traitements_en_cours, cle,
+            lambda: self._traiter_fiche(code_rome, etapes)
+        )
+
+    async def _traiter_fiche(
+        self,
+        code_rome: str,
+        etapes: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Traitement d'une fiche (lot d'une seule fiche)."""
+        resultat_lot = await self.traiter_fiches([code_rome], etapes)
+        if resultat_lot.get("non_trouvees"):
+            return {"status": "error", "error": f"Fiche {code_rome} non trouvée"}
 
+        # Lot d'une seule fiche : partiel signifie que cette fiche a échoué
         resultats = {
             "code_rome": code_rome,
+            "etapes": resultat_lot["etapes"],
+            "status": "error" if resultat_lot["status"] == "partial" else resultat_lot["status"]
+        }
+        if "error" in resultat_lot:
+            resultats["error"] = resultat_lot["error"]
+        return resultats
+
+    async def traiter_fiches(
+        self,
+        codes_rome: List[str],
+        etapes: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Traite un lot de fiches à travers le workflow.
+
+        Chaque agent est appelé une seule fois pour tout le lot, et la mise
+        en validation est écrite en une seule transaction.
+
+        Args:
+            codes_rome: Codes ROME des fiches
+            etapes: Liste des étapes à exécuter (optionnel)
+
+        Returns:
+            Résultat du traitement (codes traités, codes non trouvés, étapes) ;
+            statut "partial" si des fiches en erreur n'ont pas été validées
+        """
+        # L'ordre d'exécution est fixé par le workflow : un ensemble suffit
+        etapes_set = ETAPES_DEFAUT if etapes is None else frozenset(etapes)
+
+        token = _fiche_cache.set({})
+        try:
+            return await self._traiter_lot(codes_rome, etapes_set)
+        finally:
+            _fiche_cache.reset(token)
+
+    async def _traiter_lot(
+        self,
+        codes_rome: List[str],
+        etapes_set: FrozenSet[str]
+    ) -> Dict[str, Any]:
+        """Corps de traiter_fiches (cache de fiches actif)."""
+        trouves = {f.code_rome for f in self._get_fiches_cache(codes_rome)}
+        codes = [c for c in codes_rome if c in trouves]
+
+        resultats = {
+            "codes_rome": codes,
+            "non_trouvees": [c for c in codes_rome if c not in trouves],
             "etapes": {},
             "status": "success"
         }
-
-        fiche = self.repository.get_fiche(code_rome)
-        if not fiche:
-            return {"status": "error", "error": f"Fiche {code_rome} non trouvée"}
+        if not codes:
+            return resultats
 
         try:
             # Étape 1: Correction linguistique
-            if "correction" in etapes:
-                result = await self.agents["correcteur_langue"].run(
-                    codes_rome=[code_rome]
+            if "correction" in etapes_set:
+                result = await self._agent_correcteur_langue.run(
+                    codes_rome=codes
                 )
                 resultats["etapes"]["correction"] = result
+                self._rafraichir_cache_fiches(codes)
 
             # Étape 2: Génération des versions genrées
-            if "genre" in etapes:
-                result = await self.agents["generation_genre"].run(
-                    codes_rome=[code_rome]
+            if "genre" in etapes_set:
+                result = await self._agent_generation_genre.run(
+                    codes_rome=codes
                 )
                 resultats["etapes"]["genre"] = result
-
-            # Étape 3: Mise en validation
-            if "validation" in etapes:
-                fiche = self.repository.get_fiche(code_rome)
-                fiche.metadata.statut = StatutFiche.VALIDE
-                self.repository.update_fiche(fiche)
-                resultats["etapes"]["validation"] = {"status": "valide"}
-
-                # Créer le workflow de validation
-                self._creer_workflow_validation(code_rome)
+                self._rafraichir_cache_fiches(codes)
+
+            # Un agent ignoré (déjà en cours) ou en erreur : rien n'est validé
+            etapes_ko = [
+                nom for nom, result in resultats["etapes"].items()
+                if result.get("status") != "success"
+            ]
+            if etapes_ko:
+                resultats["status"] = "error"
+                resultats["error"] = f"Étapes non abouties: {', '.join(etapes_ko)}"
+                return resultats
+
+            # Étape 3: Mise en validation des fiches traitées sans erreur par
+            # les agents (seules les fiches réécrites par un agent sont relues)
+            if "validation" in etapes_set:
+                en_erreur = {
+                    detail.get("code_rome")
+                    for result in resultats["etapes"].values()
+                    for detail in result.get("details", [])
+                    if "error" in detail
+                }
+                a_valider = [c for c in codes if c not in en_erreur]
+                fiches = self._get_fiches_cache(a_valider)
+                for fiche in fiches:
+                    fiche.metadata.statut = StatutFiche.VALIDE
+                self.repository.update_fiches_bulk(fiches)
+                resultats["etapes"]["validation"] = {"status": "valide", "codes_rome": a_valider}
+
+                # Créer les workflows de validation
+                for code_rome in a_valider:
+                    self._creer_workflow_validation(code_rome)
+
+                if en_erreur:
+                    non_validees = [c for c in codes if c in en_erreur]
+                    resultats["status"] = "partial"
+                    resultats["error"] = f"Fiches non validées (erreur d'agent): {', '.join(non_validees)}"
 
         except Exception as e:
             resultats["status"] = "error"
             resultats["error"] = str(e)
-            self.logger.error(f"Erreur traitement fiche {code_rome}: {e}")
+            self.logger.error(f"Erreur traitement fiches {', '.join(codes)}: {e}")
 
         return resultats
 
+    def _get_fiches_cache(self, codes_rome: List[str]) -> List[FicheMetier]:
+        """
+        Lit des fiches en passant par le cache du traitement en cours.
+
+        Seuls les codes absents du cache sont lus en base. Hors traitement
+        (pas de cache actif), lecture directe.
+        """
+        cache = _fiche_cache.get()
+        if cache is None:
+            return self.repository.get_fiches_by_codes(codes_rome)
+        manquants = [c for c in codes_rome if c not in cache]
+        if manquants:
+            for fiche in self.repository.get_fiches_by_codes(manquants):
+                cache[fiche.code_rome] = fiche
+        return [cache[c] for c in codes_rome if c in cache]
+
+    def _rafraichir_cache_fiches(self, codes_rome: List[str]) -> None:
+        """
+        Retire du cache les fiches réécrites depuis leur lecture (par un agent).
+
+        Comparaison des seuls numéros de version : les fiches inchangées
+        restent en cache et ne seront pas relues.
+        """
+        cache = _fiche_cache.get()
+        if not cache:
+            return
+        en_cache = [c for c in codes_rome if c in cache]
+        if not en_cache:
+            return
+        versions = self.repository.get_fiche_versions(en_cache)
+        for code_rome in en_cache:
+            if versions.get(code_rome) != cache[code_rome].metadata.version:
+                del cache[code_rome]
+
     def _creer_workflow_validation(self, code_rome: str) -> WorkflowValidation:
         """Crée un workflow de validation pour une fiche."""
         workflow = WorkflowValidation(
             code_rome=code_rome,
-            etapes_completees=["correction", "genre"],
-            etapes_restantes=["validation_humaine", "publication"]
+            etapes_completees={"correction", "genre"},
+            etapes_restantes={"validation_humaine", "publication"}
         )
         self._workflows_validation[code_rome] = workflow
         return workflow
@@ -417,6 +690,9 @@ class Orchestrator:
         """
         Valide ou rejette une fiche.
 
+        Un appel identique (mêmes arguments, commentaire compris) déjà en
+        cours n'est pas relancé : l'appelant reçoit le même résultat.
+
         Args:
             code_rome: Code ROME de la fiche
             validateur: Identifiant du validateur
@@ -426,6 +702,19 @@ class Orchestrator:
         Returns:
             Résultat de la validation
         """
+        return await self._une_seule_fois(
+            self._validations_en_cours, (code_rome, validateur, approuve, commentaire),
+            lambda: self._valider_fiche(code_rome, validateur, approuve, commentaire)
+        )
+
+    async def _valider_fiche(
+        self,
+        code_rome: str,
+        validateur: str,
+        approuve: bool,
+        commentaire: Optional[str]
+    ) -> Dict[str, Any]:
+        """Validation ou rejet effectif d'une fiche."""
         fiche = self.repository.get_fiche(code_rome)
         if not fiche:
             return {"status": "error", "error": "Fiche non trouvée"}
@@ -473,9 +762,7 @@ class Orchestrator:
         Returns:
             Résultat de l'import
         """
-        from sources.rome_client import ROMEClient
-
-        rome_client = ROMEClient()
+        rome_client = _get_rome_client()
         resultats = {
             "status": "success",
             "fiches_importees": 0,
@@ -488,14 +775,33 @@ class Orchestrator:
             # Importer le référentiel complet
             metiers = await rome_client.import_referentiel_complet()
 
-            for metier in metiers:
-                try:
-                    fiche = self._convertir_rome_vers_fiche(metier)
-                    self.repository.upsert_fiche(fiche)
-                    resultats["fiches_importees"] += 1
-                except Exception as e:
-                    resultats["erreurs"] += 1
-                    self.logger.warning(f"Erreur import {metier.get('code_rome')}: {e}")
+            # Pipeline : conversion du lot suivant dans la boucle pendant que
+            # le lot précédent est écrit en base dans un thread
+            file_lots: asyncio.Queue = asyncio.Queue(maxsize=IMPORT_QUEUE_SIZE)
+            erreurs_conversion = 0
+
+            async def convertir() -> None:
+                nonlocal erreurs_conversion
+                lot: List[FicheMetier] = []
+                for metier in metiers:
+                    try:
+                        lot.append(self._convertir_rome_vers_fiche(metier))
+                    except Exception as e:
+                        erreurs_conversion += 1
+                        self.logger.warning(f"Erreur import {metier.get('code_rome')}: {e}")
+                    if len(lot) >= IMPORT_BATCH_SIZE:
+                        await file_lots.put(lot)
+                        lot = []
+                if lot:
+                    await file_lots.put(lot)
+                await file_lots.put(None)
+
+            async def ecrire() -> None:
+                while (lot := await file_lots.get()) is not None:
+                    await _run_in_executor(self._importer_lot, lot, resultats)
+
+            await asyncio.gather(convertir(), ecrire())
+            resultats["erreurs"] += erreurs_conversion
 
             self.journal.info(
                 f"Import ROME terminé: {resultats['fiches_importees']} fiches",
@@ -509,6 +815,30 @@ class Orchestrator:
 
         return resultats
 
+    def _importer_lot(self, fiches: List[FicheMetier], resultats: Dict[str, Any]) -> None:
+        """
+        Écrit un lot de fiches importées en une transaction.
+
+        Si le lot échoue, il est rejoué fiche par fiche pour isoler les
+        fiches en erreur.
+        """
+        if not fiches:
+            return
+        try:
+            self.repository.upsert_fiches_bulk(fiches)
+            resultats["fiches_importees"] += len(fiches)
+            return
+        except Exception as e:
+            self.logger.warning(f"Erreur import par lot ({len(fiches)} fiches), reprise unitaire: {e}")
+
+        for fiche in fiches:
+            try:
+                self.repository.upsert_fiche(fiche)
+                resultats["fiches_importees"] += 1
+            except Exception as e:
+                resultats["erreurs"] += 1
+                self.logger.warning(f"Erreur import {fiche.code_rome}: {e}")
+
     def _convertir_rome_vers_fiche(self, metier: Dict) -> FicheMetier:
         """Convertit un métier ROME en FicheMetier."""
         return FicheMetier(
@@ -544,21 +874,27 @@ class Orchestrator:
         Returns:
             Statistiques
         """
+        # Une seule requête GROUP BY (mise en cache par le repository)
+        par_statut = self.repository.count_fiches_by_statut()
         stats = {
             "etat": self.etat.value,
             "agents": {},
             "fiches": {
-                "total": self.repository.count_fiches(),
-                "publiees": self.repository.count_fiches(StatutFiche.PUBLIEE),
-                "valides": self.repository.count_fiches(StatutFiche.VALIDE),
-                "brouillons": self.repository.count_fiches(StatutFiche.BROUILLON)
+                "total": sum(par_statut.values()),
+                "publiees": par_statut.get(StatutFiche.PUBLIEE.value, 0),
+                "valides": par_statut.get(StatutFiche.VALIDE.value, 0),
+                "brouillons": par_statut.get(StatutFiche.BROUILLON.value, 0)
             },
             "workflows_validation": len(self._workflows_validation),
             "taches_planifiees": len(self.scheduler.get_jobs())
         }
 
-        # Statistiques des agents
-        for nom, agent in self.agents.items():
+        # Statistiques des agents (agent pas encore créé : jamais exécuté)
+        for nom in self._agent_factories:
+            agent = self.agents.get(nom)
+            if agent is None:
+                stats["agents"][nom] = {"en_cours": False, "derniere_execution": None, "stats": {}}
+                continue
             stats["agents"][nom] = {
                 "en_cours": agent.is_running,
                 "derniere_execution": agent.last_run.isoformat() if agent.last_run else None,
@@ -587,20 +923,89 @@ class Orchestrator:
     # Utilitaires
     # =========================================================================
 
+    async def _une_seule_fois(
+        self,
+        en_cours: Dict[Hashable, asyncio.Future],
+        cle: Hashable,
+        travail: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Exécute `travail` sauf si un appel de même clé est déjà en cours,
+        auquel cas attend son résultat (ou son exception).
+
+        Args:
+            en_cours: Futures des appels en cours, par clé
+            cle: Clé de déduplication
+            travail: Fabrique de la coroutine à exécuter
+
+        Returns:
+            Résultat de l'appel (partagé entre les appelants concurrents)
+        """
+        future = en_cours.get(cle)
+        if future is not None:
+            # shield : l'annulation d'un appelant en attente n'annule pas
+            # le traitement des autres
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        en_cours[cle] = future
+        try:
+            resultat = await travail()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marque l'exception comme récupérée s'il n'y a aucun autre appelant
+            future.exception()
+            raise
+        else:
+            future.set_result(resultat)
+            return resultat
+        finally:
+            del en_cours[cle]
+
     def _log_audit(
         self,
         type_evenement: TypeEvenement,
         description: str,
         code_rome: Optional[str] = None
     ) -> None:
-        """Enregistre une entrée d'audit."""
+        """
+        Enregistre une entrée d'audit.
+
+        Orchestrateur démarré : l'entrée est tamponnée et écrite en lot.
+        Sinon : écriture immédiate.
+        """
         log = AuditLog(
             type_evenement=type_evenement,
             agent="Orchestrator",
             code_rome=code_rome,
             description=description
         )
-        self.repository.add_audit_log(log)
+        if self._audit_task is None:
+            self.repository.add_audit_log(log)
+            return
+        self._audit_buffer.append(log)
+        if len(self._audit_buffer) >= AUDIT_BATCH_SIZE:
+            self._flush_audit()
+
+    def _flush_audit(self) -> None:
+        """Écrit les entrées d'audit en attente en un seul INSERT."""
+        if not self._audit_buffer:
+            return
+        # Échange du tampon : les entrées ajoutées ensuite vont dans le nouveau
+        pending, self._audit_buffer = self._audit_buffer, []
+        try:
+            self.repository.add_audit_logs_bulk(pending)
+        except Exception as e:
+            self.logger.error(f"Erreur écriture audit ({len(pending)} entrées): {e}")
+
+    async def _flush_audit_loop(self) -> None:
+        """Vide périodiquement le tampon d'audit."""
+        while True:
+            await asyncio.sleep(AUDIT_FLUSH_INTERVAL)
+            self._flush_audit()
 
     def on_evenement(self, type_evenement: str, callback: Callable) -> None:
         """
@@ -608,17 +1013,30 @@ class Orchestrator:
 
         Args:
             type_evenement: Type d'événement à écouter
-            callback: Fonction à appeler
+            callback: Fonction ou coroutine à appeler avec les données
         """
-        if type_evenement not in self._callbacks_evenements:
-            self._callbacks_evenements[type_evenement] = []
         self._callbacks_evenements[type_evenement].append(callback)
 
-    def _emettre_evenement(self, type_evenement: str, data: Dict) -> None:
-        """Émet un événement aux listeners."""
-        if type_evenement in self._callbacks_evenements:
-            for callback in self._callbacks_evenements[type_evenement]:
-                try:
-                    callback(data)
-                except Exception as e:
-                    self.logger.error(f"Erreur callback événement: {e}")
+    async def _emettre_evenement(self, type_evenement: str, data: Dict) -> None:
+        """
+        Émet un événement aux listeners, en parallèle.
+
+        Les callbacks coroutines sont attendus directement, les callbacks
+        synchrones sont exécutés dans un thread pour ne pas bloquer la boucle.
+        Une erreur dans un callback est loggée sans affecter les autres.
+        """
+        # Copie figée : un callback enregistré pendant l'émission ne la modifie pas
+        callbacks = tuple(self._callbacks_evenements.get(type_evenement, ()))
+        if not callbacks:
+            return
+        resultats = await asyncio.gather(
+            *(
+                callback(data) if inspect.iscoroutinefunction(callback)
+                else _run_in_executor(callback, data)
+                for callback in callbacks
+            ),
+            return_exceptions=True
+        )
+        for resultat in resultats:
+            if isinstance(resultat, Exception):
+                self.logger.error(f"Erreur callback événement: {resultat}")
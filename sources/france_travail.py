@@ -4,6 +4,7 @@ Client pour l'API France Travail (ex Pôle Emploi).
 import asyncio
 import json
 import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 import logging
@@ -36,6 +37,33 @@ class TTLCache:
         self._cache.clear()
 
 
+# Client HTTP partagé (keep-alive) : évite un handshake TLS par requête.
+# Un AsyncClient est lié à la boucle asyncio qui l'a créé : un client par boucle.
+# Le propriétaire de la boucle (wrappers asyncio.run de la CLI, lifespan du
+# backend) le ferme avec close_http_client() avant de la quitter.
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Retourne le client HTTP partagé pour la boucle asyncio courante."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _http_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    return client
+
+
+async def close_http_client() -> None:
+    """Ferme le client HTTP partagé de la boucle courante (arrêt du service)."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 class FranceTravailClient:
     """
     Client pour l'API France Travail.
@@ -81,24 +109,24 @@ class FranceTravailClient:
             if datetime.now() < self._token_expiries[scope]:
                 return self._tokens[scope]
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.AUTH_URL,
-                params={"realm": "/partenaire"},
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "scope": f"application_{self.client_id} {scope}"
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-            self._tokens[scope] = data["access_token"]
-            self._token_expiries[scope] = datetime.now() + timedelta(seconds=1400)
-            return self._tokens[scope]
+        client = get_http_client()
+        response = await client.post(
+            self.AUTH_URL,
+            params={"realm": "/partenaire"},
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": f"application_{self.client_id} {scope}"
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._tokens[scope] = data["access_token"]
+        self._token_expiries[scope] = datetime.now() + timedelta(seconds=1400)
+        return self._tokens[scope]
 
     async def _request(
         self,
@@ -115,21 +143,21 @@ class FranceTravailClient:
         """
         token = await self._get_access_token(scope)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method,
-                f"{self.BASE_URL}/{endpoint}",
-                params=params,
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/json"
-                },
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            if return_headers:
-                return response.json(), dict(response.headers)
-            return response.json()
+        client = get_http_client()
+        response = await client.request(
+            method,
+            f"{self.BASE_URL}/{endpoint}",
+            params=params,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/json"
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        if return_headers:
+            return response.json(), dict(response.headers)
+        return response.json()
 
     # =========================================================================
     # Offres d'emploi
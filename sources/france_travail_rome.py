@@ -11,6 +11,7 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config import get_config
+from sources.france_travail import get_http_client, close_http_client
 
 
 class FranceTravailROMEClient:
@@ -76,28 +77,28 @@ class FranceTravailROMEClient:
                 return self._access_tokens[scope]
 
         # Obtenir un nouveau token
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.AUTH_URL,
-                params={"realm": "/partenaire"},
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "scope": scope
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Stocker en cache (expire dans ~23 min, on garde 20 min pour être safe)
-            self._access_tokens[scope] = data["access_token"]
-            self._token_expiries[scope] = datetime.now() + timedelta(seconds=1200)
-
-            self.logger.info(f"Token obtenu pour scope: {scope[:30]}...")
-            return self._access_tokens[scope]
+        client = get_http_client()
+        response = await client.post(
+            self.AUTH_URL,
+            params={"realm": "/partenaire"},
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": scope
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        # Stocker en cache (expire dans ~23 min, on garde 20 min pour être safe)
+        self._access_tokens[scope] = data["access_token"]
+        self._token_expiries[scope] = datetime.now() + timedelta(seconds=1200)
+
+        self.logger.info(f"Token obtenu pour scope: {scope[:30]}...")
+        return self._access_tokens[scope]
 
     async def _request(
         self,
@@ -120,19 +121,19 @@ class FranceTravailROMEClient:
         """
         token = await self._get_access_token(scope)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method,
-                url,
-                params=params,
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/json"
-                },
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.request(
+            method,
+            url,
+            params=params,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/json"
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
 
     # =========================================================================
     # API ROME 4.0 - Métiers v1
@@ -446,6 +447,7 @@ async def demo():
         print(f"   - {m.get('code_rome')}: {m.get('libelle')}")
 
     print("\n✅ Démo terminée !")
+    await close_http_client()
 
 
 if __name__ == "__main__":
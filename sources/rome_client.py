@@ -10,6 +10,7 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config import get_config
+from sources.france_travail import get_http_client
 
 
 class ROMEClient:
@@ -53,26 +54,27 @@ class ROMEClient:
             if datetime.now() < self._token_expiry:
                 return self._access_token
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://entreprise.francetravail.fr/connexion/oauth2/access_token",
-                params={"realm": "/partenaire"},
-                data={
-                    "grant_type": "client_credentials",
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "scope": "api_romev1 nomenclatureRome"
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-            self._access_token = data["access_token"]
-            # Token valide 1500 secondes, on prend une marge
-            from datetime import timedelta
-            self._token_expiry = datetime.now() + timedelta(seconds=1400)
-            return self._access_token
+        # Client HTTP partagé (keep-alive) avec les autres clients France Travail
+        client = get_http_client()
+        response = await client.post(
+            "https://entreprise.francetravail.fr/connexion/oauth2/access_token",
+            params={"realm": "/partenaire"},
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": "api_romev1 nomenclatureRome"
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._access_token = data["access_token"]
+        # Token valide 1500 secondes, on prend une marge
+        from datetime import timedelta
+        self._token_expiry = datetime.now() + timedelta(seconds=1400)
+        return self._access_token
 
     async def _request(
         self,
@@ -83,19 +85,18 @@ class ROMEClient:
         """Effectue une requête authentifiée."""
         token = await self._get_access_token()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method,
-                f"{self.BASE_URL}/{endpoint}",
-                params=params,
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/json"
-                },
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await get_http_client().request(
+            method,
+            f"{self.BASE_URL}/{endpoint}",
+            params=params,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/json"
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def get_metier(self, code_rome: str) -> Optional[Dict]:
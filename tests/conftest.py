@@ -22,15 +22,21 @@ os.environ["DATABASE_URL"] = "sqlite:///test_agents_metiers.db"
 def _setup_db():
     """Create a fresh test DB once per session."""
     from database.repository import Repository
+    _remove_test_db()
     repo = Repository(db_path="test_agents_metiers.db")
     repo.init_db()
     yield repo
-    # Cleanup
-    import os
-    try:
-        os.remove("test_agents_metiers.db")
-    except OSError:
-        pass
+    # Cleanup (base + fichiers annexes du mode WAL)
+    repo.dispose()
+    _remove_test_db()
+
+
+def _remove_test_db():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(f"test_agents_metiers.db{suffix}")
+        except OSError:
+            pass
 
 
 @pytest.fixture()
@@ -61,6 +61,19 @@ class TestStats:
         assert isinstance(data["total"], int)
 
 
+class TestDashboardStats:
+    """GET /api/stats/dashboard"""
+
+    def test_dashboard_aggregates(self, client):
+        resp = client.get("/api/stats/dashboard?top=5")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total"] == sum(data["statuts"].values())
+        assert len(data["top_tension"]) <= 5
+        tensions = [item["tension"] for item in data["top_tension"]]
+        assert tensions == sorted(tensions, reverse=True)
+
+
 class TestAuditLogs:
     """GET /api/audit-logs"""
 
@@ -142,3 +155,41 @@ class TestJWTSecurity:
         })
         resp = client.get("/api/auth/me", headers={"Authorization": token})
         assert resp.status_code in (401, 403)
+
+
+class TestHttpClient:
+    """Shared HTTP client lifecycle."""
+
+    def test_one_client_per_loop(self):
+        """Each event loop gets its own client; close_http_client closes it."""
+        import asyncio
+        from sources.france_travail import get_http_client, close_http_client
+
+        async def _get():
+            client = get_http_client()
+            assert get_http_client() is client
+            await close_http_client()
+            assert client.is_closed
+            return client
+
+        assert asyncio.run(_get()) is not asyncio.run(_get())
+
+    def test_cli_run_async_closes_client(self):
+        """The CLI asyncio.run wrapper closes the client of its loop."""
+        from interface.cli import run_async
+        from sources.france_travail import get_http_client
+
+        async def _get():
+            return get_http_client()
+
+        assert run_async(_get()).is_closed
+
+    def test_client_closed_on_shutdown(self):
+        """The FastAPI lifespan closes the client at shutdown."""
+        from fastapi.testclient import TestClient
+        from backend.main import app
+        from sources import france_travail
+
+        with TestClient(app) as test_client:
+            client = test_client.portal.call(france_travail.get_http_client)
+        assert client.is_closed
@@ -28,6 +28,7 @@ async def test_generation_variantes():
 
     config = get_config()
     repo = Repository(config.db_path)
+    repo.init_db()
 
     # 1. Creer une fiche de test
     print("1. Creation d'une fiche de test...")
@@ -0,0 +1,184 @@
+"""
+Tests for the structured Journal (logging_system/journal.py).
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+import config as config_module
+from config import Config, set_config
+from logging_system.journal import Journal, NiveauLog
+
+
+@pytest.fixture()
+def journal(tmp_path):
+    """Journal writing its JSONL file under a temporary base path."""
+    original = config_module._config
+    set_config(Config(base_path=tmp_path))
+    j = Journal(nom="test-journal", niveau="DEBUG", console_output=False)
+    yield j
+    j.close()
+    config_module._config = original
+
+
+class TestEntreesRecentes:
+    """Tampon circulaire des entrées récentes"""
+
+    def test_ring_buffer(self, journal):
+        for i in range(journal._max_entrees_recentes + 5):
+            journal.info(f"message {i}", source="test")
+        entrees = journal.get_entrees_recentes(limite=2000)
+        assert len(entrees) == journal._max_entrees_recentes
+        assert entrees[0].message == "message 5"
+        assert entrees[-1].message == f"message {journal._max_entrees_recentes + 4}"
+
+    def test_filters(self, journal):
+        journal.debug("d", source="a")
+        journal.error("e", source="b")
+        journal.warning("w", source="a")
+        assert [e.message for e in journal.get_entrees_recentes(niveau_min=NiveauLog.WARNING)] == ["e", "w"]
+        assert [e.message for e in journal.get_entrees_recentes(source="a")] == ["d", "w"]
+        assert [e.message for e in journal.get_entrees_recentes(limite=1)] == ["w"]
+
+
+class TestRapport:
+    """generer_rapport / exporter_json"""
+
+    def test_rapport_and_export(self, journal, tmp_path):
+        journal.info("i", source="veille", agent="AgentA")
+        journal.error("boom", source="veille", agent="AgentA", code_rome="A1234")
+        journal.critical("crash", source="api")
+
+        rapport = journal.generer_rapport()
+        assert rapport["total_entrees"] == 3
+        assert rapport["par_niveau"] == {"INFO": 1, "ERROR": 1, "CRITICAL": 1}
+        assert rapport["par_source"] == {"veille": 2, "api": 1}
+        assert rapport["par_agent"] == {"AgentA": 2}
+        assert [e["message"] for e in rapport["erreurs_recentes"]] == ["boom", "crash"]
+
+        # Chemin agrégé (sans période) et chemin filtré concordent, éviction comprise
+        for i in range(journal._max_entrees_recentes):
+            (journal.error if i % 7 == 0 else journal.info)(f"m{i}", source=f"s{i % 3}", agent="AgentB")
+        rapide = journal.generer_rapport()
+        complet = journal.generer_rapport(debut=datetime(2000, 1, 1))
+        del rapide["periode"], complet["periode"]
+        assert rapide == complet
+        assert "AgentA" not in rapide["par_agent"]
+
+        out = tmp_path / "export.jsonl"
+        assert journal.exporter_json(out) == journal._max_entrees_recentes
+        lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        assert lines[0]["message"] == "m0"
+        assert lines[0]["niveau"] == "ERROR"
+
+
+class TestJsonFile:
+    """Écriture du fichier JSONL par le thread dédié"""
+
+    def test_lines_written_on_close(self, journal):
+        for i in range(300):
+            journal.info(f"ligne {i}", source="test", code_rome="A1234")
+        journal.close()
+        lines = journal.json_log_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 300
+        assert json.loads(lines[-1])["message"] == "ligne 299"
+        # close() est idempotent
+        journal.close()
+
+    def test_json_level_threshold(self, journal):
+        journal.debug("détail")
+        journal.info("info")
+        journal.close()
+        lines = journal.json_log_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["message"] for line in lines] == ["info"]
+        # Le tampon mémoire garde toutes les entrées émises
+        assert len(journal.get_entrees_recentes()) == 2
+
+
+class TestEntreeJournal:
+    """Sérialisation d'une entrée"""
+
+    def test_to_dict(self, journal):
+        journal.warning("w", source="test", agent="AgentA", duree_ms=12, tache="maj")
+        (entree,) = journal.get_entrees_recentes()
+        d = entree.to_dict()
+        assert d == {
+            "timestamp": entree.timestamp.isoformat(),
+            "niveau": "WARNING",
+            "message": "w",
+            "source": "test",
+            "metadata": {"tache": "maj"},
+            "code_rome": None,
+            "agent": "AgentA",
+            "duree_ms": 12,
+        }
+        assert json.loads(entree.to_json()) == d
+
+    def test_to_json_non_serializable_metadata(self, journal):
+        journal.info("i", source="test", callback=journal.get_stats, ids={1: "a"})
+        (entree,) = journal.get_entrees_recentes()
+        d = json.loads(entree.to_json())
+        assert d["metadata"]["ids"] == {"1": "a"}
+        assert isinstance(d["metadata"]["callback"], str)
+
+    def test_datetime_metadata_same_with_and_without_orjson(self, journal, monkeypatch):
+        from logging_system import journal as journal_module
+        quand = datetime(2026, 10, 17, 3, 0, 0)
+        journal.info("i", source="test", quand=quand)
+        (entree,) = journal.get_entrees_recentes()
+        avec = entree.to_json()
+        monkeypatch.setattr(journal_module, "orjson", None)
+        sans = entree.to_json()
+        assert json.loads(avec) == json.loads(sans)
+        assert json.loads(sans)["metadata"]["quand"] == "2026-10-17T03:00:00"
+
+    def test_dumps_identique_avec_et_sans_orjson(self, monkeypatch):
+        from logging_system import journal as journal_module
+        pytest.importorskip("orjson")
+        data = {
+            "message": "Fiche corrigée", "n": 1, "ratio": 0.5, "ok": True, "vide": None,
+            "liste": [1, "é", {"k": "ü"}], 3: "clé entière",
+            "quand": datetime(2026, 10, 17, 3, 0, 0),
+        }
+        avec = journal_module._dumps_bytes(data)
+        monkeypatch.setattr(journal_module, "orjson", None)
+        assert journal_module._dumps_bytes(data) == avec
+        assert journal_module._dumps(data) == avec.decode("utf-8")
+
+
+class TestHandlers:
+    """Handlers console / fichier derrière un QueueListener"""
+
+    def test_file_handler(self, tmp_path):
+        original = config_module._config
+        set_config(Config(base_path=tmp_path))
+        log_file = tmp_path / "logs" / "system.log"
+        j = Journal(nom="test-journal-fichier", niveau="INFO", log_file=log_file, console_output=False)
+        try:
+            j.debug("ignoré")
+            j.log_fiche_modification("A1234", "correction", "AgentA")
+            j.warning("attention", source="veille", code_rome="A1234")
+            # Niveau filtré : ni entrée récente ni statistique
+            assert [e.niveau for e in j.get_entrees_recentes()] == [NiveauLog.INFO, NiveauLog.WARNING]
+            assert j.get_stats()["debug"] == 0
+            j.close()
+            contenu = log_file.read_text(encoding="utf-8")
+            assert "[veille] [A1234] attention" in contenu
+            assert "ignoré" not in contenu
+        finally:
+            j.close()
+            config_module._config = original
+
+    def test_second_journal_stops_previous_listener(self, tmp_path):
+        original = config_module._config
+        set_config(Config(base_path=tmp_path))
+        premier = Journal(nom="test-journal-double", log_file=tmp_path / "a.log", console_output=False)
+        second = Journal(nom="test-journal-double", log_file=tmp_path / "b.log", console_output=False)
+        try:
+            assert premier._listener is None
+            assert second._listener is not None
+        finally:
+            premier.close()
+            second.close()
+            config_module._config = original
@@ -0,0 +1,452 @@
+"""
+Tests for the Orchestrator workflow (orchestrator/orchestrator.py).
+"""
+import asyncio
+
+import pytest
+
+import config as config_module
+from config import Config, set_config
+from database.models import FicheMetier, StatutFiche, TypeEvenement
+from logging_system.journal import Journal
+from orchestrator.orchestrator import Orchestrator, TacheOrchestree, TypeTache
+
+
+def _make_fiche(code_rome: str) -> FicheMetier:
+    return FicheMetier(
+        id=code_rome,
+        code_rome=code_rome,
+        nom_masculin="Testeur orchestrateur",
+        nom_feminin="Testeuse orchestrateur",
+        nom_epicene="Testeur/euse orchestrateur",
+    )
+
+
+@pytest.fixture()
+def orchestrator(repo, tmp_path):
+    """Orchestrator without API clients, journal under a temporary base path."""
+    original = config_module._config
+    set_config(Config(base_path=tmp_path))
+    journal = Journal(nom="test-orchestrator", console_output=False)
+    yield Orchestrator(repo, journal)
+    journal.close()
+    config_module._config = original
+
+
+class TestTraiterFiches:
+    """traiter_fiches : un appel par agent pour tout le lot"""
+
+    def test_validation_batch(self, orchestrator, repo):
+        codes = ["Z9401", "Z9402"]
+        repo.create_fiches_bulk([_make_fiche(c) for c in codes])
+        try:
+            result = asyncio.run(orchestrator.traiter_fiches(codes + ["Z9499"], etapes=["validation"]))
+            assert result["status"] == "success"
+            assert result["codes_rome"] == codes
+            assert result["non_trouvees"] == ["Z9499"]
+            for code in codes:
+                assert repo.get_fiche(code).metadata.statut == StatutFiche.VALIDE
+                assert code in orchestrator._workflows_validation
+
+            workflow = orchestrator._workflows_validation["Z9401"].to_dict()
+            assert workflow["etapes_completees"] == ["correction", "genre"]
+            assert workflow["etapes_restantes"] == ["validation_humaine", "publication"]
+
+            assert asyncio.run(orchestrator.traiter_fiche("Z9499"))["status"] == "error"
+            single = asyncio.run(orchestrator.traiter_fiche("Z9401", etapes=["validation"]))
+            assert (single["code_rome"], single["status"]) == ("Z9401", "success")
+        finally:
+            for code in codes:
+                repo.delete_fiche(code)
+
+    def test_full_pipeline(self, orchestrator, repo):
+        codes = ["Z9411", "Z9412"]
+        repo.create_fiches_bulk([_make_fiche(c) for c in codes])
+        try:
+            result = asyncio.run(orchestrator.traiter_fiches(codes))
+            assert result["status"] == "success"
+            assert set(result["etapes"]) == {"correction", "genre", "validation"}
+            assert all(repo.get_fiche(c).metadata.statut == StatutFiche.VALIDE for c in codes)
+        finally:
+            for code in codes:
+                repo.delete_fiche(code)
+
+
+    def test_agent_occupe_pas_de_validation(self, orchestrator, repo):
+        codes = ["Z9413", "Z9414"]
+        repo.create_fiches_bulk([_make_fiche(c) for c in codes])
+        try:
+            orchestrator._agent_correcteur_langue._running = True
+            result = asyncio.run(orchestrator.traiter_fiches(codes))
+            assert result["status"] == "error"
+            assert "correction" in result["error"]
+            assert "validation" not in result["etapes"]
+            assert all(repo.get_fiche(c).metadata.statut == StatutFiche.BROUILLON for c in codes)
+            assert asyncio.run(orchestrator.traiter_fiche("Z9413"))["status"] == "error"
+        finally:
+            orchestrator._agent_correcteur_langue._running = False
+            for code in codes:
+                repo.delete_fiche(code)
+
+    def test_fiche_en_erreur_non_validee(self, orchestrator, repo, monkeypatch):
+        codes = ["Z9415", "Z9416"]
+        repo.create_fiches_bulk([_make_fiche(c) for c in codes])
+        agent = orchestrator._agent_correcteur_langue
+        corriger = agent.corriger_fiche
+
+        async def corriger_ou_echouer(fiche):
+            if fiche.code_rome == "Z9416":
+                raise RuntimeError("échec simulé")
+            return await corriger(fiche)
+
+        monkeypatch.setattr(agent, "corriger_fiche", corriger_ou_echouer)
+        try:
+            result = asyncio.run(orchestrator.traiter_fiches(codes))
+            assert result["status"] == "partial"
+            assert result["etapes"]["validation"]["codes_rome"] == ["Z9415"]
+            assert repo.get_fiche("Z9415").metadata.statut == StatutFiche.VALIDE
+            assert repo.get_fiche("Z9416").metadata.statut == StatutFiche.BROUILLON
+            assert "Z9416" not in orchestrator._workflows_validation
+        finally:
+            for code in codes:
+                repo.delete_fiche(code)
+
+
+def _suspendre(monkeypatch, orchestrator, methode):
+    """Ajoute un point de suspension (comme un appel Claude) avant `methode`."""
+    originale = getattr(orchestrator, methode)
+
+    async def avec_attente(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return await originale(*args, **kwargs)
+
+    monkeypatch.setattr(orchestrator, methode, avec_attente)
+
+
+class TestDeduplication:
+    """Appels identiques concurrents : un seul traitement"""
+
+    def test_traiter_fiche_concurrent(self, orchestrator, repo, monkeypatch):
+        repo.create_fiche(_make_fiche("Z9421"))
+        appels = []
+        update_bulk = repo.update_fiches_bulk
+
+        def compter(fiches):
+            appels.append([f.code_rome for f in fiches])
+            return update_bulk(fiches)
+
+        monkeypatch.setattr(repo, "update_fiches_bulk", compter)
+        _suspendre(monkeypatch, orchestrator, "traiter_fiches")
+
+        async def deux_appels():
+            return await asyncio.gather(
+                orchestrator.traiter_fiche("Z9421", etapes=["validation"]),
+                orchestrator.traiter_fiche("Z9421", etapes=["validation"]),
+            )
+
+        try:
+            premier, second = asyncio.run(deux_appels())
+            assert premier == second
+            assert premier["status"] == "success"
+            assert appels == [["Z9421"]]
+            assert orchestrator._traitements_en_cours == {}
+
+            # Appel suivant (plus en cours) : nouveau traitement
+            asyncio.run(orchestrator.traiter_fiche("Z9421", etapes=["validation"]))
+            assert len(appels) == 2
+        finally:
+            repo.delete_fiche("Z9421")
+
+    def test_valider_fiche_concurrent(self, orchestrator, repo, monkeypatch):
+        repo.create_fiche(_make_fiche("Z9422"))
+        appels = []
+        update = repo.update_fiche
+
+        def compter(fiche):
+            appels.append(fiche.code_rome)
+            return update(fiche)
+
+        monkeypatch.setattr(repo, "update_fiche", compter)
+        _suspendre(monkeypatch, orchestrator, "_valider_fiche")
+
+        async def deux_appels():
+            return await asyncio.gather(
+                orchestrator.valider_fiche("Z9422", "alice", True),
+                orchestrator.valider_fiche("Z9422", "alice", True),
+            )
+
+        try:
+            resultats = asyncio.run(deux_appels())
+            assert [r["action"] for r in resultats] == ["publiee", "publiee"]
+            assert appels == ["Z9422"]
+            assert repo.get_fiche("Z9422").metadata.statut == StatutFiche.PUBLIEE
+        finally:
+            repo.delete_fiche("Z9422")
+
+
+    def test_rejets_commentaires_differents(self, orchestrator, repo, monkeypatch):
+        repo.create_fiche(_make_fiche("Z9423"))
+        _suspendre(monkeypatch, orchestrator, "_valider_fiche")
+
+        async def deux_rejets():
+            return await asyncio.gather(
+                orchestrator.valider_fiche("Z9423", "alice", False, "incomplet"),
+                orchestrator.valider_fiche("Z9423", "alice", False, "salaires faux"),
+            )
+
+        try:
+            resultats = asyncio.run(deux_rejets())
+            # Commentaires différents : deux validations distinctes, aucun perdu
+            assert [r["commentaire"] for r in resultats] == ["incomplet", "salaires faux"]
+        finally:
+            repo.delete_fiche("Z9423")
+
+
+class TestExecuterTache:
+    """Dispatch des tâches par type"""
+
+    def test_dispatch(self, orchestrator, repo):
+        repo.create_fiche(_make_fiche("Z9431"))
+        try:
+            result = asyncio.run(orchestrator.executer_tache(TypeTache.VALIDATION, code_rome="Z9431"))
+            assert result["status"] == "success"
+            assert repo.get_fiche("Z9431").metadata.statut == StatutFiche.VALIDE
+
+            result = asyncio.run(orchestrator.executer_tache(TypeTache.VALIDATION))
+            assert result == {"status": "error", "error": "code_rome requis"}
+        finally:
+            repo.delete_fiche("Z9431")
+
+
+class TestImportRome:
+    """_importer_rome : écriture par lots"""
+
+    def test_import_par_lots(self, orchestrator, repo, monkeypatch):
+        import sources.rome_client as rome_module
+        from orchestrator import orchestrator as orchestrator_module
+
+        class FakeROMEClient:
+            async def import_referentiel_complet(self):
+                return [
+                    {"code_rome": "Z9441", "nom": "Importeur"},
+                    {"nom": "Sans code"},
+                    {"code_rome": "Z9442", "nom": "Importeuse"},
+                    {"code_rome": "Z9443", "nom": "Importeur lot 2"},
+                ]
+
+        monkeypatch.setattr(rome_module, "ROMEClient", FakeROMEClient)
+        monkeypatch.setattr(orchestrator_module, "_rome_client", None)
+        monkeypatch.setattr(orchestrator_module, "IMPORT_BATCH_SIZE", 2)
+        try:
+            result = asyncio.run(orchestrator.executer_tache(TypeTache.IMPORT_ROME))
+            assert result == {"status": "success", "fiches_importees": 3, "erreurs": 1}
+            assert repo.get_fiche("Z9443").nom_masculin == "Importeur lot 2"
+            # Client réutilisé d'un import à l'autre
+            client = orchestrator_module._rome_client
+            asyncio.run(orchestrator.executer_tache(TypeTache.IMPORT_ROME))
+            assert orchestrator_module._rome_client is client
+        finally:
+            for code in ("Z9441", "Z9442", "Z9443"):
+                repo.delete_fiche(code)
+
+
+class TestFileTaches:
+    """File de priorité des tâches"""
+
+    def test_priorite_puis_fifo(self, orchestrator):
+        for id_, priorite in [("a", 3), ("b", 1), ("c", 3), ("d", 1), ("e", 5)]:
+            orchestrator.enfiler(TacheOrchestree(id=id_, type_tache=TypeTache.VALIDATION, priorite=priorite))
+        ordre = []
+        while (tache := orchestrator.defiler()) is not None:
+            ordre.append(tache.id)
+        assert ordre == ["b", "d", "a", "c", "e"]
+
+
+class TestFicheCache:
+    """Cache des fiches pendant traiter_fiches"""
+
+    def _compter_lectures(self, repo, monkeypatch):
+        lectures = []
+        get_fiches = repo.get_fiches_by_codes
+
+        def compter(codes):
+            lectures.append(list(codes))
+            return get_fiches(codes)
+
+        monkeypatch.setattr(repo, "get_fiches_by_codes", compter)
+        return lectures
+
+    def test_validation_seule_une_lecture(self, orchestrator, repo, monkeypatch):
+        repo.create_fiche(_make_fiche("Z9451"))
+        try:
+            lectures = self._compter_lectures(repo, monkeypatch)
+            asyncio.run(orchestrator.traiter_fiches(["Z9451"], etapes=["validation"]))
+            assert lectures == [["Z9451"]]
+            assert repo.get_fiche("Z9451").metadata.statut == StatutFiche.VALIDE
+        finally:
+            repo.delete_fiche("Z9451")
+
+    def test_relecture_apres_agent(self, orchestrator, repo, monkeypatch):
+        repo.create_fiche(_make_fiche("Z9452"))
+        try:
+            lectures = self._compter_lectures(repo, monkeypatch)
+            asyncio.run(orchestrator.traiter_fiches(["Z9452"], etapes=["genre", "validation"]))
+            # Lecture initiale, lecture de l'agent, relecture après réécriture
+            assert lectures == [["Z9452"]] * 3
+
+            # Versions genrées déjà présentes : l'agent ne réécrit rien,
+            # la version est inchangée et la fiche n'est pas relue
+            lectures.clear()
+            asyncio.run(orchestrator.traiter_fiches(["Z9452"], etapes=["genre", "validation"]))
+            assert lectures == [["Z9452"]] * 2
+        finally:
+            repo.delete_fiche("Z9452")
+
+
+class TestEvenements:
+    """Émission des événements aux callbacks"""
+
+    def test_callbacks_sync_et_async(self, orchestrator):
+        recus = []
+
+        def sync_cb(data):
+            recus.append(("sync", data["code_rome"]))
+
+        async def async_cb(data):
+            await asyncio.sleep(0)
+            recus.append(("async", data["code_rome"]))
+
+        def en_erreur(data):
+            raise RuntimeError("callback cassé")
+
+        orchestrator.on_evenement("fiche_validee", sync_cb)
+        orchestrator.on_evenement("fiche_validee", en_erreur)
+        orchestrator.on_evenement("fiche_validee", async_cb)
+        orchestrator.on_evenement("autre", sync_cb)
+
+        asyncio.run(orchestrator._emettre_evenement("fiche_validee", {"code_rome": "Z9461"}))
+        assert sorted(recus) == [("async", "Z9461"), ("sync", "Z9461")]
+
+        # Aucun listener : rien à faire
+        asyncio.run(orchestrator._emettre_evenement("inconnu", {}))
+
+
+class TestAuditTampon:
+    """Audit tamponné pendant que l'orchestrateur tourne"""
+
+    def test_flush_a_l_arret(self, orchestrator, repo):
+        async def scenario():
+            await orchestrator.demarrer()
+            for i in range(3):
+                orchestrator._log_audit(TypeEvenement.MODIFICATION, f"audit {i}", code_rome="Z9471")
+            avant = len(repo.get_audit_logs(code_rome="Z9471"))
+            await orchestrator.arreter()
+            return avant
+
+        assert asyncio.run(scenario()) == 0
+        assert len(repo.get_audit_logs(code_rome="Z9471")) == 3
+        assert orchestrator._audit_buffer == []
+
+        # Orchestrateur arrêté : écriture immédiate
+        orchestrator._log_audit(TypeEvenement.MODIFICATION, "audit direct", code_rome="Z9471")
+        assert len(repo.get_audit_logs(code_rome="Z9471")) == 4
+
+
+class TestAgentsParesseux:
+    """Agents créés à la première utilisation"""
+
+    def test_creation_a_la_demande(self, orchestrator, repo):
+        assert orchestrator.agents == {}
+        stats = orchestrator.get_statistiques()
+        assert set(stats["agents"]) == {
+            "veille_salaires", "veille_metiers", "correcteur_langue", "generation_genre"
+        }
+        assert stats["fiches"]["total"] == repo.count_fiches()
+        assert stats["fiches"]["publiees"] == repo.count_fiches(StatutFiche.PUBLIEE)
+
+        repo.create_fiche(_make_fiche("Z9481"))
+        try:
+            asyncio.run(orchestrator.traiter_fiches(["Z9481"], etapes=["genre"]))
+        finally:
+            repo.delete_fiche("Z9481")
+        assert list(orchestrator.agents) == ["generation_genre"]
+        assert orchestrator._agent_generation_genre is orchestrator.agents["generation_genre"]
+
+
+class TestScheduler:
+    """Options des tâches planifiées"""
+
+    def test_job_defaults(self, orchestrator):
+        async def scenario():
+            await orchestrator.demarrer()
+            try:
+                return [(j.id, j.max_instances, j.coalesce, j.misfire_grace_time)
+                        for j in orchestrator.scheduler.get_jobs()]
+            finally:
+                await orchestrator.arreter()
+
+        jobs = asyncio.run(scenario())
+        assert {j[0] for j in jobs} == {"veille_salaires", "veille_metiers", "correction_langue", "nettoyage_tokens"}
+        assert all(j[1:] == (1, True, 3600) for j in jobs)
+
+    def test_execution_agent_planifie(self, orchestrator, monkeypatch):
+        async def run(**kwargs):
+            return {"signaux_detectes": 3}
+
+        async def en_erreur(**kwargs):
+            raise RuntimeError("API indisponible")
+
+        monkeypatch.setattr(orchestrator._agent_veille_metiers, "run", run)
+        monkeypatch.setattr(orchestrator._agent_correcteur_langue, "run", en_erreur)
+
+        async def scenario():
+            await orchestrator.demarrer()
+            try:
+                jobs = {j.id: j.func for j in orchestrator.scheduler.get_jobs()}
+                await jobs["veille_metiers"]()
+                await jobs["correction_langue"]()
+            finally:
+                await orchestrator.arreter()
+
+        asyncio.run(scenario())
+        messages = [e.message for e in orchestrator.journal.get_entrees_recentes(limite=20)]
+        assert "Veille métiers terminée: 3 signaux détectés" in messages
+        assert "Erreur correction linguistique: API indisponible" in messages
+
+    def test_agent_planifie_partage_la_garde(self, orchestrator):
+        # Même instance que le traitement par lot : pas d'exécution concurrente
+        orchestrator._agent_correcteur_langue._running = True
+
+        async def scenario():
+            await orchestrator.demarrer()
+            try:
+                jobs = {j.id: j.func for j in orchestrator.scheduler.get_jobs()}
+                await jobs["correction_langue"]()
+            finally:
+                await orchestrator.arreter()
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            orchestrator._agent_correcteur_langue._running = False
+        messages = [e.message for e in orchestrator.journal.get_entrees_recentes(limite=20)]
+        assert "Correction linguistique terminée: 0 fiches corrigées" in messages
+        assert orchestrator._agent_correcteur_langue.stats["executions"] == 0
+
+
+class TestRunInExecutor:
+    """Exécution dans un thread, contexte propagé seulement s'il existe"""
+
+    def test_contexte(self):
+        from contextvars import ContextVar
+        from orchestrator.orchestrator import _run_in_executor
+
+        var: ContextVar[str] = ContextVar("test_var", default="defaut")
+
+        async def scenario():
+            sans = await _run_in_executor(var.get)
+            var.set("defini")
+            avec = await _run_in_executor(var.get)
+            return sans, avec, await _run_in_executor(max, 3, 7)
+
+        assert asyncio.run(scenario()) == ("defaut", "defini", 7)
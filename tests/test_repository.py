@@ -0,0 +1,493 @@
+"""
+Tests for Repository methods not covered through the API endpoints.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from database.models import (
+    Salaire, AuditLog, HistoriqueVeille, NiveauExperience, TypeEvenement,
+    FicheMetier, VarianteFiche, GenreGrammatical, LangueSupporte, DictionnaireGenre,
+    MetadataFiche, StatutFiche, PerspectivesMetier, DictionnaireGenreDB,
+)
+from database.repository import Repository
+
+
+def _make_fiche(code_rome: str, **kwargs) -> FicheMetier:
+    return FicheMetier(
+        id=code_rome,
+        code_rome=code_rome,
+        nom_masculin="Testeur repository",
+        nom_feminin="Testeuse repository",
+        nom_epicene="Testeur/euse repository",
+        **kwargs,
+    )
+
+
+class TestBulkInserts:
+    """add_*_bulk helpers (executemany on SQLite)"""
+
+    def test_add_salaires_bulk(self, repo):
+        salaires = [
+            Salaire(code_rome="Z9001", niveau=niveau, median_salaire=30000 + i,
+                    source="test-bulk")
+            for i, niveau in enumerate(NiveauExperience)
+        ]
+        assert repo.add_salaires_bulk(salaires) == 3
+        stored = repo.get_salaires_metier("Z9001")
+        assert {s.niveau for s in stored} == set(NiveauExperience)
+
+    def test_add_audit_logs_bulk(self, repo):
+        logs = [
+            AuditLog(type_evenement=TypeEvenement.MODIFICATION, code_rome="Z9002",
+                     agent="test-bulk", description=f"bulk log {i}\tavec tab")
+            for i in range(5)
+        ]
+        assert repo.add_audit_logs_bulk(logs) == 5
+        stored = repo.get_audit_logs(code_rome="Z9002")
+        assert len(stored) == 5
+
+    def test_add_historiques_veille_bulk(self, repo):
+        historiques = [
+            HistoriqueVeille(type_veille="test-bulk", source="test",
+                             date_execution=datetime(2026, 1, i + 1))
+            for i in range(3)
+        ]
+        assert repo.add_historiques_veille_bulk(historiques) == 3
+        derniere = repo.get_derniere_veille("test-bulk")
+        assert derniere.date_execution == datetime(2026, 1, 3)
+
+    def test_bulk_empty_list(self, repo):
+        assert repo.add_salaires_bulk([]) == 0
+
+
+class TestSharedSession:
+    """Nested repository calls join the enclosing session"""
+
+    def test_nested_calls_reuse_session(self, repo):
+        with repo.session() as outer:
+            with repo.session() as inner:
+                assert inner is outer
+
+    def test_shared_session_scope(self, repo):
+        with repo.shared_session():
+            with repo.session() as first:
+                pass
+            with repo.session() as second:
+                pass
+        assert first is second
+        with repo.session() as fresh:
+            assert fresh is not first
+
+    def test_paused_generator_does_not_capture_writes(self, repo):
+        repo.create_fiche(_make_fiche("Z9915"))
+        try:
+            rows = repo.iter_fiches_noms()
+            next(rows)
+            repo.create_fiche(_make_fiche("Z9914"))
+            rows.close()
+            # Lecture sur une connexion neuve : l'écriture doit être commitée
+            assert Repository(db_path=repo.db_path).get_fiche("Z9914") is not None
+        finally:
+            repo.delete_fiche("Z9914")
+            repo.delete_fiche("Z9915")
+
+    def test_sessions_are_per_repository(self, repo, tmp_path):
+        other = Repository(db_path=tmp_path / "other.db")
+        with repo.session() as outer:
+            with other.session() as inner:
+                assert inner is not outer
+
+
+class TestUpdateFicheContentHash:
+    """update_fiche skips rewrites when the content is unchanged"""
+
+    def test_unchanged_update_keeps_version(self, repo):
+        repo.create_fiche(_make_fiche("Z9101", description="v1"))
+        try:
+            fiche = repo.get_fiche("Z9101")
+            fiche.metadata.date_maj = datetime.now()
+            assert repo.update_fiche(fiche).metadata.version == 1
+
+            fiche.description = "v2"
+            assert repo.update_fiche(fiche).metadata.version == 2
+        finally:
+            repo.delete_fiche("Z9101")
+
+    def test_force_rewrites(self, repo):
+        repo.create_fiche(_make_fiche("Z9102"))
+        try:
+            fiche = repo.get_fiche("Z9102")
+            assert repo.update_fiche(fiche, force=True).metadata.version == 2
+        finally:
+            repo.delete_fiche("Z9102")
+
+
+class TestUpdateFichesBulk:
+    """update_fiches_bulk : une transaction pour plusieurs fiches"""
+
+    def test_update_bulk(self, repo):
+        repo.create_fiches_bulk([_make_fiche("Z9921"), _make_fiche("Z9922")])
+        try:
+            a, b = repo.get_fiche("Z9921"), repo.get_fiche("Z9922")
+            a.description = "Modifiée en lot"
+            updated = repo.update_fiches_bulk([a, b])
+            assert [f.code_rome for f in updated] == ["Z9921", "Z9922"]
+            assert repo.get_fiche("Z9921").description == "Modifiée en lot"
+            assert repo.get_fiche("Z9921").metadata.version == a.metadata.version + 1
+            # Contenu inchangé : pas de nouvelle version
+            assert repo.get_fiche("Z9922").metadata.version == b.metadata.version
+
+            with pytest.raises(ValueError):
+                repo.update_fiches_bulk([a, _make_fiche("Z9929")])
+        finally:
+            repo.delete_fiche("Z9921")
+            repo.delete_fiche("Z9922")
+
+
+class TestUpsertFichesBulk:
+    """upsert_fiches_bulk : créations et mises à jour dans une transaction"""
+
+    def test_upsert_bulk(self, repo):
+        repo.create_fiche(_make_fiche("Z9931"))
+        try:
+            existante = repo.get_fiche("Z9931")
+            existante.description = "Mise à jour par upsert"
+            saved = repo.upsert_fiches_bulk([_make_fiche("Z9932"), existante, _make_fiche("Z9933")])
+            assert [f.code_rome for f in saved] == ["Z9932", "Z9931", "Z9933"]
+            assert repo.get_fiche("Z9931").description == "Mise à jour par upsert"
+            assert repo.get_fiche("Z9931").metadata.version == existante.metadata.version + 1
+            assert repo.get_fiche("Z9933") is not None
+
+            # Contenu inchangé : pas de nouvelle version
+            repo.upsert_fiches_bulk([repo.get_fiche("Z9932")])
+            assert repo.get_fiche("Z9932").metadata.version == saved[0].metadata.version
+
+            assert repo.get_fiche_versions(["Z9931", "Z9932", "Z9939"]) == {
+                "Z9931": existante.metadata.version + 1,
+                "Z9932": saved[0].metadata.version,
+            }
+        finally:
+            for code in ("Z9931", "Z9932", "Z9933"):
+                repo.delete_fiche(code)
+
+
+class TestPublishByStatut:
+    """publish_fiches_by_statut : UPDATE groupé"""
+
+    def test_publish_valide_fiches(self, repo):
+        repo.create_fiche(_make_fiche("Z9901", metadata=MetadataFiche(statut=StatutFiche.VALIDE)))
+        try:
+            before = repo.get_fiche("Z9901")
+            assert ("Z9901", "Testeur repository") in repo.publish_fiches_by_statut([StatutFiche.VALIDE])
+            after = repo.get_fiche("Z9901")
+            assert after.metadata.statut == StatutFiche.PUBLIEE
+            assert after.metadata.version == before.metadata.version + 1
+
+            # content_hash remis à zéro : revenir au contenu d'origine réécrit bien la fiche
+            assert repo.update_fiche(before).metadata.statut == StatutFiche.VALIDE
+
+            # Plus rien à publier : retour immédiat
+            repo.publish_fiches_by_statut([StatutFiche.VALIDE])
+            assert repo.publish_fiches_by_statut([StatutFiche.VALIDE]) == []
+        finally:
+            repo.delete_fiche("Z9901")
+
+
+class TestFichesSummary:
+    """iter_fiches_summary : colonnes d'affichage sans hydratation ORM"""
+
+    def test_summary_rows(self, repo):
+        repo.create_fiche(_make_fiche("Z9911", perspectives=PerspectivesMetier(tension=0.25)))
+        try:
+            rows = {row[0]: row for row in repo.iter_fiches_summary(StatutFiche.BROUILLON)}
+            code_rome, nom, statut, tension, date_maj = rows["Z9911"]
+            assert (nom, statut, tension) == ("Testeur repository", "brouillon", 0.25)
+            assert date_maj is not None
+            assert len(list(repo.iter_fiches_summary(limit=1))) == 1
+
+            (row,) = repo.iter_fiches_summary(limit=1, with_total=True)
+            assert row[-1] == repo.count_fiches()
+
+            assert [r[0] for r in repo.iter_fiches_summary(search="testeuse repo")] == ["Z9911"]
+
+            noms = {row[0]: row for row in repo.iter_fiches_noms()}
+            assert noms["Z9911"] == (
+                "Z9911", "Testeur repository", "Testeuse repository",
+                "Testeur/euse repository", "brouillon", None,
+            )
+        finally:
+            repo.delete_fiche("Z9911")
+
+
+class TestSearchFiches:
+    """search_fiches : filtre statut appliqué en SQL"""
+
+    def test_search_with_statut(self, repo):
+        repo.create_fiche(_make_fiche("Z9913"))
+        try:
+            assert [f.code_rome for f in repo.search_fiches("testeuse repo", statut=StatutFiche.BROUILLON)] == ["Z9913"]
+            assert repo.search_fiches("testeuse repo", statut=StatutFiche.PUBLIEE) == []
+        finally:
+            repo.delete_fiche("Z9913")
+
+
+class TestTopTension:
+    """get_top_fiches_by_tension : tri et LIMIT côté SQL"""
+
+    def test_top_rows(self, repo):
+        repo.create_fiche(_make_fiche("Z9912", perspectives=PerspectivesMetier(tension=0.95, tendance="hausse")))
+        try:
+            top = repo.get_top_fiches_by_tension(3)
+            assert len(top) <= 3
+            tensions = [row[2] for row in top]
+            assert tensions == sorted(tensions, reverse=True)
+
+            rows = {row[0]: row for row in repo.get_top_fiches_by_tension(100000)}
+            assert rows["Z9912"] == ("Z9912", "Testeur repository", 0.95, "hausse")
+
+            aggregates = repo.get_dashboard_aggregates(top_n=3)
+            assert aggregates.statuts == repo.count_fiches_by_statut()
+            assert aggregates.tendances["hausse"] >= 1
+            assert aggregates.top_tension == top
+        finally:
+            repo.delete_fiche("Z9912")
+
+
+class TestCountCache:
+    """count_fiches_by_statut / count_variantes_batch caching"""
+
+    def test_statut_counts_invalidated_on_write(self, repo):
+        before = repo.count_fiches_by_statut()
+        repo.create_fiche(_make_fiche("Z9201"))
+        try:
+            after = repo.count_fiches_by_statut()
+            assert after.get("brouillon", 0) == before.get("brouillon", 0) + 1
+        finally:
+            repo.delete_fiche("Z9201")
+        assert repo.count_fiches_by_statut() == before
+
+    def test_tendance_counts_invalidated_on_write(self, repo):
+        before = repo.count_fiches_by_tendance()
+        repo.create_fiche(_make_fiche("Z9202", perspectives=PerspectivesMetier(tendance="emergence")))
+        try:
+            after = repo.count_fiches_by_tendance()
+            assert after.get("emergence", 0) == before.get("emergence", 0) + 1
+        finally:
+            repo.delete_fiche("Z9202")
+        assert repo.count_fiches_by_tendance() == before
+
+    def test_top_tension_invalidated_on_write(self, repo):
+        repo.get_top_fiches_by_tension(100000)
+        repo.create_fiche(_make_fiche("Z9203", perspectives=PerspectivesMetier(tension=0.9)))
+        try:
+            assert "Z9203" in {row[0] for row in repo.get_top_fiches_by_tension(100000)}
+        finally:
+            repo.delete_fiche("Z9203")
+        assert "Z9203" not in {row[0] for row in repo.get_top_fiches_by_tension(100000)}
+
+    def test_invalidated_after_commit(self, repo, monkeypatch):
+        # Un lecteur sur une autre connexion voit déjà l'écriture au moment
+        # de l'invalidation : il ne peut pas recacher un compteur périmé
+        lecteur = Repository(db_path=repo.db_path)
+        vus = []
+        invalider = repo._invalidate_counts
+
+        def invalider_et_relire():
+            vus.append(lecteur.get_fiche("Z9204") is not None)
+            invalider()
+
+        monkeypatch.setattr(repo, "_invalidate_counts", invalider_et_relire)
+        repo.create_fiche(_make_fiche("Z9204"))
+        repo.update_fiche(_make_fiche("Z9204", description="modifiée"))
+        repo.delete_fiche("Z9204")
+        assert vus == [True, True, False]
+        lecteur.dispose()
+
+    def test_cached_result_is_a_copy(self, repo):
+        counts = repo.count_fiches_by_statut()
+        counts["bogus"] = 42
+        assert "bogus" not in repo.count_fiches_by_statut()
+
+
+class TestBulkCreate:
+    """create_fiches_bulk / save_variantes_bulk"""
+
+    def test_create_fiches_bulk_keeps_order(self, repo):
+        codes = ["Z9303", "Z9301", "Z9302"]
+        try:
+            created = repo.create_fiches_bulk([_make_fiche(c) for c in codes])
+            assert [f.code_rome for f in created] == codes
+            assert {f.code_rome for f in repo.get_fiches_by_codes(codes)} == set(codes)
+        finally:
+            for code in codes:
+                repo.delete_fiche(code)
+
+    def test_save_variantes_bulk_upserts(self, repo):
+        repo.create_fiche(_make_fiche("Z9304"))
+        try:
+            first = repo.save_variantes_bulk([
+                VarianteFiche(code_rome="Z9304", genre=genre, nom=f"nom {genre.value}")
+                for genre in GenreGrammatical
+            ])
+            assert [v.version for v in first] == [1, 1, 1]
+            assert repo.count_variantes("Z9304") == 3
+
+            second = repo.save_variantes_bulk([
+                VarianteFiche(code_rome="Z9304", genre=GenreGrammatical.FEMININ, nom="maj"),
+                VarianteFiche(code_rome="Z9304", langue=LangueSupporte.EN, nom="new"),
+            ])
+            assert second[0].id == first[1].id
+            assert second[0].version == 2 and second[0].nom == "maj"
+            assert second[1].version == 1
+            assert repo.count_variantes("Z9304") == 4
+        finally:
+            repo.delete_variantes("Z9304")
+            repo.delete_fiche("Z9304")
+
+
+class TestGenreCache:
+    """get_correspondance_genre in-memory dictionary"""
+
+    def test_lookup_and_invalidation(self, repo):
+        assert repo.get_correspondance_genre("testeur-cache") is None
+        repo.add_correspondance_genre(DictionnaireGenre(
+            masculin="testeur-cache", feminin="testeuse-cache", epicene="testeur·euse-cache"
+        ))
+        try:
+            found = repo.get_correspondance_genre("testeur-cache")
+            assert found.feminin == "testeuse-cache"
+            found.feminin = "modifie"
+            assert repo.get_correspondance_genre("testeur-cache").feminin == "testeuse-cache"
+        finally:
+            with repo.session() as session:
+                session.execute(
+                    delete(DictionnaireGenreDB).where(DictionnaireGenreDB.masculin == "testeur-cache")
+                )
+            repo._genre_cache = None
+
+
+class TestSaveVarianteHash:
+    """save_variante ignore les mises à jour sans changement de contenu"""
+
+    def test_identical_variante_not_rewritten(self, repo):
+        repo.create_fiche(_make_fiche("Z9401"))
+        try:
+            first = repo.save_variante(VarianteFiche(code_rome="Z9401", nom="stable"))
+            again = repo.save_variante(VarianteFiche(code_rome="Z9401", nom="stable"))
+            assert again.version == 1
+            assert again.date_maj == first.date_maj
+
+            changed = repo.save_variante(VarianteFiche(code_rome="Z9401", nom="modifie"))
+            assert changed.version == 2
+        finally:
+            repo.delete_variantes("Z9401")
+            repo.delete_fiche("Z9401")
+
+
+class TestFichesByTag:
+    """get_fiches_by_tag (json_each sur SQLite)"""
+
+    def test_filter_on_tag(self, repo):
+        repo.create_fiche(_make_fiche("Z9601", metadata=MetadataFiche(tags=["numerique", "test-tag"])))
+        repo.create_fiche(_make_fiche("Z9602", metadata=MetadataFiche(tags=["test-tag-bis"])))
+        try:
+            assert [f.code_rome for f in repo.get_fiches_by_tag("test-tag")] == ["Z9601"]
+        finally:
+            repo.delete_fiche("Z9601")
+            repo.delete_fiche("Z9602")
+
+
+class TestExport:
+    """export_fiche_json / export_all_fiches_json"""
+
+    def test_export_roundtrip(self, repo, tmp_path):
+        repo.create_fiche(_make_fiche("Z9701", description="Exporté"))
+        try:
+            assert repo.export_fiche_json("Z9701", tmp_path / "one.json")
+            exported = FicheMetier.from_json((tmp_path / "one.json").read_text(encoding="utf-8"))
+            assert exported == repo.get_fiche("Z9701")
+
+            count = repo.export_all_fiches_json(tmp_path / "all")
+            assert count == repo.count_fiches()
+            assert (tmp_path / "all" / "Z9701.json").read_bytes() == (tmp_path / "one.json").read_bytes()
+        finally:
+            repo.delete_fiche("Z9701")
+
+
+class TestRefreshTokenCleanup:
+    """cleanup_expired_tokens supprime par lots"""
+
+    def test_cleanup_in_batches(self, repo):
+        repo.cleanup_expired_tokens()
+        past = datetime.now() - timedelta(days=1)
+        future = datetime.now() + timedelta(days=1)
+        assert repo.save_refresh_tokens_bulk([
+            {"token_hash": f"z9801-expired-{i}", "user_id": 1, "expires_at": past}
+            for i in range(5)
+        ]) == 5
+        repo.save_refresh_token("z9801-revoked", user_id=1, expires_at=future)
+        repo.revoke_refresh_token("z9801-revoked")
+        # Expiré et révoqué : supprimé par le premier lot seulement
+        repo.save_refresh_token("z9801-expired-revoked", user_id=1, expires_at=past)
+        repo.revoke_refresh_token("z9801-expired-revoked")
+        repo.save_refresh_token("z9801-valid", user_id=1, expires_at=future)
+        try:
+            assert repo.cleanup_expired_tokens(batch_size=2) == 7
+            assert repo.get_refresh_token("z9801-expired-revoked") is None
+            stored = repo.get_refresh_token("z9801-valid")
+            assert set(stored) == {"id", "token_hash", "user_id", "expires_at", "created_at"}
+            assert stored["expires_at"] == future
+        finally:
+            repo.revoke_refresh_token("z9801-valid")
+            repo.cleanup_expired_tokens()
+
+
+class TestRevokeAllUserTokens:
+    """revoke_all_user_tokens ne retouche pas les tokens déjà révoqués"""
+
+    def test_returns_newly_revoked_ids(self, repo):
+        future = datetime.now() + timedelta(days=1)
+        repo.save_refresh_tokens_bulk([
+            {"token_hash": f"z9811-{i}", "user_id": 9811, "expires_at": future}
+            for i in range(3)
+        ])
+        try:
+            assert len(repo.revoke_all_user_tokens(9811)) == 3
+            assert repo.revoke_all_user_tokens(9811) == []
+        finally:
+            repo.cleanup_expired_tokens()
+
+
+class TestAsyncRepository:
+    """AsyncRepository (aiosqlite) : mêmes requêtes que Repository"""
+
+    def test_reads_match_sync_repository(self, repo):
+        pytest.importorskip("greenlet")
+        pytest.importorskip("aiosqlite")
+        from database.async_repository import AsyncRepository
+
+        codes = ["Z9501", "Z9502"]
+        repo.create_fiches_bulk([_make_fiche(c) for c in codes])
+
+        async_repo = AsyncRepository(db_path="test_agents_metiers.db")
+
+        async def run():
+            fiche = await async_repo.get_fiche("Z9501")
+            found = await async_repo.get_fiches_by_codes(codes, chunk_size=1)
+            searched = await async_repo.search_fiches("Testeur repository", limit=50)
+            return fiche, found, searched
+
+        try:
+            fiche, found, searched = asyncio.run(run())
+            assert fiche == repo.get_fiche("Z9501")
+            assert sorted(f.code_rome for f in found) == codes
+            assert set(codes) <= {f.code_rome for f in searched}
+            # Engine SQLite sans pool : utilisable depuis une autre boucle
+            assert asyncio.run(run())[0] == fiche
+        finally:
+            asyncio.run(async_repo.dispose())
+            for code in codes:
+                repo.delete_fiche(code)
@@ -0,0 +1,194 @@
+"""
+Tests for the in-memory ValidationSystem (interface/validation.py).
+"""
+import json
+
+from database.models import FicheMetier, StatutFiche
+from interface.validation import ActionValidation, ValidationSystem
+
+
+def _make_fiche(code_rome: str) -> FicheMetier:
+    return FicheMetier(
+        id=code_rome,
+        code_rome=code_rome,
+        nom_masculin="Testeur validation",
+        nom_feminin="Testeuse validation",
+        nom_epicene="Testeur/euse validation",
+    )
+
+
+def _system(repo, *priorites):
+    system = ValidationSystem(repo)
+    demandes = []
+    for i, priorite in enumerate(priorites):
+        fiche = _make_fiche(f"Z96{i:02d}")
+        repo.create_fiche(fiche)
+        demandes.append(system.creer_demande(fiche, "mise_a_jour", {}, priorite=priorite))
+    return system, demandes
+
+
+def _cleanup(repo, demandes):
+    for d in demandes:
+        repo.delete_fiche(d.code_rome)
+
+
+class TestDemandesEnAttente:
+    """get_demandes_en_attente : index priorité / assigné"""
+
+    def test_filters_and_order(self, repo):
+        system, demandes = _system(repo, 3, 1, 2, 1)
+        try:
+            # slots=True conserve le __hash__ explicite (demandes utilisables en set)
+            assert hash(demandes[0]) == hash(demandes[0].id)
+            assert [d.id for d in system.get_demandes_en_attente()] == [
+                demandes[1].id, demandes[3].id, demandes[2].id, demandes[0].id
+            ]
+            assert len(system.get_demandes_en_attente(priorite_max=2)) == 3
+            assert system.get_demandes_en_attente(limite=2) == [demandes[1], demandes[3]]
+            assert system.get_demandes_en_attente(limite=0) == []
+
+            system.assigner_demande(demandes[0].id, "alice")
+            system.assigner_demande(demandes[1].id, "alice")
+            system.assigner_demande(demandes[1].id, "bob")
+            assert system.get_demandes_en_attente(assignee="alice") == [demandes[0]]
+            assert system.get_demandes_en_attente(assignee="bob", priorite_max=1) == [demandes[1]]
+
+            # Report : la demande change de tranche de priorité
+            system.reporter(demandes[3].id, "alice", "plus tard")
+            assert demandes[3] not in system.get_demandes_en_attente(priorite_max=1)
+            assert demandes[3] in system.get_demandes_en_attente(priorite_max=2)
+
+            # Une demande traitée sort de tous les index
+            system.rejeter(demandes[1].id, "bob", "incomplet")
+            assert system.get_demandes_en_attente(assignee="bob") == []
+            assert demandes[1] not in system.get_demandes_en_attente()
+        finally:
+            _cleanup(repo, demandes)
+
+
+class TestStatistiques:
+    """get_statistiques : compteurs tenus à jour"""
+
+    def test_counters(self, repo):
+        system, demandes = _system(repo, 1, 2, 2)
+        try:
+            system.approuver(demandes[0].id, "alice")
+            system.rejeter(demandes[1].id, "alice", "incomplet")
+            system.reporter(demandes[2].id, "alice", "plus tard")
+            stats = system.get_statistiques()
+            assert stats["en_attente"] == 1
+            assert (stats["total_traitees"], stats["approuvees"], stats["rejetees"]) == (2, 1, 1)
+            assert stats["taux_approbation"] == 0.5
+            assert stats["par_priorite"] == {1: 0, 2: 0, 3: 1, 4: 0, 5: 0}
+        finally:
+            _cleanup(repo, demandes)
+
+
+class TestApprouverBatch:
+    """approuver_batch : une seule écriture pour N demandes"""
+
+    def test_approve_batch(self, repo):
+        system, demandes = _system(repo, 1, 2, 3)
+        demandes[0].modifications.update(description="Approuvée en lot", inconnu="ignoré")
+        try:
+            assert system.comparer_versions(demandes[0].id) == {
+                "description": {"avant": "", "apres": "Approuvée en lot"}
+            }
+            ids = [demandes[0].id, demandes[2].id, "VAL-inconnu"]
+            resultats = system.approuver_batch(ids, "alice")
+            assert [r.demande_id for r in resultats] == ids[:2]
+            assert system.get_demandes_en_attente() == [demandes[1]]
+            assert system.get_statistiques()["approuvees"] == 2
+            for d in (demandes[0], demandes[2]):
+                stored = repo.get_fiche(d.code_rome)
+                assert stored.metadata.statut == StatutFiche.PUBLIEE
+                assert stored.metadata.auteur == "alice"
+            assert repo.get_fiche(demandes[0].code_rome).description == "Approuvée en lot"
+            assert "description" in demandes[0].fiche.model_fields_set
+            assert not hasattr(demandes[0].fiche, "inconnu")
+        finally:
+            _cleanup(repo, demandes)
+
+
+class TestCallbacks:
+    """on_validation : abonnements filtrés par action / type de modification"""
+
+    def test_topic_dispatch(self, repo):
+        system, demandes = _system(repo, 1, 1)
+        recus = {"tous": [], "rejets": [], "maj_approuvees": [], "creations": []}
+        system.on_validation(recus["tous"].append)
+        system.on_validation(recus["rejets"].append, action=ActionValidation.REJETER)
+        system.on_validation(
+            recus["maj_approuvees"].append,
+            action=ActionValidation.APPROUVER, type_modification="mise_a_jour"
+        )
+        system.on_validation(recus["creations"].append, type_modification="creation")
+        try:
+            system.approuver(demandes[0].id, "alice")
+            system.rejeter(demandes[1].id, "alice", "incomplet")
+            system.close()  # notifications asynchrones : attendre le pool
+            assert sorted(r.demande_id for r in recus["tous"]) == [demandes[0].id, demandes[1].id]
+            assert [r.demande_id for r in recus["rejets"]] == [demandes[1].id]
+            assert [r.demande_id for r in recus["maj_approuvees"]] == [demandes[0].id]
+            assert recus["creations"] == []
+        finally:
+            _cleanup(repo, demandes)
+
+    def test_file_pleine_et_pool_arrete(self, repo, monkeypatch):
+        import threading
+        import interface.validation as validation_module
+        monkeypatch.setattr(validation_module, "CALLBACK_FILE_MAX", 1)
+        system, demandes = _system(repo, 1, 1, 1)
+        debloquer = threading.Event()
+        threads = {}
+
+        def callback(resultat):
+            threads[resultat.demande_id] = threading.current_thread()
+            if resultat.demande_id == demandes[0].id:
+                debloquer.wait(5)
+
+        system.on_validation(callback)
+        try:
+            # Le pool est occupé par la première notification : la deuxième
+            # s'exécute dans le thread appelant au lieu d'être ignorée
+            system.approuver(demandes[0].id, "alice")
+            system.approuver(demandes[1].id, "alice")
+            assert threads[demandes[1].id] is threading.current_thread()
+            debloquer.set()
+            system.close()
+            # Pool arrêté : notification exécutée directement
+            system.approuver(demandes[2].id, "alice")
+            assert threads[demandes[0].id] is not threading.current_thread()
+            assert threads[demandes[2].id] is threading.current_thread()
+            assert system not in validation_module._systemes_ouverts
+        finally:
+            debloquer.set()
+            _cleanup(repo, demandes)
+
+
+class TestHistorique:
+    """Historique borné en mémoire, archivé en JSONL"""
+
+    def test_bounded_history(self, repo, tmp_path):
+        archive = tmp_path / "historique.jsonl"
+        system = ValidationSystem(repo, historique_max=2, archive_path=archive)
+        demandes = []
+        for i in range(3):
+            fiche = _make_fiche(f"Z95{i:02d}")
+            repo.create_fiche(fiche)
+            demandes.append(system.creer_demande(fiche, "correction", {}))
+        try:
+            system.approuver(demandes[0].id, "alice")
+            system.rejeter(demandes[1].id, "bob", "incomplet")
+            system.approuver(demandes[2].id, "alice")
+
+            assert [h.demande_id for h in system.get_historique()] == [demandes[1].id, demandes[2].id]
+            assert [h.demande_id for h in system.get_historique(validateur="alice")] == [demandes[2].id]
+            assert [h.demande_id for h in system.get_historique(limite=1)] == [demandes[2].id]
+            assert system.get_statistiques()["total_traitees"] == 3
+
+            (ligne,) = archive.read_text(encoding="utf-8").splitlines()
+            archive_dict = json.loads(ligne)
+            assert (archive_dict["demande_id"], archive_dict["action"]) == (demandes[0].id, "approuver")
+        finally:
+            _cleanup(repo, demandes)
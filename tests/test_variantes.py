@@ -19,6 +19,7 @@ def test_save_and_get_variante():
     """Test de sauvegarde et récupération d'une variante."""
     config = get_config()
     repo = Repository(config.db_path)
+    repo.init_db()
 
     # Créer une variante test
     variante = VarianteFiche(
@@ -57,6 +58,7 @@ def test_upsert_variante():
     """Test de l'upsert (mise à jour si existe)."""
     config = get_config()
     repo = Repository(config.db_path)
+    repo.init_db()
 
     # Première sauvegarde
     variante1 = VarianteFiche(
@@ -95,6 +97,7 @@ def test_count_variantes():
     """Test du comptage des variantes."""
     config = get_config()
     repo = Repository(config.db_path)
+    repo.init_db()
 
     # Nettoyer les variantes existantes pour M1805
     # (optionnel, pour des tests propres)
@@ -125,6 +128,7 @@ def test_get_all_variantes():
     """Test de récupération de toutes les variantes."""
     config = get_config()
     repo = Repository(config.db_path)
+    repo.init_db()
 
     variantes = repo.get_all_variantes("M1805")
     print(f"Nombre total de variantes pour M1805: {len(variantes)}")
@@ -140,6 +144,7 @@ def test_unique_constraint():
     """Test de la contrainte d'unicité."""
     config = get_config()
     repo = Repository(config.db_path)
+    repo.init_db()
 
     # Même variante deux fois (doit faire un upsert)
     variante = VarianteFiche(
@@ -83,17 +83,17 @@ def section_header(title: str, description: str = "", badge_text: str = ""):
         description: Description optionnelle
         badge_text: Texte du badge optionnel
     """
-    html = ""
+    parts = []
 
     if badge_text:
-        html += f'<span class="badge badge-purple" style="margin-bottom: 20px; display: inline-block;">{badge_text}</span><br>'
+        parts.append(f'<span class="badge badge-purple" style="margin-bottom: 20px; display: inline-block;">{badge_text}</span><br>')
 
-    html += f'<h2 class="gradient-text">{title}</h2>'
+    parts.append(f'<h2 class="gradient-text">{title}</h2>')
 
     if description:
-        html += f'<p style="color: var(--text-muted); font-size: 18px; margin-top: 16px;">{description}</p>'
+        parts.append(f'<p style="color: var(--text-muted); font-size: 18px; margin-top: 16px;">{description}</p>')
 
-    st.markdown(html, unsafe_allow_html=True)
+    st.markdown("".join(parts), unsafe_allow_html=True)
 
 
 def check_list(items: list):
@@ -103,19 +103,18 @@ def check_list(items: list):
     Args:
         items: Liste des éléments à afficher
     """
-    html = '<ul class="check-list">'
-
-    for item in items:
-        html += f"""
+    # Construit toute la liste avant un unique st.markdown (un seul message au navigateur)
+    rows = "".join(
+        f"""
         <li>
             <span class="check-icon">✓</span>
             <span>{item}</span>
         </li>
         """
+        for item in items
+    )
 
-    html += '</ul>'
-
-    st.markdown(html, unsafe_allow_html=True)
+    st.markdown(f'<ul class="check-list">{rows}</ul>', unsafe_allow_html=True)
 
 
 def metric_card(label: str, value: str, delta: str = "", icon: str = "📊"):